@@ -8,25 +8,93 @@ Uses OpenAlgo APIs to:
 
 Graceful Degradation:
 - If broker not connected, enters waiting mode instead of crashing
-- Retries every 30 seconds with exponential backoff (30s -> 60s -> 120s -> 300s cap)
+- Retries with jittered exponential backoff (30s start, 300s cap) so restarts
+  don't retry in lockstep against the broker
 - Sends Telegram alert when broker reconnects
+
+Networking:
+- All OpenAlgo calls share one keep-alive requests.Session (pooled connection)
+- HTTP/2 is not used: OpenAlgo is served over plain HTTP inside Docker, where
+  h2 negotiation (ALPN) is unavailable, so keep-alive reuse is the main win
+- No extra DNS cache: a lookup only happens when the pool opens a connection,
+  and the host is a Docker service name answered by the local embedded resolver
+- Synchronous by design: the only caller is the blocking startup path in
+  main(), so independent calls are overlapped with a small thread pool rather
+  than an asyncio event loop (TelegramNotifier.send_message is already
+  fire-and-forget, so alerts never stall the retry cadence)
 """
 
+import bisect
+import functools
+import json
 import logging
+import random
+import re
 import time as time_module
-from datetime import datetime, time, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
 import pytz
 import requests
+from requests.adapters import HTTPAdapter
 import os
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 IST = pytz.timezone('Asia/Kolkata')
 
+# IST has no DST, so a fixed-offset tzinfo gives the same wall clock as the
+# pytz zone without the localize() work (used for dates and log timestamps)
+_IST_FIXED = timezone(timedelta(hours=5, minutes=30))
+
+
+def _ist_today():
+    """Current IST date"""
+    return datetime.now(_IST_FIXED).date()
+
+
+def _ist_clock():
+    """Current IST wall-clock time as HH:MM:SS"""
+    return datetime.now(_IST_FIXED).strftime('%H:%M:%S')
+
+
+@functools.lru_cache(maxsize=1)
+def _market_open_for(date_key):
+    """9:15 AM IST market open on the given date (memoized per date)"""
+    return IST.localize(datetime(date_key.year, date_key.month, date_key.day, 9, 15))
+
+# OpenAlgo expiry format "DD-MMM-YY" (e.g., "17-JUL-25"), parsed without strptime
+_EXPIRY_RE = re.compile(r"^(\d{1,2})-([A-Za-z]{3})-(\d{2})$")
+_MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+
+
+def _parse_expiry(exp_str):
+    """Parse "DD-MMM-YY" into a date, or None if it doesn't match"""
+    m = _EXPIRY_RE.match(exp_str)
+    if not m:
+        return None
+    day, mon, year = m.groups()
+    month = _MONTHS.get(mon.upper())
+    if month is None:
+        return None
+    try:
+        return date(2000 + int(year), month, int(day))
+    except ValueError:
+        return None
+
 
 class AutoDetector:
     """Automatically detect ATM strike and expiry for NIFTY options"""
 
-    def __init__(self, api_key: str, host: str, data_pipeline=None, spot_symbol="Nifty 50", telegram_notifier=None):
+    def __init__(self, api_key: str, host: str, data_pipeline=None, spot_symbol="Nifty 50", telegram_notifier=None,
+                 connect_timeout=3.0, read_timeout=7.0):
         """
         Initialize with OpenAlgo credentials
 
@@ -36,16 +104,57 @@ class AutoDetector:
             data_pipeline: Optional DataPipeline instance for WebSocket-based spot price
             spot_symbol: NIFTY spot symbol (default: "Nifty 50")
             telegram_notifier: Optional TelegramNotifier instance for alerts
+            connect_timeout: HTTP connect timeout in seconds (fail fast when broker is down)
+            read_timeout: HTTP read timeout in seconds
         """
         self.api_key = api_key
         self.host = host.rstrip('/')
         self.data_pipeline = data_pipeline
         self.spot_symbol = spot_symbol
         self.telegram_notifier = telegram_notifier
+        self.timeout = (connect_timeout, read_timeout)
+
+        # Persistent HTTP session: both endpoints hit the same OpenAlgo host, so a
+        # keep-alive connection is reused across the Phase-1/Phase-2 retry loops
+        # instead of a fresh TCP handshake per call
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+        # Request URLs and payloads are constant for the detector's lifetime
+        self._quotes_url = f"{self.host}/api/v1/quotes"
+        self._expiry_url = f"{self.host}/api/v1/expiry"
+        self._quotes_payload = {
+            "apikey": api_key,
+            "symbol": "NIFTY",
+            "exchange": "NSE_INDEX"
+        }
+        self._expiry_payload = {
+            "apikey": api_key,
+            "symbol": "NIFTY",
+            "exchange": "NFO",
+            "instrumenttype": "options"
+        }
 
         # Wait mode configuration
         self.max_wait_retries = 60  # ~30 minutes of retrying (every 30 seconds avg)
         self.periodic_update_interval = 300  # Send Telegram update every 5 minutes
+        self.min_wait_interval = 30  # Backoff floor (seconds)
+        self.max_wait_interval = 300  # Backoff cap (seconds)
+        self.quick_retries = 3  # Phase-1 attempts before entering wait mode
+        self.quick_retry_delay = 5  # Phase-1 retry delay (seconds, before jitter)
+
+        # Expiry list cache (expiry calendar is static within a session)
+        self.expiries_cache_ttl = 3600  # seconds
+        self._expiries_cache = None
+        self._expiries_cache_ts = 0.0
+        self._expiry_index_key = None  # Expiry list the sorted index was built from
+        self._expiry_index = ([], [])
 
     def wait_for_market_open(self, wait_minutes=1):
         """
@@ -53,16 +162,23 @@ class AutoDetector:
         If already past target time, proceed immediately
         """
         now = datetime.now(IST)
-        market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
+        market_open = _market_open_for(now.date())
         target_time = market_open + timedelta(minutes=wait_minutes)
 
         if now < target_time:
             wait_seconds = (target_time - now).total_seconds()
-            logger.info(f"[AUTO] Waiting {wait_seconds:.0f} seconds until {target_time.strftime('%H:%M:%S')}")
-            time_module.sleep(wait_seconds)
-            logger.info(f"[AUTO] Target time reached: {target_time.strftime('%H:%M:%S')}")
+            logger.info("[AUTO] Waiting %.0f seconds until %s", wait_seconds, target_time.time())
+            # Sleep against an absolute deadline so an early wake-up (signal) just
+            # sleeps the remainder instead of proceeding before the target time
+            target_epoch = target_time.timestamp()
+            while True:
+                remaining = target_epoch - time_module.time()
+                if remaining <= 0:
+                    break
+                time_module.sleep(remaining)
+            logger.info("[AUTO] Target time reached: %s", target_time.time())
         else:
-            logger.info(f"[AUTO] Already past {target_time.strftime('%H:%M:%S')}, proceeding immediately")
+            logger.info("[AUTO] Already past %s, proceeding immediately", target_time.time())
 
     def fetch_spot_price_from_websocket(self):
         """
@@ -81,11 +197,11 @@ class AutoDetector:
 
         ltp = self.data_pipeline.get_spot_price(self.spot_symbol)
         if ltp is not None:
-            now = datetime.now(IST)
-            logger.info(f"[AUTO] NIFTY Spot from WebSocket (LTP at {now.strftime('%H:%M:%S')}): {ltp}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[AUTO] NIFTY Spot from WebSocket (LTP at %s): %s", _ist_clock(), ltp)
             return float(ltp)
         else:
-            logger.warning("[AUTO] WebSocket LTP not available, will try API fallback")
+            logger.debug("[AUTO] WebSocket LTP not available")
             return None
 
     def fetch_spot_price(self):
@@ -93,67 +209,139 @@ class AutoDetector:
         Fetch NIFTY spot price from OpenAlgo quotes API (fallback method)
         Returns: float (e.g., 24248.75)
         """
-        url = f"{self.host}/api/v1/quotes"
-        payload = {
-            "apikey": self.api_key,
-            "symbol": "NIFTY",
-            "exchange": "NSE_INDEX"
-        }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = self._session.post(self._quotes_url, json=self._quotes_payload, timeout=self.timeout)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json_loads(response.content)
         if data.get("status") == "success":
             ltp = data["data"]["ltp"]
-            logger.info(f"[AUTO] NIFTY Spot from API: {ltp}")
+            logger.info("[AUTO] NIFTY Spot from API: %s", ltp)
             return float(ltp)
         else:
             raise Exception(f"Quote API failed: {data.get('message', 'Unknown error')}")
 
+    def _fetch_spot(self, api_fallback=True):
+        """
+        Spot price from WebSocket if available, else quotes API fallback
+
+        With api_fallback=False and a DataPipeline present, a missing WebSocket
+        LTP raises instead: no LTP means the broker feed is still down, so the
+        quotes API would fail too.
+        """
+        spot_price = None
+        if self.data_pipeline:
+            logger.info("[AUTO] Attempting WebSocket-based spot price detection...")
+            spot_price = self.fetch_spot_price_from_websocket()
+            if spot_price is None:
+                if not api_fallback:
+                    raise Exception("WebSocket LTP not available (broker feed not up yet)")
+                logger.warning("[AUTO] WebSocket LTP not available, will try API fallback")
+
+        # Fallback to API if WebSocket failed
+        if spot_price is None:
+            logger.info("[AUTO] Using API fallback for spot price...")
+            spot_price = self.fetch_spot_price()
+
+        return spot_price
+
+    def _fetch_spot_and_expiries(self, api_fallback=True):
+        """
+        Fetch spot price and expiry list concurrently
+
+        The two calls are independent (ATM only needs spot, expiry list needs
+        nothing), so the critical path is max(spot, expiry) instead of the sum.
+
+        Returns: tuple (spot_price: float, expiries: list)
+        """
+        if not api_fallback and self.data_pipeline:
+            # WebSocket LTP is a local read: check it before spending an API call
+            spot_price = self._fetch_spot(api_fallback=False)
+            return spot_price, self.fetch_expiries()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            spot_future = executor.submit(self._fetch_spot)
+            expiries_future = executor.submit(self.fetch_expiries)
+            return spot_future.result(), expiries_future.result()
+
     def calculate_atm_strike(self, spot_price):
 
         """
-        Round spot price to nearest 100
-        Examples: 24248 -> 24200, 24275 -> 24300
+        Round spot price to nearest 100 (ties round up)
+        Examples: 24248 -> 24200, 24250 -> 24300, 24275 -> 24300
         Returns: int (e.g., 24200)
         """
-        atm = round(spot_price / 100) * 100
-        logger.info(f"[AUTO] Calculated ATM: {spot_price:.2f} -> {atm}")
-        return int(atm)
+        # Half-up via floor division (round() would send 24250 to the even 24200)
+        atm = int((spot_price + 50) // 100) * 100
+        logger.info("[AUTO] Calculated ATM: %.2f -> %d", spot_price, atm)
+        return atm
 
     def fetch_expiries(self):
+        """
+        Fetch all NIFTY option expiries (cached for expiries_cache_ttl seconds)
+
+        The expiry calendar changes at most weekly, so wait-mode retries reuse
+        the first successful response. If the API fails and a cached list
+        exists (even a stale one), the cached list is returned instead.
+
+        Returns: list of expiry strings (e.g., ["10-JUL-25", "17-JUL-25", ...])
+        """
+        cache_age = time_module.monotonic() - self._expiries_cache_ts
+        if self._expiries_cache and cache_age < self.expiries_cache_ttl:
+            return self._expiries_cache
+
+        try:
+            expiries = self._fetch_expiries_from_api()
+        except Exception as e:
+            if self._expiries_cache:
+                logger.warning("[AUTO] Expiry API failed (%s), using cached expiries", e)
+                return self._expiries_cache
+            raise
+
+        if expiries:
+            self._expiries_cache = expiries
+            self._expiries_cache_ts = time_module.monotonic()
+        return expiries
+
+    def _fetch_expiries_from_api(self):
         """
         Fetch all NIFTY option expiries from OpenAlgo
         Returns: list of expiry strings (e.g., ["10-JUL-25", "17-JUL-25", ...])
         """
-        url = f"{self.host}/api/v1/expiry"
-        payload = {
-            "apikey": self.api_key,
-            "symbol": "NIFTY",
-            "exchange": "NFO",
-            "instrumenttype": "options"
-        }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = self._session.post(self._expiry_url, json=self._expiry_payload, timeout=self.timeout)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json_loads(response.content)
         if data.get("status") == "success":
             expiries = data.get("data", [])
-            logger.info(f"[AUTO] Found {len(expiries)} expiries")
+            logger.info("[AUTO] Found %d expiries", len(expiries))
             return expiries
         else:
             raise Exception(f"Expiry API failed: {data.get('message', 'Unknown error')}")
 
+    def _index_expiries(self, expiries):
+        """
+        Parse and sort an expiry list once; reused while the list is unchanged
+
+        The expiry list is identical across retries (see fetch_expiries cache),
+        so each later lookup is a bisect instead of re-parsing every entry.
+        OpenAlgo usually returns expiries in order, but sorting here keeps the
+        lookup correct if it doesn't.
+
+        Returns: tuple (sorted dates, matching "DD-MMM-YY" strings)
+        """
+        key = tuple(expiries)
+        if key != self._expiry_index_key:
+            parsed = []
+            for exp_str in expiries:
+                # Parse expiry (handle "DD-MMM-YY" format)
+                exp_date = _parse_expiry(exp_str)
+                if exp_date is not None:
+                    parsed.append((exp_date, exp_str))
+            parsed.sort()
+            self._expiry_index = ([d for d, _ in parsed], [e for _, e in parsed])
+            self._expiry_index_key = key
+        return self._expiry_index
+
     def find_nearest_expiry(self, expiries):
         """
         Find nearest expiry from list of expiries (regardless of day)
@@ -165,29 +353,25 @@ class AutoDetector:
 
         Returns: str in "DD-MMM-YY" format (e.g., "28-JAN-26")
         """
-        now = datetime.now(IST).date()
-        future_expiries = []
+        nearest_expiry, nearest_date = self._nearest_expiry(expiries)
 
-        for exp_str in expiries:
-            # Parse expiry (handle "DD-MMM-YY" format)
-            try:
-                exp_date = datetime.strptime(exp_str, "%d-%b-%y")
-            except ValueError:
-                continue
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[AUTO] Nearest expiry: %s (%s)", nearest_expiry, nearest_date.strftime('%A, %d %B %Y'))
+        return nearest_expiry
 
-            # Filter: future dates only
-            if exp_date.date() >= now:
-                future_expiries.append((exp_date, exp_str))
+    def _nearest_expiry(self, expiries):
+        """
+        First expiry on or after today (future dates only), without logging
 
-        if not future_expiries:
-            raise Exception("No future expiries found")
+        Returns: tuple (expiry: str in "DD-MMM-YY" format, expiry date)
+        """
+        expiry_dates, expiry_strs = self._index_expiries(expiries)
 
-        # Sort by date, get nearest
-        future_expiries.sort(key=lambda x: x[0])
-        nearest_date, nearest_expiry = future_expiries[0]
+        idx = bisect.bisect_left(expiry_dates, _ist_today())
+        if idx == len(expiry_dates):
+            raise Exception("No future expiries found")
 
-        logger.info(f"[AUTO] Nearest expiry: {nearest_expiry} ({nearest_date.strftime('%A, %d %B %Y')})")
-        return nearest_expiry
+        return expiry_strs[idx], expiry_dates[idx]
 
     def convert_expiry_format(self, openalgo_expiry):
         """
@@ -195,7 +379,7 @@ class AutoDetector:
         Input: "17-JUL-25" -> Output: "17JUL25"
         """
         system_format = openalgo_expiry.replace("-", "")
-        logger.info(f"[AUTO] Converted expiry: {openalgo_expiry} -> {system_format}")
+        logger.info("[AUTO] Converted expiry: %s -> %s", openalgo_expiry, system_format)
         return system_format
 
     def _api_call_with_retry(self, func, max_retries=3, delay=5):
@@ -204,155 +388,184 @@ class AutoDetector:
             try:
                 return func()
             except Exception as e:
-                logger.warning(f"[AUTO] Attempt {attempt}/{max_retries} failed: {e}")
+                logger.warning("[AUTO] Attempt %d/%d failed: %s", attempt, max_retries, e)
                 if attempt < max_retries:
-                    logger.info(f"[AUTO] Retrying in {delay} seconds...")
+                    logger.info("[AUTO] Retrying in %s seconds...", delay)
                     time_module.sleep(delay)
                 else:
-                    logger.error(f"[AUTO] All {max_retries} attempts failed")
+                    logger.error("[AUTO] All %d attempts failed", max_retries)
                     raise
 
-    def _wait_for_broker_connection(self):
+    def _run_detection_once(self, api_fallback=True):
         """
-        Graceful degradation: Wait for broker connection instead of crashing
+        Single detection attempt (no retry)
 
-        Features:
-        - Retries with exponential backoff (30s -> 60s -> 120s -> 240s -> 300s cap)
-        - Max 60 retries (~30 minutes of waiting)
-        - Telegram alert on wait mode entry
-        - Periodic Telegram updates every 5 minutes
-        - Final alert with error if max retries exceeded
+        Args:
+            api_fallback: Fall back to the quotes API when WebSocket LTP is missing
 
-        Returns: tuple (atm_strike: int, expiry_date: str) when broker connects
-        Raises: Exception if max retries exceeded
+        Returns: tuple (atm_strike: int, expiry_date: str)
+        Raises: Exception on any API/validation failure
         """
-        logger.warning("[AUTO] Broker not connected. Entering wait mode...")
-        logger.warning("[AUTO] Please log in to Zerodha at https://openalgo.ronniedreams.in")
+        # Steps 1 + 3: Fetch spot price and expiries (concurrently)
+        spot_price, expiries = self._fetch_spot_and_expiries(api_fallback)
 
-        # Send initial Telegram alert
-        if self.telegram_notifier:
-            msg = f"[AUTO] Entering wait mode. Retrying every 30s (max 60 attempts = ~30 min). Please log in to Zerodha."
-            self.telegram_notifier.send_message(msg)
+        # Step 2: Calculate ATM strike
+        atm_strike = self.calculate_atm_strike(spot_price)
 
-        wait_interval = 30  # Start with 30 seconds
-        max_wait_interval = 300  # Cap at 5 minutes
-        retry_count = 0
-        start_time = time_module.time()  # Track actual wall-clock start time
-        last_telegram_update = 0  # Track actual elapsed seconds at last Telegram update
-        last_error = None
+        # Steps 4 + 5: Find nearest expiry and convert to system format
+        # (convert_expiry_format inlined: "17-JUL-25" -> "17JUL25", one log line)
+        nearest_expiry, nearest_date = self._nearest_expiry(expiries)
+        expiry_date = nearest_expiry.replace("-", "")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[AUTO] Nearest expiry: %s -> %s (%s)",
+                        nearest_expiry, expiry_date, nearest_date.strftime('%A, %d %B %Y'))
 
-        while True:
-            retry_count += 1
+        # Step 6: Validate
+        self._validate(atm_strike, expiry_date)
 
-            # Check if max retries exceeded
-            if retry_count > self.max_wait_retries:
-                error_msg = f"[AUTO] Max retries ({self.max_wait_retries}) exceeded after ~30 minutes. Last error: {last_error}"
-                logger.error(error_msg)
+        return atm_strike, expiry_date
 
-                # Send final alert via Telegram
-                if self.telegram_notifier:
-                    telegram_msg = f"[CRITICAL] Auto-detect failed after 30 minutes. Giving up. Error: {str(last_error)[:100]}"
-                    self.telegram_notifier.send_message(telegram_msg)
+    def _retry_policy(self, quick_retries=None):
+        """
+        Yield (phase, attempt, delay) for each detection attempt
 
-                raise Exception(error_msg)
+        Phase "quick": quick_retries attempts, ~5s jittered delay between them
+        Phase "wait": max_wait_retries attempts; first runs immediately, then
+        decorrelated-jitter exponential backoff (30s floor, 300s cap)
+        """
+        if quick_retries is None:
+            quick_retries = self.quick_retries
+
+        for attempt in range(1, quick_retries + 1):
+            delay = 0
+            if attempt > 1:
+                delay = self.quick_retry_delay + random.uniform(0, self.quick_retry_delay / 2)
+            yield "quick", attempt, delay
+
+        wait_interval = self.min_wait_interval
+        for attempt in range(1, self.max_wait_retries + 1):
+            if attempt == 1:
+                # Broker may have come up right after Phase 1 - try immediately
+                yield "wait", attempt, 0
+                continue
+            yield "wait", attempt, wait_interval
+            wait_interval = min(
+                self.max_wait_interval,
+                random.uniform(self.min_wait_interval, wait_interval * 3)
+            )
 
-            logger.info(f"[AUTO] Retry {retry_count}/{self.max_wait_retries}: Retrying in {wait_interval} seconds ({datetime.now(IST).strftime('%H:%M:%S')} IST)...")
-            time_module.sleep(wait_interval)
+    def _detect_with_retries(self, policy):
+        """
+        Run detection attempts driven by a _retry_policy() generator
 
-            # Send periodic Telegram update every 5 minutes (using wall-clock time)
-            elapsed_seconds = time_module.time() - start_time
-            if elapsed_seconds - last_telegram_update >= self.periodic_update_interval:
-                elapsed_minutes = int(elapsed_seconds // 60)
+        Wait phase adds graceful degradation:
+        - Telegram alert on wait mode entry
+        - Periodic Telegram updates every 5 minutes
+        - Final alert with error if max retries exceeded
+
+        Returns: tuple (atm_strike: int, expiry_date: str)
+        Raises: Exception if the policy is exhausted
+        """
+        start_time = None  # Wall-clock start of wait mode
+        last_telegram_update = 0  # Track actual elapsed seconds at last Telegram update
+        last_error = None
+
+        for phase, attempt, delay in policy:
+            if phase == "wait" and attempt == 1:
+                logger.warning("[AUTO] Broker not connected. Entering wait mode...")
+                logger.warning("[AUTO] Please log in to Zerodha at https://openalgo.ronniedreams.in")
+
+                # Send initial Telegram alert
                 if self.telegram_notifier:
-                    msg = f"[AUTO] Still retrying... Attempt {retry_count}/{self.max_wait_retries} ({elapsed_minutes} min elapsed)"
+                    msg = f"[AUTO] Entering wait mode. Retrying every 30s (max 60 attempts = ~30 min). Please log in to Zerodha."
                     self.telegram_notifier.send_message(msg)
-                last_telegram_update = elapsed_seconds
+                start_time = time_module.time()
 
-            try:
-                # Attempt full auto-detection
-                spot_price = None
-                if self.data_pipeline:
-                    spot_price = self.fetch_spot_price_from_websocket()
+            if delay:
+                if phase == "wait":
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("[AUTO] Retry %d/%d: Retrying in %.0f seconds (%s IST)...",
+                                    attempt, self.max_wait_retries, delay, _ist_clock())
+                else:
+                    logger.info("[AUTO] Retrying in %.1f seconds...", delay)
+                time_module.sleep(delay)
 
-                if spot_price is None:
-                    spot_price = self.fetch_spot_price()
+            # Send periodic Telegram update every 5 minutes (using wall-clock time)
+            if phase == "wait":
+                elapsed_seconds = time_module.time() - start_time
+                if elapsed_seconds - last_telegram_update >= self.periodic_update_interval:
+                    elapsed_minutes = int(elapsed_seconds // 60)
+                    if self.telegram_notifier:
+                        msg = f"[AUTO] Still retrying... Attempt {attempt}/{self.max_wait_retries} ({elapsed_minutes} min elapsed)"
+                        self.telegram_notifier.send_message(msg)
+                    last_telegram_update = elapsed_seconds
 
-                atm_strike = self.calculate_atm_strike(spot_price)
-                expiries = self.fetch_expiries()
-                nearest_expiry = self.find_nearest_expiry(expiries)
-                expiry_date = self.convert_expiry_format(nearest_expiry)
-                self._validate(atm_strike, expiry_date)
+            try:
+                # Wait mode: WebSocket LTP arriving is the broker-up signal, so skip
+                # the quotes API fallback (Phase 1 keeps it while WebSocket warms up)
+                atm_strike, expiry_date = self._run_detection_once(api_fallback=(phase == "quick"))
+            except Exception as e:
+                last_error = e
+                if phase == "wait":
+                    logger.warning("[AUTO] Retry %d failed: %s", attempt, e)
+                else:
+                    logger.warning("[AUTO] Attempt %d/%d failed: %s", attempt, self.quick_retries, e)
+                    if attempt == self.quick_retries:
+                        logger.error("[AUTO] Quick retries exhausted (%d/%d)", attempt, self.quick_retries)
+                continue
 
+            if phase == "wait":
                 # Success! Broker is connected
-                logger.info(f"[AUTO] Broker reconnected on retry {retry_count}! Proceeding with strategy start...")
-                logger.info(f"[AUTO] ATM={atm_strike}, Expiry={expiry_date}")
+                logger.info("[AUTO] Broker reconnected on retry %d! Proceeding with strategy start...", attempt)
+                logger.info("[AUTO] ATM=%s, Expiry=%s", atm_strike, expiry_date)
 
                 # Send Telegram alert
                 if self.telegram_notifier:
-                    msg = f"[AUTO] Broker connected after {retry_count} retries at {datetime.now(IST).strftime('%H:%M:%S')} IST. Strategy starting now!"
+                    msg = f"[AUTO] Broker connected after {attempt} retries at {_ist_clock()} IST. Strategy starting now!"
                     self.telegram_notifier.send_message(msg)
+            else:
+                logger.info("[AUTO] Auto-detection complete: ATM=%s, Expiry=%s", atm_strike, expiry_date)
 
-                return atm_strike, expiry_date
+            return atm_strike, expiry_date
 
-            except Exception as e:
-                last_error = e
-                logger.warning(f"[AUTO] Retry {retry_count} failed: {e}")
-                # Exponential backoff: 30 -> 60 -> 120 -> 240 -> 300 -> 300...
-                wait_interval = min(wait_interval * 2, max_wait_interval)
-                logger.info(f"[AUTO] Next retry interval: {wait_interval} seconds")
+        error_msg = f"[AUTO] Max retries ({self.max_wait_retries}) exceeded after ~30 minutes. Last error: {last_error}"
+        logger.error(error_msg)
 
-    def auto_detect(self):
-        """
-        Main auto-detection method with graceful degradation
+        # Send final alert via Telegram
+        if self.telegram_notifier:
+            telegram_msg = f"[CRITICAL] Auto-detect failed after 30 minutes. Giving up. Error: {str(last_error)[:100]}"
+            self.telegram_notifier.send_message(telegram_msg)
 
-        Phase 1: Quick retries (3 attempts with 5s delay)
-        Phase 2: Graceful wait mode (exponential backoff) if broker not connected
+        raise Exception(error_msg)
 
-        Returns: tuple (atm_strike: int, expiry_date: str)
+    def _wait_for_broker_connection(self):
         """
-        # Phase 1: Quick retries
-        logger.info("[AUTO] Starting auto-detection...")
-        for attempt in range(1, 4):
-            try:
-                # Step 1: Fetch spot price
-                spot_price = None
-                if self.data_pipeline:
-                    logger.info("[AUTO] Attempting WebSocket-based spot price detection...")
-                    spot_price = self.fetch_spot_price_from_websocket()
-
-                # Fallback to API if WebSocket failed
-                if spot_price is None:
-                    logger.info("[AUTO] Using API fallback for spot price...")
-                    spot_price = self.fetch_spot_price()
-
-                # Step 2: Calculate ATM strike
-                atm_strike = self.calculate_atm_strike(spot_price)
+        Graceful degradation: Wait for broker connection instead of crashing
 
-                # Step 3: Fetch expiries
-                expiries = self.fetch_expiries()
+        Runs only the wait phase of the retry policy (no quick retries).
 
-                # Step 4: Find nearest expiry
-                nearest_expiry = self.find_nearest_expiry(expiries)
+        Returns: tuple (atm_strike: int, expiry_date: str) when broker connects
+        Raises: Exception if max retries exceeded
+        """
+        return self._detect_with_retries(self._retry_policy(quick_retries=0))
 
-                # Step 5: Convert to system format
-                expiry_date = self.convert_expiry_format(nearest_expiry)
+    def auto_detect(self):
+        """
+        Main auto-detection method with graceful degradation
 
-                # Step 6: Validate
-                self._validate(atm_strike, expiry_date)
+        Phase 1: Quick retries (3 attempts with ~5s jittered delay)
+        Phase 2: Graceful wait mode (exponential backoff) if broker not connected
 
-                logger.info(f"[AUTO] Auto-detection complete: ATM={atm_strike}, Expiry={expiry_date}")
-                return atm_strike, expiry_date
+        Both phases run through one retry loop driven by _retry_policy().
 
-            except Exception as e:
-                logger.warning(f"[AUTO] Attempt {attempt}/3 failed: {e}")
-                if attempt < 3:
-                    logger.info(f"[AUTO] Retrying in 5 seconds...")
-                    time_module.sleep(5)
-                else:
-                    logger.error(f"[AUTO] Quick retries exhausted (3/3)")
+        Returns: tuple (atm_strike: int, expiry_date: str)
+        """
+        logger.info("[AUTO] Starting auto-detection...")
+        return self._detect_with_retries(self._retry_policy())
 
-        # Phase 2: Graceful wait mode (exponential backoff with 30s initial interval)
-        return self._wait_for_broker_connection()
+    def close(self):
+        """Release the pooled HTTP connections"""
+        self._session.close()
 
     def _validate(self, atm_strike, expiry_date):
         """Validate auto-detected values"""
@@ -367,4 +580,4 @@ class AutoDetector:
         if not expiry_date or len(expiry_date) not in [7, 8]:  # DDMMMYY or DDDMMMYY
             raise ValueError(f"Invalid expiry format: {expiry_date}")
 
-        logger.info(f"[AUTO] Validation passed: ATM={atm_strike}, Expiry={expiry_date}")
+        logger.info("[AUTO] Validation passed: ATM=%s, Expiry=%s", atm_strike, expiry_date)
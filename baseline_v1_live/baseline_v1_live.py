@@ -31,11 +31,18 @@ import logging
 import argparse
 import sys
 import time
+import random
 import asyncio
 import signal
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time as dt_time, timedelta
+from operator import itemgetter
 from typing import Dict, Optional
-import pytz
+from zoneinfo import ZoneInfo
 import os
 
 # Imports from current package
@@ -43,7 +50,12 @@ from .config import (
     MARKET_START_TIME,
     MARKET_END_TIME,
     FORCE_EXIT_TIME,
+    MARKET_CLOSE_TIME,
+    MARKET_CLOSED_MAX_SLEEP,
     ORDER_FILL_CHECK_INTERVAL,
+    MAIN_LOOP_ERROR_BACKOFF_BASE,
+    MAIN_LOOP_ERROR_BACKOFF_MAX,
+    POSITION_RECONCILE_INTERVAL,
     LOG_DIR,
     LOG_LEVEL,
     PAPER_TRADING,
@@ -54,6 +66,9 @@ from .config import (
     STALE_SYMBOL_HARD_THRESHOLD,
     KILL_SWITCH_FILE,
     PAUSE_SWITCH_FILE,
+    LIVE_STREAM_READY_TIMEOUT,
+    ENABLE_DASHBOARD_BACKFILL,
+    DASHBOARD_BACKFILL_BATCH_SIZE,
 )
 from .data_pipeline import DataPipeline
 from .swing_detector import MultiSwingDetector
@@ -66,11 +81,16 @@ from .telegram_notifier import get_notifier, TelegramCommandListener
 from .notification_manager import NotificationManager
 from .startup_health_check import StartupHealthCheck
 
+# Optional faster event loop (libuv); falls back to the stdlib loop when absent
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Setup logging with IST timestamps
 os.makedirs(LOG_DIR, exist_ok=True)
 
-import pytz as _pytz
-_IST = _pytz.timezone('Asia/Kolkata')
+_IST = ZoneInfo('Asia/Kolkata')
 
 class _ISTFormatter(logging.Formatter):
     def converter(self, timestamp):
@@ -89,7 +109,44 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
+
+
+class _BoundedSet:
+    """Set with FIFO eviction once maxlen keys are held (O(1) add / membership)"""
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._keys = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key):
+        if key in self._keys:
+            return
+        self._keys[key] = None
+        if len(self._keys) > self.maxlen:
+            self._keys.popitem(last=False)
+
+
+class _PriceView(Mapping):
+    """Read-only {symbol: close} view over latest bars (no dict is built)"""
+
+    def __init__(self, bars: Dict):
+        self._bars = bars
+
+    def __getitem__(self, symbol) -> float:
+        return self._bars[symbol].close
+
+    def __iter__(self):
+        return iter(self._bars)
+
+    def __len__(self) -> int:
+        return len(self._bars)
 
 
 class BaselineV1Live:
@@ -158,6 +215,11 @@ class BaselineV1Live:
         self.notification_manager = NotificationManager(self.telegram, self.state_manager)
         self.startup_checker = StartupHealthCheck(self.notification_manager)
         self.shutdown_requested = False
+        # Set by request_shutdown() so blocking waits (waiting mode) wake immediately
+        self._shutdown_event = threading.Event()
+        # Event loop + asyncio wake-up used by _idle_sleep() (set in run_trading_loop)
+        self._loop = None
+        self._shutdown_wakeup = None
         self._is_paused = False
         self._pause_alerted = False  # Prevent repeated pause Telegram alerts
 
@@ -183,19 +245,26 @@ class BaselineV1Live:
             'PE': None   # Stores previous best PE symbol
         }
 
-        # Last bar update time
-        self.last_bar_update = None
-
         # Track the last bar timestamp sent to swing_detector per symbol.
         # Prevents feeding the same or older bar repeatedly (e.g., during the
         # startup window when fill_initial_gap and live-stream bars overlap).
         self._last_sent_bar_ts = {}  # {symbol: datetime}
 
+        # Timestamp of the latest bar already written to the dashboard bars table.
+        # Completed bars change once a minute, so most ticks have nothing new to save.
+        self._last_saved_bar_ts = {}  # {symbol: datetime}
+        # continuous_filter.candidates_version last written to swing_candidates table
+        self._saved_candidates_version = None
+        # (symbol, exit_time) of closed trades already passed to log_trade() this run
+        self._logged_trades = set()
+
         # Guard flags to ensure one-shot exit handlers (prevent Telegram spam)
         self._eod_exit_done = False  # Set True after handle_eod_exit() runs once
+        self._err_backoff = MAIN_LOOP_ERROR_BACKOFF_BASE  # Main-loop error retry delay (doubles per failure)
 
-        # Guard against duplicate fill processing (same fill from multiple paths)
-        self._processed_fill_ids = set()
+        # Guard against duplicate fill processing (same fill from multiple paths).
+        # Bounded so a full session of fills doesn't grow it without limit.
+        self._processed_fill_ids = _BoundedSet(maxlen=1024)
 
         # Track deferred strike switches (executed at bar close, not mid-bar)
         # When the best strike changes mid-bar, we defer the cancel+replace to bar close
@@ -208,7 +277,7 @@ class BaselineV1Live:
         self._stale_blocked_symbols = set()
 
         # Telegram throttling for stale-symbol alerts (prevent spam)
-        self._last_stale_telegram = {}    # {symbol: last_alert_timestamp}
+        self._last_stale_telegram = {}    # {symbol: last_alert time.monotonic()}
         self._stale_suppress_count = {}   # {symbol: count of suppressed alerts}
 
         # FIX: Load previous state from database (CRITICAL for crash recovery)
@@ -321,7 +390,7 @@ class BaselineV1Live:
                 )
 
                 latest_bars = self.data_pipeline.get_all_latest_bars()
-                current_prices = {symbol: bar.close for symbol, bar in latest_bars.items()}
+                current_prices = _PriceView(latest_bars)
 
                 for fill_info in reconcile_results['limit_orders_filled']:
                     logger.warning(
@@ -358,7 +427,8 @@ class BaselineV1Live:
                             )
                             self.telegram.send_message(
                                 f"[CRITICAL] FAILED to re-place SL for {missing_symbol}\n"
-                                f"MANUAL BROKER CHECK REQUIRED"
+                                f"MANUAL BROKER CHECK REQUIRED",
+                                flush_now=True,
                             )
 
         except Exception as e:
@@ -399,6 +469,11 @@ class BaselineV1Live:
                 # Transient error - enter waiting mode
                 logger.warning("Transient error detected. Entering waiting mode...")
                 self.enter_waiting_mode(error_type, error_msg)
+                if self.shutdown_requested:
+                    # Shutdown arrived while waiting: cancel restored orders, save
+                    # state and flush queued alerts before leaving start()
+                    self.handle_graceful_shutdown()
+                    return
         
         # Health check passed
         self.telegram.send_message(
@@ -448,103 +523,63 @@ class BaselineV1Live:
         self.data_pipeline.fill_initial_gap()
         logger.info("[GAP-FILL] Gap fill complete")
         
-        # Reset swing detectors before historical replay.
-        # On same-day restart self.bars retains the previous session's last bar,
-        # so historical replay (9:15 onward) is rejected as OUT-OF-ORDER.
-        # Setting current_date=None forces reset_for_new_day() on the first bar,
-        # clearing all stale bar/swing state before replay begins.
+        # Single pass per symbol: reset detector, replay history, seed the live
+        # dedup baseline and collect swing events for the DB backfill below.
+        logger.info("[SWING] Processing historical bars for swing detection...")
+        swing_events = {}
+
         for symbol in self.symbols:
             detector = self.swing_detector.get_detector(symbol)
+
+            # Reset swing detector before historical replay.
+            # On same-day restart self.bars retains the previous session's last bar,
+            # so historical replay (9:15 onward) is rejected as OUT-OF-ORDER.
+            # Setting current_date=None forces reset_for_new_day() on the first bar,
+            # clearing all stale bar/swing state before replay begins.
             if detector:
                 detector.current_date = None
-        logger.info("[HIST] Swing detectors reset - historical replay will start fresh")
 
-        # Initialize swing detector with historical bars
-        logger.info("[SWING] Processing historical bars for swing detection...")
-        
-        for symbol in self.symbols:
             bars = self.data_pipeline.get_bars_for_symbol(symbol)
             if bars:
-                # Process each historical bar
-                for bar in bars:
-                    bar_dict = {
-                        'timestamp': bar.timestamp,
-                        'open': bar.open,
-                        'high': bar.high,
-                        'low': bar.low,
-                        'close': bar.close,
-                        'volume': bar.volume,
-                        'vwap': bar.vwap
-                    }
-                    self.swing_detector.update(symbol, bar_dict)
-                
-                logger.debug(f"{symbol}: {len(bars)} historical bars processed")
+                self.swing_detector.replay_bars(symbol, bars)
+                logger.debug("%s: %d historical bars processed", symbol, len(bars))
+                detector = detector or self.swing_detector.get_detector(symbol)
 
-        logger.info("[HIST] Historical data processing complete")
+            if not detector:
+                continue
 
-        # Seed last-sent timestamps from what the swing detectors now have.
-        # This ensures the live-mode dedup filter starts from the right baseline.
-        for symbol in self.symbols:
-            detector = self.swing_detector.get_detector(symbol)
-            if detector and detector.bars:
-                self._last_sent_bar_ts[symbol] = detector.bars[-1]['timestamp']
+            # Seed last-sent timestamp from what the swing detector now has.
+            # This ensures the live-mode dedup filter starts from the right baseline.
+            if detector.last_bar_ts is not None:
+                self._last_sent_bar_ts[symbol] = detector.last_bar_ts
+
+            # Uses swing_event_log (append-only) instead of detector.swings (which updates in-place).
+            # This ensures morning swings that got updated to afternoon timestamps still appear.
+            if detector.swing_event_log:
+                swing_events[symbol] = detector.swing_event_log
+
+        logger.info("[HIST] Historical data processing complete")
 
         # Clear flag - now in real-time mode, send notifications normally
         self.loading_historical_data = False
 
         # CRITICAL: Backfill all historical swing EVENTS to database
-        # Uses swing_event_log (append-only) instead of detector.swings (which updates in-place).
-        # This ensures morning swings that got updated to afternoon timestamps still appear.
         logger.info("[HIST] Backfilling historical swing events to database...")
-        historical_swings_logged = 0
 
-        for symbol in self.symbols:
-            detector = self.swing_detector.get_detector(symbol)
-            if detector and detector.swing_event_log:
-                for event in detector.swing_event_log:
-                    try:
-                        # INSERT OR IGNORE in log_swing_detection handles duplicates
-                        self.state_manager.log_swing_detection(
-                            symbol=symbol,
-                            swing_type=event['type'],
-                            swing_price=event['price'],
-                            swing_time=event['timestamp'],
-                            vwap=event['vwap'],
-                            bar_index=event['index']
-                        )
-                        historical_swings_logged += 1
-                    except Exception as e:
-                        logger.error(f"Error logging historical swing for {symbol}: {e}")
+        # One existence query + one executemany in a single transaction
+        # (duplicates are filtered in memory against the existing keys)
+        historical_swings_logged = 0
+        try:
+            historical_swings_logged = self.state_manager.log_swing_detections_bulk(swing_events)
+        except Exception as e:
+            logger.error(f"Error logging historical swings: {e}")
 
         logger.info(f"[HIST] Backfilled {historical_swings_logged} historical swing events to database")
 
-        # Save all historical bars to database for dashboard visibility
-        logger.info("[HIST] Saving historical bars to database...")
-        historical_bars_saved = 0
-        try:
-            for symbol in self.symbols:
-                bars = self.data_pipeline.get_bars_for_symbol(symbol)
-                if bars:
-                    # Save ALL historical bars to database (not just the last one)
-                    # This ensures dashboard shows complete bar history from 9:15 AM
-                    for bar in bars:
-                        bars_for_db = {
-                            symbol: {
-                                'timestamp': bar.timestamp.isoformat(),
-                                'open': bar.open,
-                                'high': bar.high,
-                                'low': bar.low,
-                                'close': bar.close,
-                                'vwap': bar.vwap,
-                                'volume': bar.volume
-                            }
-                        }
-                        self.state_manager.save_latest_bars(bars_for_db)
-                        historical_bars_saved += 1
-
-            logger.info(f"[HIST] Saved {historical_bars_saved} historical bars to database")
-        except Exception as e:
-            logger.error(f"[HIST] Error saving historical bars to database: {e}")
+        # Historical bars for the dashboard are written in the background once the
+        # trading loop is running (see _backfill_dashboard_bars) - not needed for trading
+        if not ENABLE_DASHBOARD_BACKFILL:
+            logger.info("[HIST] Dashboard bar backfill disabled (ENABLE_DASHBOARD_BACKFILL=false)")
 
         # STARTUP PROTECTION: Mark swings that already broke in historical data
         # These swings will NOT trigger order placement (opportunity already missed)
@@ -568,9 +603,13 @@ class BaselineV1Live:
         logger.info("="*80)
 
         # Wait for live data stream to stabilize
+        # Returns as soon as live ticks cover enough symbols, capped at LIVE_STREAM_READY_TIMEOUT
         logger.info("Waiting for live WebSocket stream to stabilize...")
-        time.sleep(10)
-        logger.info("Live stream ready")
+        wait_start = time.time()
+        if self.data_pipeline.wait_for_live_data(timeout=LIVE_STREAM_READY_TIMEOUT):
+            logger.info(f"Live stream ready ({time.time() - wait_start:.1f}s)")
+        else:
+            logger.warning(f"Live stream not ready after {LIVE_STREAM_READY_TIMEOUT}s - continuing")
         logger.info("="*80)
         
         # Check data health
@@ -626,7 +665,19 @@ class BaselineV1Live:
         self.telegram.send_message(
             f"[LIVE] Strategy running. Monitoring {len(self.symbols)} symbols.{pos_str}"
         )
-        asyncio.run(self.run_trading_loop())
+        loop_factory = uvloop.new_event_loop if uvloop is not None and sys.platform != 'win32' else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(self.run_trading_loop())
+
+    def request_shutdown(self):
+        """Request graceful shutdown and wake any blocking wait (safe from signal handlers)"""
+        self.shutdown_requested = True
+        self._shutdown_event.set()
+        # Stop a startup history retry wait so shutdown is not delayed by minutes
+        self.data_pipeline.cancel_history_retry()
+        # Wake an _idle_sleep() in progress (thread-safe; also works from signal handlers)
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._shutdown_wakeup.set)
 
     def enter_waiting_mode(self, error_type: str, error_msg: str):
         """
@@ -676,27 +727,271 @@ class BaselineV1Live:
                     )
                     last_hourly_status = time.time()
 
-                time.sleep(WAITING_MODE_CHECK_INTERVAL)
+                # Interruptible sleep: returns immediately on SIGINT/SIGTERM
+                self._shutdown_event.wait(WAITING_MODE_CHECK_INTERVAL)
 
             except KeyboardInterrupt:
                 logger.info("[WAITING] Interrupted by user")
-                self.shutdown_requested = True
+                self.request_shutdown()
                 break
             except Exception as e:
                 logger.error(f"[WAITING] Error in waiting loop: {e}")
-                time.sleep(60)
+                self._shutdown_event.wait(60)
+
+        if self.shutdown_requested:
+            logger.info("[WAITING] Shutdown requested - leaving waiting mode")
+
+    async def _backfill_dashboard_bars(self):
+        """
+        Save all historical bars to the database for dashboard visibility
+
+        Runs as a background task alongside the trading loop so the dashboard
+        shows complete bar history from 9:15 AM without delaying startup.
+        Writes DASHBOARD_BACKFILL_BATCH_SIZE rows per transaction and yields
+        to the event loop between batches.
+        """
+        logger.info("[HIST] Saving historical bars to database (background)...")
+        historical_bars_saved = 0
+        try:
+            bar_rows = []
+            for symbol in self.symbols:
+                for bar in self.data_pipeline.get_bars_for_symbol(symbol) or []:
+                    bar_rows.append((
+                        symbol,
+                        bar.timestamp_iso,
+                        bar.open,
+                        bar.high,
+                        bar.low,
+                        bar.close,
+                        bar.vwap,
+                        bar.volume
+                    ))
+
+            for start in range(0, len(bar_rows), DASHBOARD_BACKFILL_BATCH_SIZE):
+                if self.shutdown_requested:
+                    break
+                batch = bar_rows[start:start + DASHBOARD_BACKFILL_BATCH_SIZE]
+                historical_bars_saved += self.state_manager.save_bars_bulk(batch)
+                await asyncio.sleep(0)
+
+            logger.info(f"[HIST] Saved {historical_bars_saved} historical bars to database")
+        except Exception as e:
+            logger.error(f"[HIST] Error saving historical bars to database: {e}")
+
+    def _check_watchdog(self):
+        """
+        WATCHDOG: Check data freshness and reconnect/reconcile if stale
+
+        Called every 30 seconds by _watchdog(). Runs on the event loop thread, so
+        reconnect and order reconciliation never interleave with process_tick().
+        Raises SystemExit if reconnection fails or SL orders are missing.
+        """
+        is_fresh, stale_reason = self.data_pipeline.check_data_freshness()
+
+        if not is_fresh:
+            health = self.data_pipeline.get_health_status()
+
+            logger.warning(
+                f"[WATCHDOG] TRIGGERED: {stale_reason} - "
+                f"Data is not fresh, attempting reconnection..."
+            )
+
+            # Send Telegram alert about reconnection attempt
+            self.telegram.send_message(
+                f"[WARNING] [WATCHDOG ALERT] STALE DATA\n\n"
+                f"Reason: {stale_reason}\n"
+                f"Data coverage: {health['data_coverage']:.1%}\n"
+                f"Fresh symbols: {health['symbols_with_data']}/{health['subscribed_symbols']}\n"
+                f"Stale symbols: {health['stale_symbols']}\n\n"
+                f"Attempting automatic reconnection..."
+            )
+
+            # Attempt automatic reconnection
+            # If pipeline already reconnecting (self-healed), skip and let it finish
+            if self.data_pipeline.is_reconnecting:
+                logger.info(
+                    "[WATCHDOG] Pipeline reconnection already in progress - "
+                    "skipping watchdog reconnect, resetting timer"
+                )
+                return
+
+            logger.warning("[WATCHDOG] Attempting to reconnect WebSocket...")
+            reconnect_success = self.data_pipeline.reconnect()
+
+            if reconnect_success:
+                logger.info("[WATCHDOG] Reconnection successful, reconciling orders...")
+
+                # CRITICAL: Reconcile orders with broker after reconnection
+                # This ensures local state matches broker reality
+                try:
+                    # Get current open positions for reconciliation
+                    # open_positions is a dict: {symbol: Position object}
+                    open_positions = self.position_tracker.open_positions
+
+                    # Reconcile orders
+                    reconcile_results = self.order_manager.reconcile_orders_with_broker(
+                        open_positions
+                    )
+
+                    # Handle filled orders discovered during reconnection
+                    if reconcile_results['limit_orders_filled']:
+                        logger.warning(
+                            f"[WATCHDOG] Found {len(reconcile_results['limit_orders_filled'])} "
+                            f"orders filled during disconnect"
+                        )
+
+                        # Get current prices
+                        latest_bars = self.data_pipeline.get_all_latest_bars()
+                        current_prices = _PriceView(latest_bars)
+
+                        # Process each fill
+                        for fill_info in reconcile_results['limit_orders_filled']:
+                            logger.warning(
+                                f"[WATCHDOG] Processing fill from reconnect: "
+                                f"{fill_info['symbol']} @ {fill_info['fill_price']:.2f}"
+                            )
+                            self.handle_order_fill(fill_info, current_prices)
+
+                    # Handle missing SL orders (CRITICAL!)
+                    if reconcile_results['sl_orders_missing']:
+                        missing_symbols = ', '.join(reconcile_results['sl_orders_missing'])
+                        logger.critical(
+                            f"[CRITICAL] MISSING SL ORDERS - "
+                            f"Positions without SL: {missing_symbols} - "
+                            f"MANUAL BROKER CHECK REQUIRED"
+                        )
+                        self.telegram.send_message(
+                            f"[CRITICAL] MISSING SL ORDERS\n\n"
+                            f"Positions without SL protection:\n"
+                            f"{missing_symbols}\n\n"
+                            f"MANUAL BROKER CHECK REQUIRED!",
+                            flush_now=True,
+                        )
+
+                        # Consider triggering emergency shutdown if missing SLs
+                        logger.critical(
+                            "[WATCHDOG] Positions without SL detected - "
+                            "initiating emergency shutdown for safety"
+                        )
+
+                        self.telegram.send_message(
+                            f"[FAILED] [EMERGENCY] Shutting down due to missing SL orders\n"
+                            f"Check broker manually for positions:\n"
+                            f"{', '.join(reconcile_results['sl_orders_missing'])}",
+                            flush_now=True,
+                        )
+
+                        self.handle_emergency_shutdown()
+                        raise SystemExit("Missing SL orders after reconnect")
+
+                    logger.info("[WATCHDOG] Order reconciliation complete")
+
+                except SystemExit:
+                    raise  # Re-raise SystemExit
+                except Exception as e:
+                    logger.error(f"[WATCHDOG] Error during order reconciliation: {e}", exc_info=True)
+
+                    # Send error notification but continue
+                    self.telegram.send_message(
+                        f"[WARNING] Order reconciliation failed\n\n"
+                        f"Error: {str(e)}\n\n"
+                        f"Check positions manually at broker!"
+                    )
+
+                # Send success notification
+                self.telegram.send_message(
+                    f"[OK] [WATCHDOG] RECONNECTION SUCCESSFUL\n\n"
+                    f"WebSocket reconnected and operational.\n"
+                    f"Orders reconciled with broker.\n"
+                    f"Trading system continuing normally."
+                )
+
+            else:
+                # Reconnection failed - trigger emergency shutdown
+                logger.critical(
+                    f"[WATCHDOG] Reconnection failed after multiple attempts - "
+                    f"initiating emergency shutdown"
+                )
+
+                # Send critical Telegram alert
+                self.telegram.send_message(
+                    f"[FAILED] [WATCHDOG CRITICAL] RECONNECTION FAILED\n\n"
+                    f"Reason: {stale_reason}\n"
+                    f"Reconnection attempts: All failed\n\n"
+                    f"Emergency shutdown initiated...\n"
+                    f"All positions will be closed at market.",
+                    flush_now=True,
+                )
+
+                self.handle_emergency_shutdown()
+                raise SystemExit(f"Watchdog triggered: {stale_reason} - reconnection failed")
+
+    async def _watchdog(self):
+        """Periodic data-freshness watchdog, runs as a task alongside run_trading_loop()"""
+        while not self.shutdown_requested:
+            await asyncio.sleep(30)
+            if self.shutdown_requested:
+                break
+            try:
+                self._check_watchdog()
+            except SystemExit:
+                raise
+            except Exception as e:
+                logger.error(f"[WATCHDOG] Error during watchdog check: {e}", exc_info=True)
+
+    def _next_error_backoff(self) -> float:
+        """Return the jittered delay for this main-loop error and double the next one (capped)"""
+        delay = min(self._err_backoff + random.random(), MAIN_LOOP_ERROR_BACKOFF_MAX)
+        self._err_backoff = min(self._err_backoff * 2, MAIN_LOOP_ERROR_BACKOFF_MAX)
+        return delay
+
+    def _reconcile_positions(self):
+        """Reconcile tracked positions with the broker and drop phantom-closed candidates"""
+        phantom_closed = self.position_tracker.reconcile_with_broker()
+        for sym in phantom_closed or ():
+            self.continuous_filter.remove_swing_candidate(sym)
+            logger.info(f"[PHANTOM-CLEANUP] {sym} removed from filter after SL hit")
+
+    async def _position_reconcile(self):
+        """
+        Periodic broker position reconciliation, runs as a task alongside run_trading_loop()
+
+        Runs on the event loop thread between ticks (like _watchdog()), so the
+        positionbook call never lands in the middle of process_tick().
+        """
+        while not self.shutdown_requested:
+            if self.is_market_open():
+                try:
+                    self._reconcile_positions()
+                except Exception as e:
+                    logger.error(f"[RECONCILE] Error during position reconciliation: {e!r}")
+            await asyncio.sleep(POSITION_RECONCILE_INTERVAL)
 
     async def run_trading_loop(self):
         """Main trading loop - runs continuously during market hours (async version)"""
         logger.info("Entering main trading loop (async)...")
+
+        # Keep a reference so the task isn't garbage-collected mid-run
+        self._dashboard_backfill_task = None
+        if ENABLE_DASHBOARD_BACKFILL:
+            self._dashboard_backfill_task = asyncio.create_task(self._backfill_dashboard_bars())
         
+        self._loop = asyncio.get_running_loop()
+        self._shutdown_wakeup = asyncio.Event()
+
+        # Data-freshness watchdog runs on its own 30s cadence, independent of tick processing
+        watchdog_task = asyncio.create_task(self._watchdog())
+        # Broker position reconcile on its own cadence, out of the tick path
+        reconcile_task = asyncio.create_task(self._position_reconcile())
+
         tick_count = 0
-        last_heartbeat = time.time()
-        last_watchdog_check = time.time()
+        last_heartbeat = time.monotonic()
         
         while not self.shutdown_requested:
             try:
                 tick_count += 1
+                # One clock read per iteration for the heartbeat interval check
+                now_ts = time.monotonic()
 
                 # [CRITICAL] DB FLAGS -> FILE SYNC (dashboard writes DB, we sync to files)
                 try:
@@ -718,7 +1013,8 @@ class BaselineV1Live:
                 if os.path.exists(KILL_SWITCH_FILE):
                     logger.critical("[KILL-SWITCH] KILL_SWITCH file detected -- initiating emergency shutdown")
                     self.telegram.send_message(
-                        "[CRITICAL] [KILL-SWITCH] Emergency shutdown triggered via kill switch file"
+                        "[CRITICAL] [KILL-SWITCH] Emergency shutdown triggered via kill switch file",
+                        flush_now=True,
                     )
                     self._emergency_kill_shutdown()
                     break
@@ -741,176 +1037,39 @@ class BaselineV1Live:
                         logger.info("[RESUME] PAUSE_SWITCH file removed -- resuming order placement")
                         self.telegram.send_message("[RESUME] Strategy resumed. Order placement re-enabled.")
 
-                # [CRITICAL] WATCHDOG: Check data freshness every 30 seconds
-                if time.time() - last_watchdog_check > 30:
-
-                    is_fresh, stale_reason = self.data_pipeline.check_data_freshness()
-
-                    if not is_fresh:
-                        health = self.data_pipeline.get_health_status()
-
-                        logger.warning(
-                            f"[WATCHDOG] TRIGGERED: {stale_reason} - "
-                            f"Data is not fresh, attempting reconnection..."
-                        )
-
-                        # Send Telegram alert about reconnection attempt
-                        self.telegram.send_message(
-                            f"[WARNING] [WATCHDOG ALERT] STALE DATA\n\n"
-                            f"Reason: {stale_reason}\n"
-                            f"Data coverage: {health['data_coverage']:.1%}\n"
-                            f"Fresh symbols: {health['symbols_with_data']}/{health['subscribed_symbols']}\n"
-                            f"Stale symbols: {health['stale_symbols']}\n\n"
-                            f"Attempting automatic reconnection..."
-                        )
-
-                        # Attempt automatic reconnection
-                        # If pipeline already reconnecting (self-healed), skip and let it finish
-                        if self.data_pipeline.is_reconnecting:
-                            logger.info(
-                                "[WATCHDOG] Pipeline reconnection already in progress - "
-                                "skipping watchdog reconnect, resetting timer"
-                            )
-                            last_watchdog_check = time.time()
-                            continue
-
-                        logger.warning("[WATCHDOG] Attempting to reconnect WebSocket...")
-                        reconnect_success = self.data_pipeline.reconnect()
-
-                        if reconnect_success:
-                            logger.info("[WATCHDOG] Reconnection successful, reconciling orders...")
-
-                            # CRITICAL: Reconcile orders with broker after reconnection
-                            # This ensures local state matches broker reality
-                            try:
-                                # Get current open positions for reconciliation
-                                # open_positions is a dict: {symbol: Position object}
-                                open_positions = self.position_tracker.open_positions
-
-                                # Reconcile orders
-                                reconcile_results = self.order_manager.reconcile_orders_with_broker(
-                                    open_positions
-                                )
-
-                                # Handle filled orders discovered during reconnection
-                                if reconcile_results['limit_orders_filled']:
-                                    logger.warning(
-                                        f"[WATCHDOG] Found {len(reconcile_results['limit_orders_filled'])} "
-                                        f"orders filled during disconnect"
-                                    )
-
-                                    # Get current prices
-                                    latest_bars = self.data_pipeline.get_all_latest_bars()
-                                    current_prices = {symbol: bar.close for symbol, bar in latest_bars.items()}
-
-                                    # Process each fill
-                                    for fill_info in reconcile_results['limit_orders_filled']:
-                                        logger.warning(
-                                            f"[WATCHDOG] Processing fill from reconnect: "
-                                            f"{fill_info['symbol']} @ {fill_info['fill_price']:.2f}"
-                                        )
-                                        self.handle_order_fill(fill_info, current_prices)
-
-                                # Handle missing SL orders (CRITICAL!)
-                                if reconcile_results['sl_orders_missing']:
-                                    missing_symbols = ', '.join(reconcile_results['sl_orders_missing'])
-                                    logger.critical(
-                                        f"[CRITICAL] MISSING SL ORDERS - "
-                                        f"Positions without SL: {missing_symbols} - "
-                                        f"MANUAL BROKER CHECK REQUIRED"
-                                    )
-                                    self.telegram.send_message(
-                                        f"[CRITICAL] MISSING SL ORDERS\n\n"
-                                        f"Positions without SL protection:\n"
-                                        f"{missing_symbols}\n\n"
-                                        f"MANUAL BROKER CHECK REQUIRED!"
-                                    )
-
-                                    # Consider triggering emergency shutdown if missing SLs
-                                    logger.critical(
-                                        "[WATCHDOG] Positions without SL detected - "
-                                        "initiating emergency shutdown for safety"
-                                    )
-
-                                    self.telegram.send_message(
-                                        f"[FAILED] [EMERGENCY] Shutting down due to missing SL orders\n"
-                                        f"Check broker manually for positions:\n"
-                                        f"{', '.join(reconcile_results['sl_orders_missing'])}"
-                                    )
-
-                                    self.handle_emergency_shutdown()
-                                    raise SystemExit("Missing SL orders after reconnect")
-
-                                logger.info("[WATCHDOG] Order reconciliation complete")
-
-                            except SystemExit:
-                                raise  # Re-raise SystemExit
-                            except Exception as e:
-                                logger.error(f"[WATCHDOG] Error during order reconciliation: {e}", exc_info=True)
-
-                                # Send error notification but continue
-                                self.telegram.send_message(
-                                    f"[WARNING] Order reconciliation failed\n\n"
-                                    f"Error: {str(e)}\n\n"
-                                    f"Check positions manually at broker!"
-                                )
-
-                            # Send success notification
-                            self.telegram.send_message(
-                                f"[OK] [WATCHDOG] RECONNECTION SUCCESSFUL\n\n"
-                                f"WebSocket reconnected and operational.\n"
-                                f"Orders reconciled with broker.\n"
-                                f"Trading system continuing normally."
-                            )
-
-                            # Reset watchdog timer and continue
-                            last_watchdog_check = time.time()
-                            continue
-                        else:
-                            # Reconnection failed - trigger emergency shutdown
-                            logger.critical(
-                                f"[WATCHDOG] Reconnection failed after multiple attempts - "
-                                f"initiating emergency shutdown"
-                            )
-
-                            # Send critical Telegram alert
-                            self.telegram.send_message(
-                                f"[FAILED] [WATCHDOG CRITICAL] RECONNECTION FAILED\n\n"
-                                f"Reason: {stale_reason}\n"
-                                f"Reconnection attempts: All failed\n\n"
-                                f"Emergency shutdown initiated...\n"
-                                f"All positions will be closed at market."
-                            )
-
-                            self.handle_emergency_shutdown()
-                            raise SystemExit(f"Watchdog triggered: {stale_reason} - reconnection failed")
-
-                    last_watchdog_check = time.time()
                 
                 # Check force exit time BEFORE market open check — both share 15:15, and
                 # is_market_open() returns False at 15:15 (condition: now < 15:15), so this
                 # must come first or the EOD exit and daily summary never fire.
-                if self.is_force_exit_time():
+                # One wall-clock read serves both session checks.
+                now = datetime.now(IST)
+                if self.is_force_exit_time(now):
                     if not self._eod_exit_done:
                         logger.warning("Force exit time (3:15 PM) reached - initiating EOD exit")
                         self._eod_exit_done = True
                         self.handle_eod_exit()
                         logger.info("EOD exit complete - system will monitor until market close")
-                    # Continue running (monitor mode) until market closes at 3:30 PM
-                    await asyncio.sleep(60)
+                        now = datetime.now(IST)
+                    # Continue running (monitor mode): wake at market close (3:30 PM),
+                    # then at next market open, instead of polling every minute
+                    if now.time() < MARKET_CLOSE_TIME:
+                        await self._idle_sleep(self._seconds_until(MARKET_CLOSE_TIME, now))
+                    else:
+                        await self._idle_sleep(self._seconds_until(MARKET_START_TIME, now))
                     continue
 
                 # Check if market is open
-                if not self.is_market_open():
+                if not self.is_market_open(now):
                     logger.debug("Market closed, waiting...")
-                    await asyncio.sleep(60)
+                    await self._idle_sleep(self._seconds_until(MARKET_START_TIME, now))
                     continue
 
                 # Main logic (swing detection continues until market close)
                 self.process_tick()
+                self._err_backoff = MAIN_LOOP_ERROR_BACKOFF_BASE
                 
                 # Heartbeat every 60 seconds
-                if time.time() - last_heartbeat > 60:
+                if now_ts - last_heartbeat > 60:
                     health = self.data_pipeline.get_health_status()
                     logger.info(
                         f"[HEARTBEAT] Positions: {len(self.position_tracker.open_positions)} | "
@@ -919,10 +1078,10 @@ class BaselineV1Live:
                         f"Stale: {health['stale_symbols']}"
                     )
 
-                    last_heartbeat = time.time()
+                    last_heartbeat = now_ts
                 
                 # Sleep until next check
-                logger.debug(f"Sleeping {ORDER_FILL_CHECK_INTERVAL} seconds...")
+                logger.debug("Sleeping %s seconds...", ORDER_FILL_CHECK_INTERVAL)
                 await asyncio.sleep(ORDER_FILL_CHECK_INTERVAL)
                 
             except KeyboardInterrupt:
@@ -939,8 +1098,10 @@ class BaselineV1Live:
                 if "Connection" in str(e) or "WebSocket" in str(e):
                     self.enter_waiting_mode('CONNECTION_LOST', str(e))
                 else:
-                    await asyncio.sleep(10)
+                    await asyncio.sleep(self._next_error_backoff())
 
+        watchdog_task.cancel()
+        reconcile_task.cancel()
         self.handle_graceful_shutdown()
     
     def _on_swing_detected(self, symbol: str, swing_info: Dict):
@@ -997,7 +1158,7 @@ class BaselineV1Live:
             latest_bars,
             self.swing_detector,
             current_bars,  # Include current bars for accurate highest_high tracking
-            open_position_symbols=set(self.position_tracker.open_positions.keys())
+            open_position_symbols=self.position_tracker.open_positions.keys()  # live view, no copy
         )
         
         # Filter out stale-blocked and churn-blocked symbols from best strikes
@@ -1020,74 +1181,105 @@ class BaselineV1Live:
                 f"Best: CE={summary['best_ce']}, PE={summary['best_pe']}"
             )
         
-        # Persist swing candidates to DB for dashboard (even if 0 candidates to clear table)
-        try:
-            self.state_manager.save_swing_candidates(self.continuous_filter.swing_candidates)
-        except Exception as e:
-            logger.warning(f"Failed to save swing candidates: {e}")
-        
         # Check for best strike changes and send telegram notifications (only when changed)
         best_ce = best_strikes.get('CE')
         best_pe = best_strikes.get('PE')
+        current_syms = {
+            'CE': best_ce['symbol'] if best_ce else None,
+            'PE': best_pe['symbol'] if best_pe else None,
+        }
 
-        for option_type in ['CE', 'PE']:
-            current_best = best_strikes.get(option_type)
-            previous_best = self.previous_best_strikes[option_type]
+        # Stable strikes are the common case - only walk the branches on a change
+        if current_syms != self.previous_best_strikes:
+            for option_type in ['CE', 'PE']:
+                current_best = best_strikes.get(option_type)
+                previous_best = self.previous_best_strikes[option_type]
 
-            # Check if best strike changed
-            if current_best:
-                current_symbol = current_best['symbol']
+                # Check if best strike changed
+                if current_best:
+                    current_symbol = current_best['symbol']
 
-                if previous_best is None:
-                    # First time a best strike is selected
-                    logger.info(f"[TELEGRAM] First best {option_type} selected: {current_symbol}")
-                    try:
-                        self.telegram.notify_best_strike_change(option_type, current_best, is_new=True)
-                    except Exception as e:
-                        logger.error(f"Failed to send telegram notification: {e}")
-                    self.previous_best_strikes[option_type] = current_symbol
+                    if previous_best is None:
+                        # First time a best strike is selected
+                        logger.info(f"[TELEGRAM] First best {option_type} selected: {current_symbol}")
+                        try:
+                            self.telegram.notify_best_strike_change(option_type, current_best, is_new=True)
+                        except Exception as e:
+                            logger.error(f"Failed to send telegram notification: {e}")
+                        self.previous_best_strikes[option_type] = current_symbol
+
+                    elif previous_best != current_symbol:
+                        # Best strike changed to a different symbol
+                        logger.info(f"[TELEGRAM] Best {option_type} changed: {previous_best} -> {current_symbol}")
+                        try:
+                            self.telegram.notify_best_strike_change(option_type, current_best, is_new=False, previous_symbol=previous_best)
+                        except Exception as e:
+                            logger.error(f"Failed to send telegram notification: {e}")
+                        self.previous_best_strikes[option_type] = current_symbol
 
-                elif previous_best != current_symbol:
-                    # Best strike changed to a different symbol
-                    logger.info(f"[TELEGRAM] Best {option_type} changed: {previous_best} -> {current_symbol}")
+                    # else: Same symbol still best - no notification
+
+                elif previous_best is not None:
+                    # Best strike went from something to None (candidate disqualified)
+                    logger.info(f"[TELEGRAM] Best {option_type} cleared: {previous_best} no longer qualifies")
+                    self.previous_best_strikes[option_type] = None
+
+        # Persist dashboard state in ONE transaction (one commit/WAL sync per tick).
+        # Each write keeps its own try so one failure doesn't drop the others.
+        saved_bar_ts = {}
+        candidates_version = self.continuous_filter.candidates_version
+        saved_candidates_version = self._saved_candidates_version
+        try:
+            with self.state_manager.tick_batch():
+                # Swing candidates (even if 0 candidates, to clear the table).
+                # The pool only changes on swing add/remove, i.e. on bar close - skip otherwise.
+                if candidates_version != saved_candidates_version:
                     try:
-                        self.telegram.notify_best_strike_change(option_type, current_best, is_new=False, previous_symbol=previous_best)
+                        self.state_manager.save_swing_candidates(self.continuous_filter.swing_candidates)
+                        saved_candidates_version = candidates_version
                     except Exception as e:
-                        logger.error(f"Failed to send telegram notification: {e}")
-                    self.previous_best_strikes[option_type] = current_symbol
+                        logger.warning(f"Failed to save swing candidates: {e}")
 
-                # else: Same symbol still best - no notification
+                # CRITICAL: Always call save_best_strikes(), even when both are None
+                # This ensures stale records get cleared when swings are replaced by unqualified ones
+                try:
+                    self.state_manager.save_best_strikes(best_ce, best_pe)
+                except Exception as e:
+                    logger.warning(f"Failed to save best strikes: {e}")
 
-            elif previous_best is not None:
-                # Best strike went from something to None (candidate disqualified)
-                logger.info(f"[TELEGRAM] Best {option_type} cleared: {previous_best} no longer qualifies")
-                self.previous_best_strikes[option_type] = None
+                # Latest bars - only symbols whose completed bar changed since the last save
+                try:
+                    bars_for_db = {}
+                    last_saved = self._last_saved_bar_ts
+                    for symbol, bar in latest_bars.items():
+                        if last_saved.get(symbol) == bar.timestamp:
+                            continue
+                        saved_bar_ts[symbol] = bar.timestamp
+                        bars_for_db[symbol] = {
+                            'timestamp': bar.timestamp_iso,
+                            'open': bar.open,
+                            'high': bar.high,
+                            'low': bar.low,
+                            'close': bar.close,
+                            'vwap': bar.vwap,
+                            'volume': bar.volume
+                        }
+                    if bars_for_db:
+                        self.state_manager.save_latest_bars(bars_for_db)
+                except Exception as e:
+                    saved_bar_ts = {}
+                    logger.warning(f"Failed to save latest bars: {e}")
 
-        # Persist best strikes to DB for dashboard
-        # CRITICAL: Always call save_best_strikes(), even when both are None
-        # This ensures stale records get cleared when swings are replaced by unqualified ones
-        try:
-            self.state_manager.save_best_strikes(best_ce, best_pe)
-        except Exception as e:
-            logger.warning(f"Failed to save best strikes: {e}")
-        
-        # Persist latest bars to DB for dashboard
-        try:
-            bars_for_db = {}
-            for symbol, bar in latest_bars.items():
-                bars_for_db[symbol] = {
-                    'timestamp': bar.timestamp.isoformat(),
-                    'open': bar.open,
-                    'high': bar.high,
-                    'low': bar.low,
-                    'close': bar.close,
-                    'vwap': bar.vwap,
-                    'volume': bar.volume
-                }
-            if bars_for_db:
-                self.state_manager.save_latest_bars(bars_for_db)
+                # Swing detections queued by update_all() above
+                try:
+                    self.state_manager.flush_swing_log()
+                except Exception as e:
+                    logger.warning(f"Failed to flush swing log: {e}")
+            # Only reached once the batch committed
+            self._last_saved_bar_ts.update(saved_bar_ts)
+            self._saved_candidates_version = saved_candidates_version
         except Exception as e:
-            logger.warning(f"Failed to save latest bars: {e}")
+            logger.warning(f"Failed to commit dashboard writes: {e}")
         
         # 4. Skip order placement when paused (keep data pipeline + swing detection running)
         if self._is_paused:
@@ -1095,7 +1287,7 @@ class BaselineV1Live:
             # Still process fills, positions, and state saving below
             # Jump directly to step 6
             fills = self.order_manager.check_fills_by_type()
-            current_prices = {symbol: bar.close for symbol, bar in latest_bars.items()}
+            current_prices = _PriceView(latest_bars)
             for opt_type in ['CE', 'PE']:
                 if fills[opt_type]:
                     self.handle_order_fill(fills[opt_type], current_prices)
@@ -1104,13 +1296,6 @@ class BaselineV1Live:
             exit_reason = self.position_tracker.check_daily_exit()
             if exit_reason and not was_already_triggered:
                 self.handle_daily_exit(exit_reason, current_prices)
-            if self.last_bar_update is None or \
-               (datetime.now(IST) - self.last_bar_update).total_seconds() > 60:
-                phantom_closed = self.position_tracker.reconcile_with_broker()
-                if phantom_closed:
-                    for sym in phantom_closed:
-                        self.continuous_filter.remove_swing_candidate(sym)
-                self.last_bar_update = datetime.now(IST)
             self.save_state()
             return
 
@@ -1119,10 +1304,34 @@ class BaselineV1Live:
         pending_orders = self.order_manager.get_pending_orders_by_type()
         triggers = self.continuous_filter.get_order_triggers(latest_bars, current_bars, pending_orders)
 
-        # Log pending orders and trigger decisions for debugging
-        logger.info(f"[PENDING-ORDERS] {self.order_manager.debug_pending_orders()}")
-        logger.info(f"[TRIGGER-CE] Action={triggers['CE']['action']}, Reason={triggers['CE'].get('reason', 'N/A')}")
-        logger.info(f"[TRIGGER-PE] Action={triggers['PE']['action']}, Reason={triggers['PE'].get('reason', 'N/A')}")
+        # Log pending orders and trigger decisions for debugging (per tick - DEBUG only)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[PENDING-ORDERS] %s", self.order_manager.debug_pending_orders())
+            for option_type in ['CE', 'PE']:
+                logger.debug("[TRIGGER-%s] Action=%s, Reason=%s", option_type,
+                             triggers[option_type]['action'], triggers[option_type].get('reason', 'N/A'))
+
+        # Log CE/PE order triggers to DB for dashboard (one transaction for both)
+        try:
+            with self.state_manager.tick_batch():
+                for option_type in ['CE', 'PE']:
+                    trigger = triggers[option_type]
+                    action = trigger['action']
+                    if action not in ['place', 'wait', 'modify', 'cancel']:
+                        continue
+                    candidate = trigger.get('candidate')
+                    try:
+                        symbol = candidate['symbol'] if candidate else 'N/A'
+                        current_price = candidate.get('entry_price', 0) if candidate else 0
+                        swing_low = candidate.get('swing_low', 0) if candidate else 0
+                        reason = trigger.get('reason', '')
+                        self.state_manager.log_order_trigger(
+                            option_type, action, symbol, current_price, swing_low, reason
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to log order trigger: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to log order triggers: {e}")
 
         # 5. Manage limit orders for CE and PE
         for option_type in ['CE', 'PE']:
@@ -1130,19 +1339,6 @@ class BaselineV1Live:
             action = trigger['action']
             candidate = trigger.get('candidate')
             
-            # Log order trigger to DB for dashboard
-            try:
-                if action in ['place', 'wait', 'modify', 'cancel']:
-                    symbol = candidate['symbol'] if candidate else 'N/A'
-                    current_price = candidate.get('entry_price', 0) if candidate else 0
-                    swing_low = candidate.get('swing_low', 0) if candidate else 0
-                    reason = trigger.get('reason', '')
-                    self.state_manager.log_order_trigger(
-                        option_type, action, symbol, current_price, swing_low, reason
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to log order trigger: {e}")
-            
             if action == 'place':
                 # Price within 1 Rs of swing - place/update order
                 limit_price = trigger['limit_price']
@@ -1201,7 +1397,8 @@ class BaselineV1Live:
                             f"[CRITICAL] [CIRCUIT-BREAKER] Strategy auto-paused\n"
                             f"Too many cancel/place cycles across all symbols.\n"
                             f"Blocked symbols: {self.order_manager.churn_detector.blocked_symbols}\n"
-                            f"Manual intervention required: remove PAUSE_SWITCH file or send /resume"
+                            f"Manual intervention required: remove PAUSE_SWITCH file or send /resume",
+                            flush_now=True,
                         )
                         self._is_paused = True
                         # Create PAUSE_SWITCH file for persistent pause
@@ -1227,11 +1424,11 @@ class BaselineV1Live:
                         f"(no qualified candidate)"
                     )
                     self._pending_switch[option_type] = None
-                logger.debug(f"[ORDER-{option_type}] Cancelled: {trigger.get('reason')}")
+                logger.debug("[ORDER-%s] Cancelled: %s", option_type, trigger.get('reason'))
             
             elif action == 'check_fill':
                 # Price broke - order should have filled
-                logger.debug(f"[ORDER-{option_type}] Price broke: {trigger.get('reason')}")
+                logger.debug("[ORDER-%s] Price broke: %s", option_type, trigger.get('reason'))
 
             elif action == 'wait':
                 # Same symbol stays best — clear any stale pending switch.
@@ -1249,8 +1446,9 @@ class BaselineV1Live:
         # 5.5 Stale-symbol detection: if a pending order's symbol has stopped
         # producing bars (e.g., OpenAlgo LTP downgrade killed the feed),
         # attempt re-subscription and eventually cancel the order.
+        # One wall-clock read per tick: bar timestamps are IST datetimes
         now = datetime.now(IST)
-        if now.time() >= MARKET_START_TIME and now.time() <= MARKET_END_TIME:
+        if MARKET_START_TIME <= now.time() <= MARKET_END_TIME:
             for option_type in ['CE', 'PE']:
                 pending = self.order_manager.pending_limit_orders.get(option_type)
                 if not pending:
@@ -1270,9 +1468,9 @@ class BaselineV1Live:
                         # Add to stale-blocked set to prevent re-selection
                         self._stale_blocked_symbols.add(symbol)
                         # Throttle Telegram: send first alert, then suppress for 5 min
-                        last_alert = self._last_stale_telegram.get(symbol, 0)
-                        now_ts = time.time()
-                        if now_ts - last_alert > 300:  # 5-minute cooldown
+                        last_alert = self._last_stale_telegram.get(symbol)
+                        now_ts = time.monotonic()
+                        if last_alert is None or now_ts - last_alert > 300:  # 5-minute cooldown
                             suppressed = self._stale_suppress_count.get(symbol, 0)
                             suffix = f" ({suppressed} alerts suppressed)" if suppressed > 0 else ""
                             try:
@@ -1305,7 +1503,7 @@ class BaselineV1Live:
         # 6. Check for order fills
         fills = self.order_manager.check_fills_by_type()
 
-        current_prices = {symbol: bar.close for symbol, bar in latest_bars.items()}
+        current_prices = _PriceView(latest_bars)
 
         for option_type in ['CE', 'PE']:
             if fills[option_type]:
@@ -1330,16 +1528,8 @@ class BaselineV1Live:
         if exit_reason and not was_already_triggered:
             self.handle_daily_exit(exit_reason, current_prices)
         
-        # 7. Reconcile positions with broker (every 60 seconds)
-        if self.last_bar_update is None or \
-           (datetime.now(IST) - self.last_bar_update).total_seconds() > 60:
-            phantom_closed = self.position_tracker.reconcile_with_broker()
-            if phantom_closed:
-                for sym in phantom_closed:
-                    self.continuous_filter.remove_swing_candidate(sym)
-                    logger.info(f"[PHANTOM-CLEANUP] {sym} removed from filter after SL hit")
-            self.last_bar_update = datetime.now(IST)
-        
+        # 7. Broker position reconciliation runs in _position_reconcile() (own task)
+
         # 8. Save state
         self.save_state()
     
@@ -1357,16 +1547,13 @@ class BaselineV1Live:
             if not swing_time:
                 return candidate_info['sl_price']
 
-            # Find highest high from all bars at/after swing time
-            highest_high = 0.0
-            found_swing = False
-            for bar in detector.bars:
-                if bar['timestamp'] >= swing_time:
-                    found_swing = True
-                    highest_high = max(highest_high, bar.get('high', 0.0))
-
-            if not found_swing:
+            # Find highest high from all bars at/after swing time.
+            # Bars are chronological, so bisect to the first one and scan only the tail.
+            bars = detector.bars
+            start = bisect_left(bars, swing_time, key=itemgetter('timestamp'))
+            if start == len(bars):
                 return candidate_info['sl_price']
+            highest_high = max(0.0, max(bar.get('high', 0.0) for bar in bars[start:]))
 
             # Include current incomplete bar
             current_bars = self.data_pipeline.get_all_current_bars()
@@ -1460,7 +1647,7 @@ class BaselineV1Live:
         option_type = fill['option_type']
 
         # Dedup guard: prevent processing the same fill multiple times
-        fill_key = f"{symbol}_{fill.get('order_id', '')}_{fill_price}"
+        fill_key = (symbol, fill.get('order_id', ''), fill_price)
         if fill_key in self._processed_fill_ids:
             logger.warning(f"[FILL-DEDUP] {symbol} fill already processed (key={fill_key}), skipping")
             return
@@ -1507,7 +1694,8 @@ class BaselineV1Live:
                 f"Entry: Rs{fill_price:.2f}\n"
                 f"Qty: {quantity}\n"
                 f"Expected SL: Rs{live_sl_price:.2f}\n\n"
-                f"[WARNING] Initiating emergency MARKET exit..."
+                f"[WARNING] Initiating emergency MARKET exit...",
+                flush_now=True,
             )
             
             # Attempt emergency market exit
@@ -1605,7 +1793,8 @@ class BaselineV1Live:
             # Send critical alert
             self.telegram.send_message(
                 f"[CRITICAL] Daily exit FAILED: {e}\n"
-                f"MANUAL BROKER CHECK REQUIRED"
+                f"MANUAL BROKER CHECK REQUIRED",
+                flush_now=True,
             )
     
     def handle_eod_exit(self):
@@ -1614,7 +1803,7 @@ class BaselineV1Live:
 
         # Get current prices
         latest_bars = self.data_pipeline.get_all_latest_bars()
-        current_prices = {symbol: bar.close for symbol, bar in latest_bars.items()}
+        current_prices = _PriceView(latest_bars)
 
         # Cancel all orders
         self.order_manager.cancel_all_orders()
@@ -1639,35 +1828,67 @@ class BaselineV1Live:
         logger.info(f"EOD Summary: {summary}")
     
     def save_state(self):
-        """Save current state to database"""
+        """Save current state to database (one transaction: all-or-nothing snapshot)"""
         # Get all positions
         positions = self.position_tracker.get_all_positions()
-        self.state_manager.save_positions(positions)
-        
-        # Save orders
-        self.state_manager.save_orders(
-            self.order_manager.pending_limit_orders,
-            self.order_manager.active_sl_orders
-        )
-        
-        # Save daily state
         summary = self.position_tracker.get_position_summary()
         summary['expiry'] = self.expiry_date  # Add expiry for dashboard
-        self.state_manager.save_daily_state(summary)
-        
-        # Log completed trades
-        for pos in positions:
-            if pos['is_closed']:
-                self.state_manager.log_trade(pos)
+
+        with self.state_manager.tick_batch():
+            self.state_manager.save_positions(positions)
+            
+            # Save orders
+            self.state_manager.save_orders(
+                self.order_manager.pending_limit_orders,
+                self.order_manager.active_sl_orders
+            )
+            
+            # Save daily state
+            self.state_manager.save_daily_state(summary)
+            
+            # Log completed trades (each once per run; log_trade() also dedups in the DB)
+            new_trades = []
+            for pos in positions:
+                if not pos['is_closed']:
+                    continue
+                trade_key = (pos['symbol'], pos['exit_time'])
+                if trade_key not in self._logged_trades:
+                    self.state_manager.log_trade(pos)
+                    new_trades.append(trade_key)
+
+        # Only after the batch committed
+        self._logged_trades.update(new_trades)
     
-    def is_market_open(self) -> bool:
-        """Check if market is currently open"""
-        now = datetime.now(IST).time()
+    @staticmethod
+    def _seconds_until(target: dt_time, now: datetime) -> float:
+        """Seconds from now until the next occurrence of target (today or tomorrow)"""
+        target_dt = now.replace(
+            hour=target.hour, minute=target.minute, second=target.second, microsecond=0
+        )
+        if target_dt <= now:
+            target_dt += timedelta(days=1)
+        return (target_dt - now).total_seconds()
+
+    async def _idle_sleep(self, seconds: float):
+        """
+        Sleep outside market hours, capped at MARKET_CLOSED_MAX_SLEEP
+
+        Returns early when request_shutdown() is called.
+        """
+        timeout = min(max(seconds, 1), MARKET_CLOSED_MAX_SLEEP)
+        try:
+            await asyncio.wait_for(self._shutdown_wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def is_market_open(self, now: Optional[datetime] = None) -> bool:
+        """Check if market is currently open (or at `now`, if the caller already read the clock)"""
+        now = (now or datetime.now(IST)).time()
         return MARKET_START_TIME <= now < MARKET_END_TIME
     
-    def is_force_exit_time(self) -> bool:
-        """Check if it's force exit time"""
-        now = datetime.now(IST).time()
+    def is_force_exit_time(self, now: Optional[datetime] = None) -> bool:
+        """Check if it's force exit time (or at `now`, if the caller already read the clock)"""
+        now = (now or datetime.now(IST)).time()
         return now >= FORCE_EXIT_TIME
     
     def handle_graceful_shutdown(self):
@@ -1693,6 +1914,10 @@ class BaselineV1Live:
             if self.data_pipeline:
                 logger.info("Disconnecting data pipeline...")
                 self.data_pipeline.disconnect()
+
+            # 4. Deliver queued Telegram alerts (sender thread is a daemon)
+            if self.telegram:
+                self.telegram.flush(timeout=2.0)
                 
             elapsed = time.time() - start_time
             logger.info(f"Shutdown complete in {elapsed:.2f}s")
@@ -1721,7 +1946,8 @@ class BaselineV1Live:
                 "[CRITICAL] [KILL-SWITCH] Strategy stopped.\n"
                 "All pending entry orders cancelled.\n"
                 "Existing positions retained (SL orders active at broker).\n"
-                "Delete KILL_SWITCH file and restart to resume."
+                "Delete KILL_SWITCH file and restart to resume.",
+                flush_now=True,
             )
         except Exception as e:
             logger.error(f"[KILL-SWITCH] Error during kill shutdown: {e}")
@@ -1744,20 +1970,32 @@ class BaselineV1Live:
             
             # 2. Close ALL open positions at market
             logger.warning("Force-closing all open positions...")
-            all_positions = self.position_tracker.get_all_positions()
-            open_positions = [pos for pos in all_positions if not pos['is_closed']]
-            
+            open_positions = self.position_tracker.get_open_positions()
+
+            # Each exit is a blocking broker call with retries - send them all at once,
+            # then apply results here so position_tracker is only touched on this thread
+            exits = {}
+            if open_positions:
+                executor = ThreadPoolExecutor(
+                    max_workers=len(open_positions), thread_name_prefix='emergency-exit'
+                )
+                for position in open_positions:
+                    logger.warning(f"Emergency exit: {position['symbol']} qty={position['quantity']}")
+                    exits[position['symbol']] = executor.submit(
+                        self.order_manager.emergency_market_exit,
+                        symbol=position['symbol'],
+                        quantity=position['quantity'],
+                        reason="EMERGENCY_SHUTDOWN"
+                    )
+                executor.shutdown(wait=False)
+
             for position in open_positions:
                 symbol = position['symbol']
-                quantity = position['quantity']
-                
-                logger.warning(f"Emergency exit: {symbol} qty={quantity}")
-                
-                emergency_order_id = self.order_manager.emergency_market_exit(
-                    symbol=symbol,
-                    quantity=quantity,
-                    reason="EMERGENCY_SHUTDOWN"
-                )
+                try:
+                    emergency_order_id = exits[symbol].result()
+                except Exception as e:
+                    logger.critical(f"[EMERGENCY] Exit for {symbol} raised: {e}")
+                    emergency_order_id = None
                 
                 if emergency_order_id:
                     # Mark position as closed (will be filled at market)
@@ -1783,7 +2021,8 @@ class BaselineV1Live:
                 f"Reason: Repeated SL placement failures\n"
                 f"Cumulative R: {summary['cumulative_R']:.2f}R\n"
                 f"Closed positions: {summary['total_positions']}\n\n"
-                f"[WARNING] Check broker positions manually!"
+                f"[WARNING] Check broker positions manually!",
+                flush_now=True,
             )
             
             logger.critical("Emergency shutdown complete - check broker positions manually")
@@ -1804,7 +2043,7 @@ def signal_handler(signum, frame):
     global strategy_instance
     print(f"\n[SHUTDOWN] Signal {signum} received. Requesting shutdown...")
     if strategy_instance:
-        strategy_instance.shutdown_requested = True
+        strategy_instance.request_shutdown()
     else:
         sys.exit(0)
 
@@ -1907,8 +2146,10 @@ def main():
             logger.info(f"[AUTO] Subscribing to NIFTY spot: {spot_symbol}")
             temp_pipeline.subscribe_options([], spot_symbol=spot_symbol)
 
-            # Give WebSocket time to receive first tick
-            time.sleep(3)
+            # Wait for the first spot tick (spot is the only subscription, so
+            # live_data_ready is set by it) instead of a fixed 3s sleep
+            if not temp_pipeline.wait_for_live_data(timeout=3):
+                logger.warning("[AUTO] No spot tick within 3s, AutoDetector will fall back to API if needed")
         except Exception as e:
             logger.warning(f"[AUTO] WebSocket connection failed: {e}")
             logger.info("[AUTO] Will use API fallback for spot price")
@@ -1919,7 +2160,7 @@ def main():
 
         # Wait until 9:16 AM IST for first candle to close
         # (Market opens at 9:15, first candle closes at 9:16)
-        now = datetime.now(pytz.timezone('Asia/Kolkata'))
+        now = datetime.now(IST)
         market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
         auto_detect_time = market_open + timedelta(minutes=1)  # 9:16 AM
 
@@ -1981,7 +2222,15 @@ def main():
             spot_symbol=spot_symbol,
             telegram_notifier=telegram_notifier
         )
-        atm_strike, expiry_date = detector.auto_detect()
+        try:
+            atm_strike, expiry_date = detector.auto_detect()
+        except Exception:
+            # Make sure the give-up alert leaves before the process exits
+            if telegram_notifier:
+                telegram_notifier.flush()
+            raise
+        finally:
+            detector.close()
 
         # Clean up if WebSocket was used
         if temp_pipeline:
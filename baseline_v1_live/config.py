@@ -89,6 +89,7 @@ SL_LIMIT_PRICE_OFFSET = 3    # Limit 3 Rs above SL trigger
 # Order Monitoring
 ORDER_FILL_CHECK_INTERVAL = 5  # Check for fills every 5 seconds (reduced from 10s to minimize unprotected position window)
 ORDERBOOK_POLL_INTERVAL = 5     # Poll orderbook every 5 seconds
+POSITION_RECONCILE_INTERVAL = 60  # Reconcile positions with broker every 60 seconds
 
 # Limit Order Timeout
 LIMIT_ORDER_TIMEOUT = 300  # Cancel unfilled limit orders after 5 minutes
@@ -110,6 +111,7 @@ MARKET_START_TIME = time(9, 15)   # 9:15 AM
 MARKET_END_TIME = time(15, 15)    # 3:15 PM (stop entering new trades)
 FORCE_EXIT_TIME = time(15, 15)    # Force exit all positions at 3:15 PM
 MARKET_CLOSE_TIME = time(15, 30)  # 3:30 PM (actual NSE close - WebSocket stops after this)
+MARKET_CLOSED_MAX_SLEEP = 900    # Max seconds per idle sleep outside market hours (loop wakes at open/close)
 
 # ============================================================================
 # AUTO-DETECTION TIMING
@@ -153,6 +155,9 @@ STALE_DATA_TIMEOUT = 30  # Shutdown if no fresh data for 30 seconds
 MAX_BAR_AGE_SECONDS = 120  # Shutdown if last bar >2 minutes old
 STALE_SYMBOL_THRESHOLD = 120  # Seconds before soft re-subscribe for stale symbol
 STALE_SYMBOL_HARD_THRESHOLD = 240  # Seconds before hard cancel for stale symbol
+LIVE_STREAM_READY_TIMEOUT = 10  # Max seconds to wait at startup for live ticks on MIN_DATA_COVERAGE_THRESHOLD of symbols
+HISTORY_FETCH_WORKERS = 4  # Concurrent history API requests during startup load
+HISTORY_FETCH_MAX_PER_SEC = 3  # Broker cap on history requests (Kite: ~3/s); fetch workers are spaced to stay under it
 
 # ============================================================================
 # OPENALGO INTEGRATION
@@ -210,6 +215,16 @@ ORDER_RETRY_DELAY = 2  # Seconds between retries
 STATE_DB_PATH = os.getenv('STATE_DB_PATH', os.path.join(os.path.dirname(__file__), 'live_state.db'))
 STATE_SAVE_INTERVAL = 30  # Save state every 30 seconds
 
+# Startup backfill of historical bars into the dashboard `bars` table (UI only).
+# Runs in the background once the trading loop is up; disable on low-memory hosts.
+ENABLE_DASHBOARD_BACKFILL = os.getenv('ENABLE_DASHBOARD_BACKFILL', 'true').lower() == 'true'
+DASHBOARD_BACKFILL_BATCH_SIZE = 500  # Rows per executemany before yielding to the trading loop
+
+# Live swing detections are buffered and written to all_swings_log in one
+# executemany once this many are queued or the oldest has waited this long
+SWING_LOG_FLUSH_SIZE = 64
+SWING_LOG_FLUSH_INTERVAL = 1.0  # seconds
+
 # Kill/Pause switch files (file-based, works even if DB locked)
 _STATE_DIR = os.getenv('STATE_DIR', os.path.dirname(__file__))
 KILL_SWITCH_FILE = os.path.join(_STATE_DIR, 'KILL_SWITCH')
@@ -234,6 +249,9 @@ EQUITY_CURVE_CSV = os.path.join(LOG_DIR, 'baseline_v1_live_equity_curve.csv')
 TELEGRAM_ENABLED = os.getenv('TELEGRAM_ENABLED', 'false').lower() == 'true'
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '')
+TELEGRAM_DEDUP_WINDOW = 10  # Seconds; identical messages inside this window are sent once
+TELEGRAM_BATCH_WINDOW = 0.3  # Seconds the sender waits to merge a burst of messages into one post
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096  # Telegram sendMessage text limit
 
 # Notification Events
 NOTIFY_ON_TRADE_ENTRY = True
@@ -269,6 +287,10 @@ ANGELONE_TOTP_SECRET = os.getenv('ANGELONE_TOTP_SECRET', '')
 MAX_STARTUP_RETRIES = 5
 STARTUP_RETRY_DELAY_BASE = 20  # seconds (20s, 40s, 60s, 80s backoff)
 
+# Main-loop error retry (seconds): 1s, 2s, 4s, ... up to 60s, plus up to 1s jitter
+MAIN_LOOP_ERROR_BACKOFF_BASE = 1.0
+MAIN_LOOP_ERROR_BACKOFF_MAX = 60.0
+
 # Notification Throttling (seconds)
 NOTIFICATION_THROTTLE_STARTUP = 3600      # 1 hour
 NOTIFICATION_THROTTLE_WEBSOCKET = 3600    # 1 hour
@@ -9,17 +9,42 @@ Usage:
 
 Or run with cron every 2 minutes:
     */2 * * * * cd ~/nifty_options_agent && python -m baseline_v1_live.container_monitor >> /var/log/container_monitor.log 2>&1
+
+Or as a long-running process (one interpreter, checks every --interval seconds):
+    python -m baseline_v1_live.container_monitor --daemon --interval 60
 """
 
+import argparse
+import http.client
+import json
 import logging
+import re
+import signal
+import socket
 import subprocess
+import threading
 import time
 import os
+from urllib.parse import quote
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
+
+import requests
+
+try:
+    from .config import (
+        TELEGRAM_ENABLED, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_MAX_MESSAGE_LENGTH
+    )
+    from .telegram_notifier import BATCH_SEPARATOR
+except ImportError:
+    # Monitor still records container state without Telegram config
+    TELEGRAM_ENABLED = False
+    TELEGRAM_BOT_TOKEN = TELEGRAM_CHAT_ID = None
+    TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+    BATCH_SEPARATOR = "\n---\n"
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 # Setup logging
 log_dir = os.path.join(os.path.dirname(__file__), 'logs')
@@ -31,20 +56,119 @@ logger.addHandler(handler)
 logger.setLevel(logging.INFO)
 
 # State file to prevent alert spam (only alert once per crash)
-STATE_FILE = os.path.join(log_dir, 'container_health_state.txt')
+# Override with CONTAINER_MONITOR_STATE_FILE (e.g. /dev/shm/... to keep it on tmpfs;
+# a tmpfs file is lost on reboot, so crashes across a reboot go unreported)
+STATE_FILE = os.environ.get(
+    'CONTAINER_MONITOR_STATE_FILE', os.path.join(log_dir, 'container_health_state.txt')
+)
+
+# Docker Engine API socket (queried directly instead of spawning docker-compose)
+DOCKER_SOCKET = os.environ.get('DOCKER_SOCKET', '/var/run/docker.sock')
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Canonical state for a running container, whichever source reported it
+RUNNING = 'running'
+
+
+def _normalize_state(state) -> str:
+    """
+    Map a reported container state to the value stored and compared here
+
+    The Engine API and docker-compose v2 report 'running'; docker-compose v1
+    (and older state files) use 'Up ...'. Both become RUNNING so switching
+    status sources never looks like a crash or recovery.
+    """
+    state = str(state or 'unknown').strip()
+    if state == RUNNING or state.startswith('Up'):
+        return RUNNING
+    return state
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that talks to the Docker daemon over its UNIX socket"""
+
+    def __init__(self, socket_path: str, timeout: float = 10):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _compose_project_name() -> str:
+    """Compose project name (COMPOSE_PROJECT_NAME, else the normalized project dir name)"""
+    name = os.environ.get('COMPOSE_PROJECT_NAME') or os.path.basename(PROJECT_DIR)
+    return re.sub(r'[^a-z0-9_-]', '', name.lower())
+
+
+def _get_container_status_engine():
+    """
+    Get compose container status from the Docker Engine API
+
+    Returns: dict with container names as keys and normalized status as
+    values, or None on error
+    """
+    filters = json.dumps({'label': [f'com.docker.compose.project={_compose_project_name()}']})
+    conn = _UnixHTTPConnection(DOCKER_SOCKET)
+    try:
+        conn.request('GET', f'/containers/json?all=1&filters={quote(filters)}')
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+
+    if response.status != 200:
+        logger.error(f"Docker API /containers/json failed: {response.status} {body[:200]!r}")
+        return None
+
+    status = {}
+    for container in json.loads(body):
+        names = container.get('Names') or ['/unknown']
+        status[names[0].lstrip('/')] = _normalize_state(container.get('State'))
+    return status
 
 
 def get_container_status():
     """
     Get Docker Compose container status
 
+    Queries the Docker daemon socket directly; falls back to `docker-compose ps`
+    when the socket is not reachable (e.g. no permission on docker.sock) or
+    finds no containers for the compose project (e.g. the checkout directory
+    name differs from the project name and COMPOSE_PROJECT_NAME is unset).
+
+    Returns: dict with container names as keys and normalized status as values
+    """
+    if os.path.exists(DOCKER_SOCKET):
+        try:
+            status = _get_container_status_engine()
+            if status:
+                return status
+            if status is not None:
+                logger.warning(
+                    f"Docker API found no containers for compose project "
+                    f"'{_compose_project_name()}' (set COMPOSE_PROJECT_NAME?), "
+                    f"falling back to docker-compose ps"
+                )
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            logger.warning(f"Docker API unavailable ({e}), falling back to docker-compose ps")
+    return _get_container_status_compose()
+
+
+def _get_container_status_compose():
+    """
+    Get Docker Compose container status via `docker-compose ps`
+
     Returns: dict with container names as keys and status as values
     """
     try:
         # Run docker-compose ps to get container status
         result = subprocess.run(
             ['docker-compose', 'ps', '--format', 'json'],
-            cwd=os.path.dirname(os.path.dirname(__file__)),
+            cwd=PROJECT_DIR,
             capture_output=True,
             text=True,
             timeout=10
@@ -54,7 +178,6 @@ def get_container_status():
             logger.error(f"docker-compose ps failed: {result.stderr}")
             return None
 
-        import json
         # docker-compose v2 returns NDJSON (one JSON object per line)
         # docker-compose v1 returns a JSON array — handle both
         raw = result.stdout.strip()
@@ -69,8 +192,7 @@ def get_container_status():
         status = {}
         for container in containers:
             name = container.get('Name', 'unknown')
-            state = container.get('State', 'unknown')
-            status[name] = state
+            status[name] = _normalize_state(container.get('State'))
 
         return status
 
@@ -82,59 +204,101 @@ def get_container_status():
         return None
 
 
-def send_telegram_alert(message: str):
-    """Send Telegram alert"""
-    try:
-        from .config import TELEGRAM_ENABLED, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+def pack_alerts(messages: list, max_length: int, separator: str) -> list:
+    """
+    Join alerts into as few Telegram messages as possible
 
+    Order is preserved and no packed message exceeds max_length (an alert
+    that is longer on its own is sent by itself).
+    """
+    packed = []
+    for message in messages:
+        if packed and len(packed[-1]) + len(separator) + len(message) <= max_length:
+            packed[-1] = packed[-1] + separator + message
+        else:
+            packed.append(message)
+    return packed
+
+
+def send_telegram_alerts(messages: list):
+    """
+    Send Telegram alerts, packed into as few requests as possible
+
+    One check can report several containers; they go out over a single
+    keep-alive session instead of one blocking request (and TLS handshake) each.
+    """
+    if not messages:
+        return True
+
+    try:
         if not TELEGRAM_ENABLED or not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
             logger.warning("Telegram not configured, skipping alert")
             return False
 
-        import requests
         url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        payload = {
-            'chat_id': TELEGRAM_CHAT_ID,
-            'text': message,
-        }
-
-        response = requests.post(url, json=payload, timeout=10)
-        if response.status_code == 200:
-            logger.info("Telegram alert sent successfully")
-            return True
-        else:
-            logger.error(f"Telegram API error: {response.status_code}")
-            return False
+        all_sent = True
+
+        with requests.Session() as session:
+            for text in pack_alerts(messages, TELEGRAM_MAX_MESSAGE_LENGTH, BATCH_SEPARATOR):
+                payload = {
+                    'chat_id': TELEGRAM_CHAT_ID,
+                    'text': text,
+                }
+                try:
+                    response = session.post(url, json=payload, timeout=10)
+                except Exception as e:
+                    logger.error(f"Failed to send Telegram alert: {e}")
+                    all_sent = False
+                    continue
+                if response.status_code == 200:
+                    logger.info("Telegram alert sent successfully")
+                else:
+                    logger.error(f"Telegram API error: {response.status_code}")
+                    all_sent = False
+
+        return all_sent
 
     except Exception as e:
         logger.error(f"Failed to send Telegram alert: {e}")
         return False
 
 
+def send_telegram_alert(message: str):
+    """Send Telegram alert"""
+    return send_telegram_alerts([message])
+
+
 def load_previous_state():
     """Load previous container states from file"""
-    if not os.path.exists(STATE_FILE):
-        return {}
-
     try:
-        state = {}
         with open(STATE_FILE, 'r') as f:
-            for line in f:
-                parts = line.strip().split('=')
-                if len(parts) == 2:
-                    state[parts[0]] = parts[1]
-        return state
+            text = f.read()
+        return {
+            name: _normalize_state(state)
+            for name, state in (line.strip().split('=', 1) for line in text.splitlines() if '=' in line)
+        }
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         logger.error(f"Failed to load state file: {e}")
         return {}
 
 
 def save_state(status: dict):
-    """Save current container states to file"""
+    """
+    Save current container states to file
+
+    Written to a temp file and swapped in with os.replace(), so a crash mid-write
+    can't leave a truncated file (which would read as "all containers down").
+    """
+    tmp_file = STATE_FILE + '.tmp'
     try:
-        with open(STATE_FILE, 'w') as f:
-            for name, state in status.items():
-                f.write(f"{name}={state}\n")
+        payload = ''.join(f"{name}={state}\n" for name, state in status.items())
+        with open(tmp_file, 'w') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, STATE_FILE)
     except Exception as e:
         logger.error(f"Failed to save state file: {e}")
 
@@ -162,12 +326,12 @@ def check_container_health():
     # Check for changes
     alerts = []
 
-    # Check for crashed containers (state changed from "Up" to something else)
+    # Check for crashed containers (state changed from running to something else)
     for container_name, current_state in current_status.items():
         previous_state_val = previous_state.get(container_name, 'unknown')
 
         # Container crashed (was running, now not)
-        if previous_state_val == 'Up' and current_state != 'Up':
+        if previous_state_val == RUNNING and current_state != RUNNING:
             ec2_host = os.environ.get('EC2_HOST', '<EC2_HOST>')
             alert = (
                 f"[CONTAINER_CRASH] {container_name} crashed!\n"
@@ -184,25 +348,26 @@ def check_container_health():
             logger.warning(f"Container crash detected: {container_name}")
 
         # Container recovered (was down, now up)
-        elif previous_state_val != 'Up' and current_state == 'Up':
+        elif previous_state_val != RUNNING and current_state == RUNNING:
             alert = f"[CONTAINER_RECOVERED] {container_name} is now running!"
             alerts.append(alert)
             logger.info(f"Container recovered: {container_name}")
 
-    # Send alerts via Telegram
+    # Send alerts via Telegram (packed into as few messages as possible)
     for alert in alerts:
         logger.info(f"Sending alert: {alert}")
-        send_telegram_alert(alert)
+    send_telegram_alerts(alerts)
 
-    # Save current state for next check
-    save_state(current_status)
+    # Save current state for next check (steady state: nothing changed, no write)
+    if current_status != previous_state:
+        save_state(current_status)
 
     if not alerts:
         logger.info("All containers healthy")
 
 
-def main():
-    """Main entry point"""
+def run_check():
+    """Run one health check, alerting if the monitor itself fails"""
     try:
         logger.info(f"Container Monitor started at {datetime.now(IST).strftime('%H:%M:%S %Z')}")
         check_container_health()
@@ -216,5 +381,34 @@ def main():
             pass
 
 
+def run_daemon(interval: float, shutdown: threading.Event):
+    """Check every `interval` seconds until `shutdown` is set"""
+    logger.info(f"Container Monitor daemon started (interval {interval}s)")
+    while not shutdown.is_set():
+        run_check()
+        shutdown.wait(interval)
+    logger.info("Container Monitor daemon stopped")
+
+
+def main(argv=None):
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Docker container health monitor')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and check every --interval seconds (instead of one cron-style check)')
+    parser.add_argument('--interval', type=float,
+                        default=float(os.environ.get('CONTAINER_MONITOR_INTERVAL', 120)),
+                        help='Seconds between checks in --daemon mode (default: 120)')
+    args = parser.parse_args(argv)
+
+    if not args.daemon:
+        run_check()
+        return
+
+    shutdown = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: shutdown.set())
+    run_daemon(args.interval, shutdown)
+
+
 if __name__ == '__main__':
     main()
@@ -28,7 +28,7 @@ This reduces API calls, broker RMS flags, and ensures order is ready if price re
 
 import logging
 import copy
-from typing import Dict, List, Optional
+from typing import AbstractSet, Dict, List, Optional
 from datetime import datetime
 
 from .config import (
@@ -36,10 +36,10 @@ from .config import (
     MIN_VWAP_PREMIUM, MIN_SL_PERCENT, MAX_SL_PERCENT,
     TARGET_SL_POINTS, R_VALUE, LOT_SIZE, MAX_LOTS_PER_POSITION
 )
-import pytz
+from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 
 class ContinuousFilterEngine:
@@ -53,6 +53,8 @@ class ContinuousFilterEngine:
     def __init__(self, state_manager=None):
         # Swing candidates that passed static filter (100-300 price range)
         self.swing_candidates = {}  # {symbol: swing_info}
+        # Bumped on every add/remove/reset so callers can skip re-saving an unchanged pool
+        self.candidates_version = 0
 
         # Stage-1 filtered swings pool (passed both price range AND VWAP >=4% filters)
         # Structure: {'CE': [swing_info1, swing_info2, ...], 'PE': [...]}
@@ -89,6 +91,7 @@ class ContinuousFilterEngine:
     
     def reset_daily_data(self):
         """Clear in-memory swing data for new trading day"""
+        self.candidates_version += 1
         self.swing_candidates.clear()
         self.stage1_swings_by_type = {'CE': [], 'PE': []}
         self.current_best = {'CE': None, 'PE': None}
@@ -109,6 +112,7 @@ class ContinuousFilterEngine:
                 'index': bar_index
             }
         """
+        self.candidates_version += 1
         swing_price = swing_info['price']
         swing_type = swing_info.get('type', 'Low')  # Get swing type (Low/High)
 
@@ -231,6 +235,7 @@ class ContinuousFilterEngine:
     
     def remove_swing_candidate(self, symbol: str):
         """Remove swing candidate from ALL pools (after fill, invalidation, etc.)"""
+        self.candidates_version += 1
         option_type = None
         if symbol in self.swing_candidates:
             option_type = self.swing_candidates[symbol].get('option_type')
@@ -267,6 +272,9 @@ class ContinuousFilterEngine:
             Number of swings marked as broken
         """
         marked_count = 0
+        # {symbol: suffix_min_lows} where suffix_min_lows[i] = lowest low in bars[i:]
+        # Built once per symbol so each swing check is O(1) instead of a bar scan
+        suffix_min_by_symbol = {}
 
         for option_type in ['CE', 'PE']:
             for swing_info in self.stage1_swings_by_type[option_type]:
@@ -277,19 +285,18 @@ class ContinuousFilterEngine:
                 swing_low = swing_info['price']
                 swing_index = swing_info.get('index', 0)
 
-                # Get detector for this symbol
-                detector = swing_detector.get_detector(symbol)
-                if not detector or not detector.bars:
-                    continue
+                suffix_min = suffix_min_by_symbol.get(symbol)
+                if suffix_min is None:
+                    # Get detector for this symbol
+                    detector = swing_detector.get_detector(symbol)
+                    if not detector or not detector.bars:
+                        continue
+                    suffix_min = self._suffix_min_lows(detector.bars)
+                    suffix_min_by_symbol[symbol] = suffix_min
 
                 # Check if any bar AFTER the swing had low < swing_low (swing broke)
-                broke_in_history = False
-                for i in range(swing_index + 1, len(detector.bars)):
-                    bar = detector.bars[i]
-                    bar_low = bar.get('low', float('inf'))
-                    if bar_low < swing_low:
-                        broke_in_history = True
-                        break
+                next_index = max(swing_index + 1, 0)
+                broke_in_history = next_index < len(suffix_min) and suffix_min[next_index] < swing_low
 
                 if broke_in_history:
                     swing_info['broke_in_history'] = True
@@ -304,8 +311,20 @@ class ContinuousFilterEngine:
         logger.info(f"[STARTUP-PROTECTION] Marked {marked_count} swings as already broken in history")
         return marked_count
 
+    @staticmethod
+    def _suffix_min_lows(bars: List[Dict]) -> List[float]:
+        """Return lows[i:] minimums for every i (single backward pass)"""
+        suffix_min = [0.0] * len(bars)
+        running = float('inf')
+        for i in range(len(bars) - 1, -1, -1):
+            bar_low = bars[i].get('low', float('inf'))
+            if bar_low < running:
+                running = bar_low
+            suffix_min[i] = running
+        return suffix_min
+
     def evaluate_all_candidates(self, latest_bars: Dict, swing_detector, current_bars: Dict = None,
-                                open_position_symbols: set = None) -> Dict:
+                                open_position_symbols: AbstractSet[str] = None) -> Dict:
         """
         Evaluate all swing candidates with latest bar data
 
@@ -315,6 +334,7 @@ class ContinuousFilterEngine:
             latest_bars: {symbol: BarData} - Latest completed bars
             swing_detector: MultiSwingDetector instance for getting highest_high
             current_bars: {symbol: BarData} - Current incomplete bars with real-time highs (optional)
+            open_position_symbols: Symbols with open positions (any set-like, e.g. dict keys view)
 
         Returns:
             {'CE': best_ce_candidate, 'PE': best_pe_candidate}
@@ -327,10 +347,12 @@ class ContinuousFilterEngine:
         ce_count = len(self.stage1_swings_by_type['CE'])
         pe_count = len(self.stage1_swings_by_type['PE'])
         if ce_count > 0 or pe_count > 0:
-            logger.debug(
-                f"[STAGE1-POOL] CE: {ce_count} swings, PE: {pe_count} swings. "
-                f"CE symbols: {[s.get('symbol') for s in self.stage1_swings_by_type['CE']]}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[STAGE1-POOL] CE: %d swings, PE: %d swings. CE symbols: %s",
+                    ce_count, pe_count,
+                    [s.get('symbol') for s in self.stage1_swings_by_type['CE']]
+                )
 
         # Check for broken swings in VWAP-qualified pool and remove them
         broken_count = 0  # Track how many swings broke this evaluation
@@ -576,8 +598,8 @@ class ContinuousFilterEngine:
                 # Log when current bar's high exceeds completed bar high (significant for SL% calculation)
                 if current_high > highest_from_completed and symbol:
                     logger.debug(
-                        f"[CURRENT-HIGH] {symbol}: Current bar high {current_high:.2f} > "
-                        f"completed bars high {highest_from_completed:.2f}"
+                        "[CURRENT-HIGH] %s: Current bar high %.2f > completed bars high %.2f",
+                        symbol, current_high, highest_from_completed
                     )
 
                 return final_highest
@@ -614,17 +636,17 @@ class ContinuousFilterEngine:
             # No candidate qualified - cancel any existing order
             if candidate is None:
                 logger.debug(
-                    f"[NO-CANDIDATE-{option_type}] self.current_best[{option_type}] is None - "
-                    f"no qualified candidate in memory"
+                    "[NO-CANDIDATE-%s] self.current_best[%s] is None - no qualified candidate in memory",
+                    option_type, option_type
                 )
                 triggers[option_type] = {'action': 'cancel', 'candidate': None, 'reason': 'no qualified candidate'}
                 continue
 
             # Candidate exists - log details
             logger.debug(
-                f"[HAS-CANDIDATE-{option_type}] Symbol={candidate['symbol']}, "
-                f"Entry={candidate.get('swing_low', 0):.2f}, "
-                f"SL={candidate.get('sl_price', 0):.2f}"
+                "[HAS-CANDIDATE-%s] Symbol=%s, Entry=%.2f, SL=%.2f",
+                option_type, candidate['symbol'],
+                candidate.get('swing_low', 0), candidate.get('sl_price', 0)
             )
 
             symbol = candidate['symbol']
@@ -669,10 +691,9 @@ class ContinuousFilterEngine:
 
             # Log price proximity for debugging
             logger.debug(
-                f"[PRICE-CHECK-{option_type}] {symbol}: "
-                f"Current={current_price:.2f}, Swing={swing_low:.2f}, "
-                f"Above={price_above_swing:.2f} Rs, "
-                f"Has_Order={existing_order is not None}"
+                "[PRICE-CHECK-%s] %s: Current=%.2f, Swing=%.2f, Above=%.2f Rs, Has_Order=%s",
+                option_type, symbol, current_price, swing_low,
+                price_above_swing, existing_order is not None
             )
 
             # ═══ IMPROVED ORDER PLACEMENT LOGIC ═══
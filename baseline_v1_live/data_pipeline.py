@@ -17,14 +17,16 @@ Features:
 - Data validation (stale tick detection)
 """
 
-import copy
 import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time, timedelta
-from threading import RLock, Thread
+from threading import Event, Lock, RLock, Thread
 import time as time_module
-import pytz
+from zoneinfo import ZoneInfo
 
+import numpy as np
+import pandas as pd
 from openalgo import api
 from .config import (
     OPENALGO_API_KEY,
@@ -44,6 +46,8 @@ from .config import (
     WEBSOCKET_MAX_RECONNECT_ATTEMPTS,
     WEBSOCKET_MODE,
     MIN_DATA_COVERAGE_THRESHOLD,
+    HISTORY_FETCH_WORKERS,
+    HISTORY_FETCH_MAX_PER_SEC,
     STALE_DATA_TIMEOUT,
     MAX_BAR_AGE_SECONDS,
     MAX_BARS_PER_SYMBOL,
@@ -53,11 +57,105 @@ from .config import (
 )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
+
+
+def _minute_timestamp(idx):
+    """History index value -> IST-aware bar timestamp rounded down to the minute"""
+    if isinstance(idx, str):
+        idx = datetime.fromisoformat(idx)
+    if idx.tzinfo is None:
+        idx = idx.replace(tzinfo=IST)
+    return idx.replace(second=0, microsecond=0)
+
+
+def _minute_timestamps(index):
+    """History index -> list of IST-aware bar timestamps rounded down to the minute"""
+    if getattr(index, 'tz', None) is not None:
+        # Aware DatetimeIndex: floor the whole index at once
+        return index.floor('min').to_pydatetime().tolist()
+    return [_minute_timestamp(idx) for idx in index]
+
+
+def _localize_history_index(df):
+    """
+    Normalize a history index to an IST-aware DatetimeIndex once per frame
+
+    ISO-string indexes are parsed in one call (strings with mixed UTC offsets
+    via UTC, then converted to IST) and naive timestamps localized to IST, so
+    time filters and minute flooring stay vectorized.
+    """
+    index = df.index
+    if len(index) and isinstance(index[0], str):
+        try:
+            index = pd.to_datetime(index, format='ISO8601')
+        except ValueError:
+            # Mixed UTC offsets cannot share one tz - normalize through UTC
+            index = pd.to_datetime(index, format='ISO8601', utc=True).tz_convert(IST)
+    if hasattr(index, 'tz_localize') and index.tz is None:
+        index = index.tz_localize(IST)
+    return df if index is df.index else df.set_axis(index)
+
+
+def _history_columns(df):
+    """
+    Vectorized OHLCV + cumulative session VWAP for a sorted history DataFrame
+
+    VWAP uses typical price (H+L+C)/3, cumulated from the first row; rows before
+    any volume fall back to the typical price. Missing columns read as 0.
+
+    Returns:
+        (timestamps, opens, highs, lows, closes, volumes, vwaps, cum_pv, cum_vol)
+        with per-row values as Python lists and the final accumulators as scalars
+    """
+    n = len(df)
+
+    def column(name):
+        return df[name].to_numpy() if name in df.columns else np.zeros(n, dtype=np.int64)
+
+    opens, highs, lows, closes, volumes = (
+        column(name) for name in ('open', 'high', 'low', 'close', 'volume')
+    )
+    typical = (highs + lows + closes) / 3
+    cum_pv = np.cumsum(typical * volumes)
+    cum_vol = np.cumsum(volumes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwaps = np.where(cum_vol > 0, cum_pv / cum_vol, typical)
+
+    return (
+        _minute_timestamps(df.index),
+        opens.tolist(), highs.tolist(), lows.tolist(), closes.tolist(), volumes.tolist(),
+        vwaps.tolist(), float(cum_pv[-1]), cum_vol[-1].item(),
+    )
+
+
+def _history_rows(df):
+    """
+    Iterate a history DataFrame as (timestamp, open, high, low, close, volume) tuples
+
+    Reads each column once instead of building a Series per row like iterrows().
+    Column names may be lower- or capitalized; missing columns read as 0.
+    """
+    n = len(df)
+
+    def column(name):
+        for key in (name, name.capitalize()):
+            if key in df.columns:
+                return df[key].tolist()
+        return [0] * n
+
+    return zip(
+        _minute_timestamps(df.index),
+        *(column(name) for name in ('open', 'high', 'low', 'close', 'volume'))
+    )
 
 
 class BarData:
     """1-minute OHLCV bar with VWAP"""
+
+    # Thousands of these live in self.bars; slots keep them small and attribute reads direct
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'vwap',
+                 'tick_count', '_timestamp_iso')
     
     def __init__(self, timestamp):
         self.timestamp = timestamp
@@ -68,6 +166,31 @@ class BarData:
         self.volume = 0
         self.vwap = None
         self.tick_count = 0
+        self._timestamp_iso = None
+    
+    def snapshot(self):
+        """Independent copy of this bar (get_*_bar(s) hand these out every tick)"""
+        # Plain field assignment - skips __init__ and the copy module's dispatch
+        bar = BarData.__new__(BarData)
+        bar.timestamp = self.timestamp
+        bar.open = self.open
+        bar.high = self.high
+        bar.low = self.low
+        bar.close = self.close
+        bar.volume = self.volume
+        bar.vwap = self.vwap
+        bar.tick_count = self.tick_count
+        bar._timestamp_iso = self._timestamp_iso
+        return bar
+
+    __copy__ = snapshot
+    
+    @property
+    def timestamp_iso(self):
+        """ISO-format timestamp, computed once per bar (used for DB/dashboard writes)"""
+        if self._timestamp_iso is None:
+            self._timestamp_iso = self.timestamp.isoformat()
+        return self._timestamp_iso
     
     def update_tick(self, ltp, volume=1):
         """Update bar with new tick data"""
@@ -131,6 +254,15 @@ class DataPipeline:
 
         # Watchdog tracking
         self.first_data_received_at = None
+
+        # Startup readiness: set once live ticks cover MIN_DATA_COVERAGE_THRESHOLD of subscriptions
+        self.live_data_ready = Event()
+
+        # Set by cancel_history_retry() to abort the startup history retry wait
+        self._history_retry_cancel = Event()
+        # Earliest monotonic time the next history request may start (see _fetch_history)
+        self._history_rate_lock = Lock()
+        self._next_history_slot = 0.0
         self.consecutive_stale_checks = 0
         self.watchdog_triggered = False
 
@@ -196,6 +328,58 @@ class DataPipeline:
             self.is_connected = False
             raise
     
+    def _submit_history_fetches(self, symbols, start_date, end_date):
+        """
+        Submit a 1-min history request per symbol to a thread pool
+
+        History requests are network-bound, so they are issued concurrently
+        (throttled to the broker rate limit by _fetch_history).
+        Callers apply the results in their own order via future.result(), which
+        re-raises any per-symbol fetch error at that point.
+
+        Args:
+            symbols: Option symbols to fetch
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+
+        Returns:
+            Dict of symbol -> Future for client.history()
+        """
+        symbols = list(symbols)
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(HISTORY_FETCH_WORKERS, len(symbols))),
+            thread_name_prefix='history-fetch'
+        )
+        futures = {
+            symbol: executor.submit(self._fetch_history, symbol, start_date, end_date)
+            for symbol in symbols
+        }
+        executor.shutdown(wait=False)
+        return futures
+
+    def _fetch_history(self, symbol, start_date, end_date):
+        """
+        client.history() for one symbol, throttled to HISTORY_FETCH_MAX_PER_SEC
+
+        Each call reserves the next free start slot under a lock and sleeps
+        until it, so the fetch workers together never exceed the broker's
+        rate limit (over it, requests fail with 429 and land in the retry).
+        """
+        with self._history_rate_lock:
+            now = time_module.monotonic()
+            start = max(now, self._next_history_slot)
+            self._next_history_slot = start + 1.0 / HISTORY_FETCH_MAX_PER_SEC
+        if start > now:
+            time_module.sleep(start - now)
+
+        return self.client.history(
+            symbol=symbol,
+            exchange=EXCHANGE,
+            interval='1m',
+            start_date=start_date,
+            end_date=end_date
+        )
+
     def load_historical_data(self, symbols):
         """
         Load today's historical 1-min bars for all symbols
@@ -230,17 +414,14 @@ class DataPipeline:
         
         successful = 0
         failed = 0
-        
+
+        # Fetch 1-min historical data for today concurrently and process the
+        # responses in symbol order below
+        futures = self._submit_history_fetches(symbols, start_date, end_date)
+
         for symbol in symbols:
             try:
-                # Fetch 1-min historical data for today
-                df = self.client.history(
-                    symbol=symbol,
-                    exchange=EXCHANGE,
-                    interval='1m',
-                    start_date=start_date,
-                    end_date=end_date
-                )
+                df = futures[symbol].result()
                 
                 # Handle dictionary response (error or empty)
                 if isinstance(df, dict):
@@ -255,7 +436,6 @@ class DataPipeline:
                         continue
                     # If we reach here, it might be a list of records in 'data'?
                     # OpenAlgo usually returns DataFrame if successful, but just in case:
-                    import pandas as pd
                     df = pd.DataFrame(df['data'])
                 
                 if df is None or df.empty:
@@ -265,7 +445,10 @@ class DataPipeline:
 
                 # CRITICAL FIX: Sort by timestamp to handle out-of-order data from API
                 # Without this, stale/future bars can corrupt swing detection
-                df = df.sort_index()
+                # (the API normally returns sorted rows, so check before sorting)
+                if not df.index.is_monotonic_increasing:
+                    df = df.sort_index()
+                df = _localize_history_index(df)
 
                 # CRITICAL FIX: Exclude the in-progress bar from history load.
                 # The history API returns the current in-progress bar with incomplete OHLCV.
@@ -273,8 +456,7 @@ class DataPipeline:
                 # stream's completed bar is rejected as a "DUPLICATE" — leaving the wrong
                 # (incomplete) bar permanently in the swing detector's window.
                 # Only load bars up to and including last_complete_bar_time.
-                last_complete_bar_time_aware = IST.localize(last_complete_bar_time) if last_complete_bar_time.tzinfo is None else last_complete_bar_time
-                df = df[df.index <= last_complete_bar_time_aware]
+                df = df[df.index <= last_complete_bar_time]
 
                 if df.empty:
                     logger.info(f"[HIST] No complete bars yet for {symbol} (market just opened)")
@@ -289,46 +471,21 @@ class DataPipeline:
                         logger.info(f"[HIST] Sample index: {df.index[0]}")
                         logger.info(f"[HIST] Last historical bar: {df.index[-1]}")
                 
-                # Convert to bars and populate history
-                with self.lock:
-                    # Initialize session VWAP tracking for this symbol
-                    cum_pv = 0.0
-                    cum_vol = 0
-
-                    for idx, row in df.iterrows():
-                        # Datetime is the index, not a column
-                        bar_time = idx
-
-                        if isinstance(bar_time, str):
-                            bar_time = datetime.fromisoformat(bar_time)
-                        if bar_time.tzinfo is None:
-                            bar_time = IST.localize(bar_time)
-
-                        # Round to minute
-                        bar_timestamp = bar_time.replace(second=0, microsecond=0)
-
-                        # Create BarData object (lowercase column names from OpenAlgo)
-                        bar = BarData(bar_timestamp)
-                        bar.open = row.get('open', 0)
-                        bar.high = row.get('high', 0)
-                        bar.low = row.get('low', 0)
-                        bar.close = row.get('close', 0)
-                        bar.volume = row.get('volume', 0)
-                        bar.tick_count = 10  # Assume complete bar
-
-                        # Calculate cumulative session VWAP from market open
-                        # Using typical price = (high + low + close) / 3
-                        typical_price = (bar.high + bar.low + bar.close) / 3
-                        cum_pv += typical_price * bar.volume
-                        cum_vol += bar.volume
-
-                        if cum_vol > 0:
-                            bar.vwap = cum_pv / cum_vol
-                        else:
-                            bar.vwap = typical_price
+                # Convert to bars: OHLCV + cumulative session VWAP from market open
+                # are computed column-wise, then zipped into BarData objects
+                (timestamps, opens, highs, lows, closes, volumes, vwaps,
+                 cum_pv, cum_vol) = _history_columns(df)
+                new_bars = []
+                for bar_timestamp, o, h, l, c, v, vwap in zip(
+                        timestamps, opens, highs, lows, closes, volumes, vwaps):
+                    bar = BarData(bar_timestamp)
+                    bar.open, bar.high, bar.low, bar.close, bar.volume = o, h, l, c, v
+                    bar.vwap = vwap
+                    bar.tick_count = 10  # Assume complete bar
+                    new_bars.append(bar)
 
-                        # Add to historical bars
-                        self.bars[symbol].append(bar)
+                with self.lock:
+                    self.bars[symbol].extend(new_bars)
 
                     # Store cumulative values for live bar continuation
                     self.session_vwap_data[symbol] = {
@@ -375,6 +532,31 @@ class DataPipeline:
                             f"current bar @ {current_minute.strftime('%H:%M')} (in progress)"
                         )
     
+    def _history_completeness(self, now):
+        """
+        Compare the loaded bar count against the bars expected since 9:15 AM.
+
+        Expected bar count = floor(minutes since 9:15 AM) - 1 (current bar incomplete)
+
+        Args:
+            now: Current IST datetime
+
+        Returns:
+            Tuple of (max_bars, expected_bars, complete) where complete means
+            max_bars >= 80% of expected_bars
+        """
+        market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
+        expected_bars = max(0, int((now - market_open).total_seconds() / 60) - 1)
+
+        with self.lock:
+            max_bars = max((len(v) for v in self.bars.values()), default=0)
+
+        return max_bars, expected_bars, max_bars >= expected_bars * 0.8
+
+    def cancel_history_retry(self):
+        """Abort a startup history retry wait in progress (safe from signal handlers)"""
+        self._history_retry_cancel.set()
+
     def _ensure_complete_history(self, load_time):
         """
         Verify that history loading captured bars from close to 9:15 AM.
@@ -383,25 +565,25 @@ class DataPipeline:
         shortly after market open, returning far fewer bars than expected.
         This method retries up to 3 times (60s apart) using the history API.
         If all 3 retries still show insufficient bars, logs a CRITICAL warning
-        and continues with partial history VWAP.
+        and continues with partial history VWAP. Retrying stops early when a
+        reload recovers no missing bars, since the API has nothing new to offer.
+
+        The wait between retries returns early on cancel_history_retry(), so a
+        shutdown during startup does not sit out the remaining retries. Ticks,
+        the connection monitor and failover keep running on their own threads
+        while this waits.
 
-        Expected bar count = floor(minutes since 9:15 AM) - 1
-        Trigger threshold  = actual_max_bars < expected * 0.8
+        Trigger threshold = actual_max_bars < expected * 0.8
         """
-        market_open = load_time.replace(hour=9, minute=15, second=0, microsecond=0)
         if load_time.time() < time(9, 15):
             return  # Pre-market: no bars expected yet
 
-        minutes_since_open = (load_time - market_open).total_seconds() / 60
-        expected_bars = max(0, int(minutes_since_open) - 1)  # -1: current bar incomplete
+        max_bars, expected_bars, complete = self._history_completeness(load_time)
 
         if expected_bars < 5:
             return  # Less than 5 min past open — lag cannot meaningfully affect VWAP
 
-        with self.lock:
-            max_bars = max((len(v) for v in self.bars.values()), default=0)
-
-        if max_bars >= expected_bars * 0.8:
+        if complete:
             logger.info(
                 f"[HIST] Bar count OK: {max_bars}/{expected_bars} bars loaded "
                 f"(>= 80% threshold). VWAP reliable."
@@ -414,34 +596,44 @@ class DataPipeline:
             f"Retrying up to 3 times (60s apart) to get complete history."
         )
 
+        # Live bars keep arriving during the wait and raise both counts alike, so
+        # progress is measured on the shortfall rather than on max_bars itself
+        missing = expected_bars - max_bars
+
         for attempt in range(1, 4):
             logger.info(f"[HIST-RETRY] Waiting 60s before attempt {attempt}/3...")
-            time_module.sleep(60)
+            if self._history_retry_cancel.wait(60):
+                logger.warning("[HIST-RETRY] Retry cancelled. Proceeding with partial history VWAP.")
+                return
 
             self._reload_historical_vwap()
 
-            now = datetime.now(IST)
-            market_open_now = now.replace(hour=9, minute=15, second=0, microsecond=0)
-            expected_now = max(0, int((now - market_open_now).total_seconds() / 60) - 1)
-
-            with self.lock:
-                max_bars = max((len(v) for v in self.bars.values()), default=0)
+            max_bars, expected_now, complete = self._history_completeness(datetime.now(IST))
 
             logger.info(
                 f"[HIST-RETRY] Attempt {attempt}/3: {max_bars}/{expected_now} bars after reload."
             )
 
-            if max_bars >= expected_now * 0.8:
+            if complete:
                 logger.info(
                     f"[HIST-RETRY] History complete after attempt {attempt}. "
                     f"VWAP corrected from full history."
                 )
                 return
 
-        # All 3 retries exhausted — log critical warning, proceed with partial history.
+            missing_now = expected_now - max_bars
+            if missing_now >= missing:
+                logger.warning(
+                    f"[HIST-RETRY] No progress after attempt {attempt}/3 "
+                    f"({missing_now} bars still missing). Stopping retries."
+                )
+                break
+            missing = missing_now
+
+        # Retries exhausted or stalled — log critical warning, proceed with partial history.
         # Proceed with partial history VWAP — safer than any fallback.
         logger.critical(
-            f"[HIST-RETRY] All 3 retries failed. Proceeding with partial history VWAP. "
+            f"[HIST-RETRY] History retries failed. Proceeding with partial history VWAP. "
             f"VWAP values may be less accurate (missing early session bars). "
             f"Check Zerodha history API availability."
         )
@@ -461,64 +653,51 @@ class DataPipeline:
         today = datetime.now(IST).date().strftime('%Y-%m-%d')
         now = datetime.now(IST)
         last_complete = now.replace(second=0, microsecond=0) - timedelta(minutes=1)
-        if last_complete.tzinfo is None:
-            last_complete = IST.localize(last_complete)
 
         with self.lock:
             symbols = list(self.bars.keys())
 
+        futures = self._submit_history_fetches(symbols, today, today)
+
         corrected = 0
         for symbol in symbols:
             try:
-                df = self.client.history(
-                    symbol=symbol,
-                    exchange=EXCHANGE,
-                    interval='1m',
-                    start_date=today,
-                    end_date=today
-                )
+                df = futures[symbol].result()
 
                 if isinstance(df, dict) or df is None or (hasattr(df, 'empty') and df.empty):
                     continue
 
-                df = df.sort_index()
+                if not df.index.is_monotonic_increasing:
+                    df = df.sort_index()
+                df = _localize_history_index(df)
                 df = df[df.index <= last_complete]
 
                 if df.empty:
                     continue
 
+                # Recalculate VWAP for all history rows (column-wise)
+                (timestamps, opens, highs, lows, closes, volumes, vwaps,
+                 cum_pv, cum_vol) = _history_columns(df)
+                bar_vwap_map = dict(zip(timestamps, vwaps))
+
                 with self.lock:
                     existing_timestamps = {b.timestamp for b in self.bars.get(symbol, [])}
 
-                    # Build new early bars and recalculate VWAP for all history rows
+                    # Early bars the first load missed — add them now
                     new_early_bars = []
-                    cum_pv = 0.0
-                    cum_vol = 0
-                    bar_vwap_map = {}
-
-                    for idx, row in df.iterrows():
-                        bar_ts = idx.replace(second=0, microsecond=0)
-                        tp = (row['high'] + row['low'] + row['close']) / 3
-                        cum_pv += tp * row.get('volume', 0)
-                        cum_vol += row.get('volume', 0)
-                        vwap = cum_pv / cum_vol if cum_vol > 0 else tp
-                        bar_vwap_map[bar_ts] = vwap
-
+                    for bar_ts, o, h, l, c, v, vwap in zip(
+                            timestamps, opens, highs, lows, closes, volumes, vwaps):
                         if bar_ts not in existing_timestamps:
-                            # Early bar the first load missed — add it now
                             bar = BarData(bar_ts)
-                            bar.open = row.get('open', 0)
-                            bar.high = row.get('high', 0)
-                            bar.low = row.get('low', 0)
-                            bar.close = row.get('close', 0)
-                            bar.volume = row.get('volume', 0)
+                            bar.open, bar.high, bar.low, bar.close, bar.volume = o, h, l, c, v
                             bar.tick_count = 10
                             bar.vwap = vwap
                             new_early_bars.append(bar)
 
-                    # Prepend missing early bars (they come before all existing bars)
+                    # Prepend missing early bars (they come before all existing bars),
+                    # in place rather than building a copy of the existing list
                     if new_early_bars:
-                        self.bars[symbol] = new_early_bars + list(self.bars.get(symbol, []))
+                        self.bars[symbol][:0] = new_early_bars
                         logger.info(
                             f"[HIST-RETRY] {symbol}: inserted {len(new_early_bars)} "
                             f"early bars from history."
@@ -612,16 +791,13 @@ class DataPipeline:
         filled_count = 0
         failed_count = 0
         
-        for symbol in self.bars.keys():
+        # Fetch today's history (should now include the missing bars)
+        symbols = list(self.bars.keys())
+        futures = self._submit_history_fetches(symbols, start_date, end_date)
+        
+        for symbol in symbols:
             try:
-                # Fetch today's history (should now include the missing bars)
-                df = self.client.history(
-                    symbol=symbol,
-                    exchange=EXCHANGE,
-                    interval='1m',
-                    start_date=start_date,
-                    end_date=end_date
-                )
+                df = futures[symbol].result()
                 
                 # Handle dictionary response
                 if isinstance(df, dict):
@@ -630,7 +806,6 @@ class DataPipeline:
                         continue
                     if not df.get('data'):
                         continue
-                    import pandas as pd
                     df = pd.DataFrame(df['data'])
 
                 if df is None or df.empty:
@@ -641,6 +816,7 @@ class DataPipeline:
                 if last_bar_time is None:
                     continue
                 
+                df = _localize_history_index(df)
                 missed_bars = df[df.index > last_bar_time]
                 
                 if missed_bars.empty:
@@ -674,18 +850,10 @@ class DataPipeline:
                     # Build set of existing bar timestamps for dedup
                     existing_timestamps = {b.timestamp for b in self.bars[symbol]}
 
-                    for idx, row in missed_bars.iterrows():
-                        bar_time = idx
-
-                        if isinstance(bar_time, str):
-                            bar_time = datetime.fromisoformat(bar_time)
-                        if bar_time.tzinfo is None:
-                            bar_time = IST.localize(bar_time)
+                    # Don't add bars that are in the future or current incomplete bar
+                    current_check = datetime.now(IST).replace(second=0, microsecond=0)
 
-                        bar_timestamp = bar_time.replace(second=0, microsecond=0)
-
-                        # Don't add bars that are in the future or current incomplete bar
-                        current_check = datetime.now(IST).replace(second=0, microsecond=0)
+                    for bar_timestamp, open_, high, low, close, volume in _history_rows(missed_bars):
                         if bar_timestamp >= current_check:
                             logger.debug(
                                 f"[GAP-FILL] Skipping incomplete/future bar @ {bar_timestamp.strftime('%H:%M')}"
@@ -701,11 +869,11 @@ class DataPipeline:
                             continue
 
                         bar = BarData(bar_timestamp)
-                        bar.open = row.get('open', 0)
-                        bar.high = row.get('high', 0)
-                        bar.low = row.get('low', 0)
-                        bar.close = row.get('close', 0)
-                        bar.volume = row.get('volume', 0)
+                        bar.open = open_
+                        bar.high = high
+                        bar.low = low
+                        bar.close = close
+                        bar.volume = volume
                         bar.tick_count = 10  # Assume complete bar
 
                         # Calculate cumulative session VWAP
@@ -1095,11 +1263,6 @@ class DataPipeline:
             }
         }
         """
-        # TOCTOU guard: re-verify source is still active
-        if source:
-            with self.lock:
-                if self.active_source != source:
-                    return  # Source switched during handoff, discard tick
         try:
             symbol = data.get('symbol')
             quote_data = data.get('data', {})
@@ -1112,18 +1275,25 @@ class DataPipeline:
 
             now = datetime.now(IST)
 
-            # Update last tick time (active source)
+            # Get current minute timestamp (rounded down)
+            bar_timestamp = now.replace(second=0, microsecond=0)
+
+            # One lock acquisition per tick: source check, tick time and bar update
             with self.lock:
+                # TOCTOU guard: re-verify source is still active
+                if source and self.active_source != source:
+                    return  # Source switched during handoff, discard tick
+
+                # Update last tick time (active source)
                 self.last_tick_time[symbol] = now
 
                 # Track first data received
                 if self.first_data_received_at is None:
                     self.first_data_received_at = now
 
-            # Get current minute timestamp (rounded down)
-            bar_timestamp = now.replace(second=0, microsecond=0)
-            
-            with self.lock:
+                if not self.live_data_ready.is_set():
+                    self._check_live_data_ready()
+
                 # Check if we need to start a new bar
                 current_bar = self.current_bars.get(symbol)
 
@@ -1155,8 +1325,8 @@ class DataPipeline:
                             removed = len(self.bars[symbol]) - MAX_BARS_PER_SYMBOL
                             self.bars[symbol] = self.bars[symbol][-MAX_BARS_PER_SYMBOL:]
                             logger.debug(
-                                f"Pruned {removed} old bars from {symbol} "
-                                f"(kept {MAX_BARS_PER_SYMBOL})"
+                                "Pruned %d old bars from %s (kept %d)",
+                                removed, symbol, MAX_BARS_PER_SYMBOL
                             )
 
                     # Start new bar
@@ -1169,6 +1339,27 @@ class DataPipeline:
         except Exception as e:
             logger.error(f"[TICK] Error processing tick: {e}")
     
+    def _check_live_data_ready(self):
+        """Set live_data_ready once enough subscribed symbols have ticked (caller holds lock)"""
+        total = len(self.subscribed_symbols)
+        if total == 0:
+            return
+        live = sum(1 for s in self.subscribed_symbols if s in self.last_tick_time)
+        if live / total >= MIN_DATA_COVERAGE_THRESHOLD:
+            self.live_data_ready.set()
+
+    def wait_for_live_data(self, timeout):
+        """
+        Block until live ticks arrive for enough subscribed symbols
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the stream became ready, False on timeout
+        """
+        return self.live_data_ready.wait(timeout)
+
     def get_latest_bar(self, symbol):
         """
         Get latest completed bar for symbol
@@ -1178,7 +1369,7 @@ class DataPipeline:
         """
         with self.lock:
             bars = self.bars.get(symbol, [])
-            return copy.copy(bars[-1]) if bars else None
+            return bars[-1].snapshot() if bars else None
 
     def get_current_bar(self, symbol):
         """
@@ -1189,7 +1380,7 @@ class DataPipeline:
         """
         with self.lock:
             bar = self.current_bars.get(symbol)
-            return copy.copy(bar) if bar else None
+            return bar.snapshot() if bar else None
 
     def get_bars(self, symbol, count=100):
         """
@@ -1204,7 +1395,7 @@ class DataPipeline:
         """
         with self.lock:
             bars = self.bars.get(symbol, [])
-            return [copy.copy(b) for b in bars[-count:]] if bars else []
+            return [b.snapshot() for b in bars[-count:]] if bars else []
 
     def get_bars_for_symbol(self, symbol):
         """
@@ -1217,7 +1408,7 @@ class DataPipeline:
             List of defensive copies of BarData objects
         """
         with self.lock:
-            return [copy.copy(b) for b in self.bars.get(symbol, [])]
+            return [b.snapshot() for b in self.bars.get(symbol, [])]
     
     def get_all_latest_bars(self):
         """
@@ -1303,7 +1494,7 @@ class DataPipeline:
 
         # Normalize bar_time to minute boundary
         if bar_time.tzinfo is None:
-            bar_time = IST.localize(bar_time)
+            bar_time = bar_time.replace(tzinfo=IST)
         target_timestamp = bar_time.replace(second=0, microsecond=0)
 
         with self.lock:
@@ -1618,24 +1809,22 @@ class DataPipeline:
         # Use saved timestamps from before reconnect cleared them
         saved_timestamps = getattr(self, '_saved_bar_timestamps', {})
 
-        for symbol in self.subscribed_symbols:
-            try:
-                # Get last bar timestamp for this symbol (prefer saved pre-reconnect copy)
-                last_bar_time = saved_timestamps.get(symbol) or self.last_bar_timestamp.get(symbol)
+        # Get last bar timestamp for each symbol (prefer saved pre-reconnect copy)
+        last_bar_times = {}
+        for symbol in list(self.subscribed_symbols):
+            last_bar_time = saved_timestamps.get(symbol) or self.last_bar_timestamp.get(symbol)
+            if last_bar_time is None:
+                # No bars yet, fetch from market open
+                logger.debug(f"No previous bars for {symbol}, skipping backfill")
+                continue
+            last_bar_times[symbol] = last_bar_time
 
-                if last_bar_time is None:
-                    # No bars yet, fetch from market open
-                    logger.debug(f"No previous bars for {symbol}, skipping backfill")
-                    continue
-                
-                # Fetch history from last bar to now
-                df = self.client.history(
-                    symbol=symbol,
-                    exchange=EXCHANGE,
-                    interval='1m',
-                    start_date=start_date,
-                    end_date=end_date
-                )
+        # Fetch history from last bar to now
+        futures = self._submit_history_fetches(last_bar_times, start_date, end_date)
+
+        for symbol, last_bar_time in last_bar_times.items():
+            try:
+                df = futures[symbol].result()
                 
                 # Handle dictionary response
                 if isinstance(df, dict):
@@ -1644,13 +1833,13 @@ class DataPipeline:
                         continue
                     if not df.get('data'):
                         continue
-                    import pandas as pd
                     df = pd.DataFrame(df['data'])
 
                 if df is None or df.empty:
                     continue
                 
                 # Filter to bars after last_bar_time
+                df = _localize_history_index(df)
                 missed_bars = df[df.index > last_bar_time]
                 
                 if missed_bars.empty:
@@ -1684,14 +1873,8 @@ class DataPipeline:
                     # Build set of existing bar timestamps for dedup
                     existing_timestamps = {b.timestamp for b in self.bars[symbol]}
 
-                    for idx, row in missed_bars.iterrows():
-                        # Normalize timestamp to minute boundary for dedup check
-                        bar_time = idx
-                        if isinstance(bar_time, str):
-                            bar_time = datetime.fromisoformat(bar_time)
-                        if bar_time.tzinfo is None:
-                            bar_time = IST.localize(bar_time)
-                        bar_timestamp = bar_time.replace(second=0, microsecond=0)
+                    # Timestamps come back normalized to the minute boundary for the dedup check
+                    for bar_timestamp, open_, high, low, close, volume in _history_rows(missed_bars):
 
                         # Dedup: skip if bar already exists for this timestamp
                         if bar_timestamp in existing_timestamps:
@@ -1702,11 +1885,11 @@ class DataPipeline:
                             continue
 
                         bar = BarData(timestamp=bar_timestamp)
-                        bar.open = row.get('open', row.get('Open'))
-                        bar.high = row.get('high', row.get('High'))
-                        bar.low = row.get('low', row.get('Low'))
-                        bar.close = row.get('close', row.get('Close'))
-                        bar.volume = row.get('volume', row.get('Volume', 0))
+                        bar.open = open_
+                        bar.high = high
+                        bar.low = low
+                        bar.close = close
+                        bar.volume = volume
 
                         # Calculate cumulative session VWAP
                         typical_price = (bar.high + bar.low + bar.close) / 3
@@ -1907,6 +2090,8 @@ class DataPipeline:
 
     def disconnect(self):
         """Disconnect WebSocket and clean up"""
+        self.cancel_history_retry()
+
         # Stop connection monitor first
         if self.monitor_running:
             self.stop_connection_monitor()
@@ -17,7 +17,7 @@ Usage:
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import pytz
+from zoneinfo import ZoneInfo
 
 try:
     from .config import (
@@ -37,7 +37,7 @@ except ImportError:
     )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 
 class NotificationManager:
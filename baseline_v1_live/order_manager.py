@@ -18,7 +18,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from collections import deque
 import time
-import pytz
+from zoneinfo import ZoneInfo
 
 from openalgo import api
 
@@ -44,7 +44,7 @@ from .config import (
 )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 
 class OrderChurnDetector:
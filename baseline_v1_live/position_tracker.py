@@ -22,7 +22,7 @@ R Calculation:
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 from openalgo import api
 from .config import (
@@ -44,7 +44,7 @@ except ImportError:
     TELEGRAM_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 
 class Position:
@@ -340,9 +340,11 @@ class PositionTracker:
         Args:
             prices: {symbol: current_price}
         """
-        for symbol, price in prices.items():
-            if symbol in self.open_positions:
-                self.open_positions[symbol].update_price(price)
+        # Walk the (few) open positions, not every subscribed symbol
+        for symbol, position in self.open_positions.items():
+            price = prices.get(symbol)
+            if price is not None:
+                position.update_price(price)
     
     def close_position(
         self,
@@ -516,6 +518,10 @@ class PositionTracker:
     def get_all_positions(self) -> List[Dict]:
         """Get all positions as dicts"""
         return [pos.to_dict() for pos in list(self.open_positions.values()) + self.closed_positions]
+
+    def get_open_positions(self) -> List[Dict]:
+        """Get open positions as dicts (skips serializing the day's closed positions)"""
+        return [pos.to_dict() for pos in list(self.open_positions.values())]
     
     def reconcile_with_broker(self) -> list:
         """
@@ -24,7 +24,7 @@ import time
 import requests
 from typing import Tuple, Optional
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 try:
     from .config import (
@@ -44,7 +44,7 @@ except ImportError:
     )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 
 class StartupHealthCheck:
@@ -22,18 +22,69 @@ This allows the strategy to resume from where it left off if it crashes.
 import logging
 import sqlite3
 import json
+import time
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional
 from functools import wraps
-import pytz
+from zoneinfo import ZoneInfo
 
 try:
-    from .config import STATE_DB_PATH, TRADES_LOG_CSV, DAILY_SUMMARY_CSV
+    from .config import (
+        STATE_DB_PATH, TRADES_LOG_CSV, DAILY_SUMMARY_CSV,
+        SWING_LOG_FLUSH_SIZE, SWING_LOG_FLUSH_INTERVAL,
+    )
 except ModuleNotFoundError:
-    from config import STATE_DB_PATH, TRADES_LOG_CSV, DAILY_SUMMARY_CSV
+    from config import (
+        STATE_DB_PATH, TRADES_LOG_CSV, DAILY_SUMMARY_CSV,
+        SWING_LOG_FLUSH_SIZE, SWING_LOG_FLUSH_INTERVAL,
+    )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
+
+# Statements issued on every tick/swing. Reusing the exact same SQL text lets
+# sqlite3's per-connection statement cache skip re-parsing and re-planning.
+SQL_INSERT_SWING = '''
+    INSERT OR IGNORE INTO all_swings_log
+    (symbol, swing_type, swing_price, swing_time, vwap, bar_index, detected_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_UPSERT_BAR = '''
+    INSERT OR REPLACE INTO bars
+    (symbol, timestamp, open, high, low, close, vwap, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+# Range predicate on the (symbol, timestamp) primary key - ISO timestamps sort
+# chronologically, so anything before today's 'YYYY-MM-DD' prefix is an older day
+SQL_PRUNE_OLD_BARS = 'DELETE FROM bars WHERE symbol = ? AND timestamp < ?'
+
+
+def batch_savepoint(func):
+    """
+    Decorator giving each write its own SAVEPOINT inside tick_batch()
+
+    Callers catch and log write errors without leaving the batch, so a write
+    that fails partway (e.g. mid-executemany) is rolled back on its own
+    instead of committing its partial rows with the rest of the batch.
+    Outside a batch the write runs unchanged.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self._batch_depth:
+            return func(self, *args, **kwargs)
+
+        self.conn.execute('SAVEPOINT batch_write')
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException:
+            self.conn.execute('ROLLBACK TO batch_write')
+            self.conn.execute('RELEASE batch_write')
+            raise
+        self.conn.execute('RELEASE batch_write')
+        return result
+
+    return wrapper
 
 
 def atomic_transaction(func):
@@ -43,8 +94,14 @@ def atomic_transaction(func):
     Ensures all-or-nothing writes with automatic rollback on error.
     Critical for position+order saves where consistency is essential.
     """
+    savepoint_func = batch_savepoint(func)
+
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        # Inside tick_batch() the outer transaction commits or rolls back
+        if self._batch_depth:
+            return savepoint_func(self, *args, **kwargs)
+
         try:
             # Explicit BEGIN for immediate write lock
             self.conn.execute("BEGIN IMMEDIATE")
@@ -94,12 +151,22 @@ class StateManager:
     def __init__(self, db_path: str = STATE_DB_PATH):
         self.db_path = db_path
         self.conn = None
+        # Live swing detections waiting for flush_swing_log() (group commit)
+        self._swing_buffer: List[tuple] = []
+        self._swing_buffer_since = 0.0
+        # >0 while inside tick_batch(): per-call commits are deferred to the batch
+        self._batch_depth = 0
+        # Leading _swing_buffer rows written inside the open batch; they are
+        # dropped from the buffer only once the batch commits
+        self._swing_written = 0
+        # Trade CSV rows logged inside the open batch; appended once it commits
+        self._pending_trade_csv: List[tuple] = []
         self._init_database()
         logger.info(f"StateManager initialized with DB: {db_path}")
     
     def _init_database(self):
         """Initialize database schema with WAL mode for production safety"""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
         self.conn.row_factory = sqlite3.Row
         
         # 🔴 PHASE 1: Enable WAL mode for concurrent reads/writes
@@ -108,6 +175,12 @@ class StateManager:
         
         # Increase busy timeout to 5 seconds (handle concurrent access)
         self.conn.execute("PRAGMA busy_timeout=5000;")
+
+        # In WAL mode NORMAL only fsyncs at checkpoints: commits stay atomic and
+        # survive a process crash; only an OS crash/power loss can drop the last txns
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        self.conn.execute("PRAGMA wal_autocheckpoint=1000;")
+        self.conn.execute("PRAGMA temp_store=MEMORY;")
         
         # Set IMMEDIATE isolation for writes (acquire write lock immediately)
         self.conn.isolation_level = 'IMMEDIATE'
@@ -646,6 +719,7 @@ class StateManager:
         logger.info(f"Loaded {len(pending_limit)} limit and {len(active_sl)} SL orders from DB")
         return pending_limit, active_sl
 
+    @batch_savepoint
     def log_trade(self, position_dict: Dict):
         """Log completed trade to database and CSV"""
         if not position_dict['is_closed']:
@@ -692,10 +766,14 @@ class StateManager:
             duration_minutes
         ))
         
-        self.conn.commit()
+        self._commit()
         
-        # Also append to CSV
-        self._append_trade_to_csv(position_dict, duration_minutes)
+        # Also append to CSV - inside tick_batch() only after the batch commits,
+        # so a rolled-back trade is not left in the CSV (and re-appended next save)
+        if self._batch_depth:
+            self._pending_trade_csv.append((position_dict, duration_minutes))
+        else:
+            self._append_trade_to_csv(position_dict, duration_minutes)
     
     def _append_trade_to_csv(self, position_dict: Dict, duration_minutes: float):
         """Append trade to CSV log file"""
@@ -780,6 +858,56 @@ class StateManager:
         
         logger.info(f"Cleaned up data older than {days_to_keep} days")
     
+    @contextmanager
+    def tick_batch(self):
+        """
+        Group the per-tick dashboard writes into one transaction
+
+        save_swing_candidates / save_best_strikes / save_latest_bars /
+        log_order_trigger / log_trade / flush_swing_log and the
+        @atomic_transaction writers called inside the block skip their own
+        commit; the block commits once on exit (one WAL sync per tick)
+        or rolls back if it raises. Each of those writes runs in its own
+        SAVEPOINT, so one that raises (and is caught by the caller) leaves
+        no partial rows behind. Swing rows flushed inside the block stay
+        buffered until the commit succeeds, and trades logged inside it are
+        appended to the trade CSV only after that commit.
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            return
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._batch_depth = 1
+        try:
+            yield
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            self._swing_written = 0  # Rolled back - keep the rows for the next flush
+            self._pending_trade_csv.clear()  # Trades were rolled back too
+            raise
+        finally:
+            self._batch_depth = 0
+
+        # Swing rows flushed inside the batch are durable only now
+        del self._swing_buffer[:self._swing_written]
+        self._swing_written = 0
+
+        pending, self._pending_trade_csv = self._pending_trade_csv, []
+        for position_dict, duration_minutes in pending:
+            self._append_trade_to_csv(position_dict, duration_minutes)
+
+    def _commit(self):
+        """Commit unless a tick_batch() will commit for us"""
+        if not self._batch_depth:
+            self.conn.commit()
+
+    @batch_savepoint
     def save_swing_candidates(self, candidates: Dict):
         """Save current swing candidates (for dashboard)"""
         cursor = self.conn.cursor()
@@ -807,7 +935,7 @@ class StateManager:
                 1  # active
             ))
         
-        self.conn.commit()
+        self._commit()
     
     def log_swing_detection(self, symbol: str, swing_type: str, swing_price: float,
                            swing_time: datetime, vwap: float, bar_index: int):
@@ -816,14 +944,14 @@ class StateManager:
         
         This logs every swing (HIGH and LOW) as it's detected, even if it gets
         replaced later. Used for verifying the watch-based detection logic.
+
+        Rows are buffered and written in one transaction once
+        SWING_LOG_FLUSH_SIZE are queued or the oldest is SWING_LOG_FLUSH_INTERVAL
+        seconds old. The trading loop also calls flush_swing_log() every tick.
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO all_swings_log
-            (symbol, swing_type, swing_price, swing_time, vwap, bar_index, detected_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        if not self._swing_buffer:
+            self._swing_buffer_since = time.monotonic()
+        self._swing_buffer.append((
             symbol,
             swing_type,  # 'Low' or 'High'
             swing_price,
@@ -832,10 +960,83 @@ class StateManager:
             bar_index,
             datetime.now(IST).isoformat()
         ))
-        
-        self.conn.commit()
-        logger.debug(f"Logged swing detection: {symbol} {swing_type} @ {swing_price:.2f}")
-    
+        logger.debug("Queued swing detection: %s %s @ %.2f", symbol, swing_type, swing_price)
+
+        if (len(self._swing_buffer) >= SWING_LOG_FLUSH_SIZE or
+                time.monotonic() - self._swing_buffer_since >= SWING_LOG_FLUSH_INTERVAL):
+            self.flush_swing_log()
+
+    def flush_swing_log(self) -> int:
+        """
+        Write buffered live swing detections with one executemany()
+
+        Returns:
+            Number of buffered rows written (duplicates are ignored by SQLite)
+        """
+        rows = self._swing_buffer[self._swing_written:]
+        if not rows:
+            return 0
+        self._write_swing_rows(rows)
+
+        # Rows leave the buffer only once committed, so a failed flush (or a
+        # rolled-back tick_batch) keeps them for the next attempt
+        if self._batch_depth:
+            self._swing_written += len(rows)
+        else:
+            del self._swing_buffer[:len(rows)]
+        return len(rows)
+
+    @atomic_transaction
+    def _write_swing_rows(self, rows: List[tuple]):
+        self.conn.executemany(SQL_INSERT_SWING, rows)
+
+    def log_swing_detections_bulk(self, events_by_symbol: Dict[str, List[Dict]]) -> int:
+        """
+        Log historical swing events for many symbols in one transaction
+
+        events_by_symbol maps symbol -> list of swing_event_log entries
+        (dicts with type, price, timestamp, vwap, index). Rows go through a
+        single executemany() of INSERT OR IGNORE, so the
+        UNIQUE(symbol, swing_time, swing_type) constraint drops swings that
+        are already logged.
+
+        Returns:
+            Number of new rows inserted
+        """
+        # Buffered live rows are written first so they win over backfill duplicates
+        self.flush_swing_log()
+        return self._insert_swing_events(events_by_symbol)
+
+    @atomic_transaction
+    def _insert_swing_events(self, events_by_symbol: Dict[str, List[Dict]]) -> int:
+        detected_at = datetime.now(IST).isoformat()
+        rows = [
+            (
+                symbol,
+                event['type'],
+                event['price'],
+                event['timestamp'].isoformat() if hasattr(event['timestamp'], 'isoformat') else str(event['timestamp']),
+                event['vwap'],
+                event['index'],
+                detected_at
+            )
+            for symbol, events in events_by_symbol.items()
+            for event in events
+        ]
+        if not rows:
+            return 0
+
+        changes_before = self.conn.total_changes
+        self.conn.executemany(SQL_INSERT_SWING, rows)
+        inserted = self.conn.total_changes - changes_before
+
+        logger.debug(
+            "Bulk logged %d swing detections (%d already present) across %d symbols",
+            inserted, len(rows) - inserted, len(events_by_symbol)
+        )
+        return inserted
+
+    @batch_savepoint
     def save_best_strikes(self, best_ce: Optional[Dict], best_pe: Optional[Dict]):
         """Save best CE/PE strikes (for dashboard)"""
         cursor = self.conn.cursor()
@@ -895,8 +1096,9 @@ class StateManager:
                 swing_timestamp_str
             ))
         
-        self.conn.commit()
+        self._commit()
     
+    @batch_savepoint
     def log_order_trigger(self, option_type: str, action: str, symbol: str, 
                          current_price: float, swing_low: float, reason: str):
         """Log order trigger action (for dashboard)"""
@@ -914,7 +1116,7 @@ class StateManager:
             reason
         ))
         
-        self.conn.commit()
+        self._commit()
     
     def log_swing_break(self, symbol: str, swing_low: float, break_price: float,
                        vwap_premium: float, sl_percent: float, passed_filters: bool):
@@ -935,16 +1137,13 @@ class StateManager:
         
         self.conn.commit()
     
+    @batch_savepoint
     def save_latest_bars(self, bars_dict: Dict):
         """Save latest bar data for each symbol (keep all bars from today's session)"""
         cursor = self.conn.cursor()
 
-        for symbol, bar in bars_dict.items():
-            cursor.execute('''
-                INSERT OR REPLACE INTO bars
-                (symbol, timestamp, open, high, low, close, vwap, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        cursor.executemany(SQL_UPSERT_BAR, [
+            (
                 symbol,
                 bar['timestamp'],
                 bar['open'],
@@ -953,19 +1152,41 @@ class StateManager:
                 bar['close'],
                 bar.get('vwap'),
                 bar['volume']
-            ))
+            )
+            for symbol, bar in bars_dict.items()
+        ])
 
-            # Keep all bars from today only (auto-cleanup handled at market close)
-            # Full session has ~375 bars (9:15 AM - 3:30 PM)
-            # No need to prune during the day - dashboard needs full session data
-            cursor.execute('''
-                DELETE FROM bars
-                WHERE symbol = ?
-                AND DATE(timestamp) < DATE('now', 'localtime')
-            ''', (symbol,))
+        # Keep all bars from today only (auto-cleanup handled at market close)
+        # Full session has ~375 bars (9:15 AM - 3:30 PM)
+        # No need to prune during the day - dashboard needs full session data
+        today = datetime.now(IST).date().isoformat()
+        cursor.executemany(SQL_PRUNE_OLD_BARS, [(symbol, today) for symbol in bars_dict])
+
+        self._commit()
+
+    @atomic_transaction
+    def save_bars_bulk(self, rows: List[tuple]) -> int:
+        """
+        Save many bars in one transaction (startup historical backfill)
+
+        Args:
+            rows: (symbol, timestamp_iso, open, high, low, close, vwap, volume) tuples
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        cursor = self.conn.cursor()
+        cursor.executemany(SQL_UPSERT_BAR, rows)
+
+        # Same cleanup as save_latest_bars(), once per symbol in the batch
+        today = datetime.now(IST).date().isoformat()
+        cursor.executemany(SQL_PRUNE_OLD_BARS, [(symbol, today) for symbol in {row[0] for row in rows}])
+
+        return len(rows)
 
-        self.conn.commit()
-    
     def save_filter_rejections(self, rejections: List[Dict]):
         """Save filter rejection details for historical analysis"""
         if not rejections:
@@ -1129,6 +1350,10 @@ class StateManager:
     def close(self):
         """Close database connection"""
         if self.conn:
+            try:
+                self.flush_swing_log()
+            except Exception as e:
+                logger.error(f"Failed to flush swing log on close: {e}")
             self.conn.close()
             logger.info("Database connection closed")
 
@@ -19,7 +19,7 @@ import logging
 from collections import defaultdict
 from datetime import datetime, time
 import pandas as pd
-import pytz
+from zoneinfo import ZoneInfo
 
 try:
     from .config import MARKET_START_TIME
@@ -27,7 +27,7 @@ except ModuleNotFoundError:
     from config import MARKET_START_TIME
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
 
 
 class SwingDetector:
@@ -50,6 +50,7 @@ class SwingDetector:
 
         # Historical bars (list of bar dicts with OHLCV)
         self.bars = []
+        self.last_bar_ts = None  # Timestamp of self.bars[-1] (None when empty)
 
         # Swing state
         self.swings = []  # List of {type: 'Low'/'High', price, timestamp, index, vwap, high, low}
@@ -79,6 +80,7 @@ class SwingDetector:
     def reset_for_new_day(self, date):
         """Reset swing state for new trading day"""
         self.bars = []
+        self.last_bar_ts = None
         self.swings = []
         self.last_swing = None
         self.last_swing_type = None
@@ -125,8 +127,8 @@ class SwingDetector:
             self.reset_for_new_day(bar_date)
 
         # CRITICAL: Validate bars arrive in chronological order
-        if self.bars:
-            last_bar_time = self.bars[-1]['timestamp']
+        last_bar_time = self.last_bar_ts
+        if last_bar_time is not None:
             current_bar_time = bar_dict['timestamp']
 
             if current_bar_time < last_bar_time:
@@ -148,6 +150,7 @@ class SwingDetector:
         current_index = len(self.bars)
         bar_dict['index'] = current_index
         self.bars.append(bar_dict)
+        self.last_bar_ts = bar_dict['timestamp']
 
         # Need at least 2 bars to start
         if len(self.bars) < 2:
@@ -611,6 +614,53 @@ class MultiSwingDetector:
 
         return break_info
 
+    def replay_bars(self, symbol, bars):
+        """
+        Feed a symbol's historical bars through its detector (startup replay)
+
+        Same per-bar behaviour as update(), but the detector, callback and
+        option type are resolved once per symbol instead of once per bar, and
+        bar objects (BarData) are read by attribute directly.
+
+        Args:
+            symbol: Option symbol
+            bars: List of BarData-like objects in chronological order
+
+        Returns:
+            Number of bars processed
+        """
+        if symbol not in self.detectors:
+            self.add_symbols([symbol])
+
+        detector = self.detectors[symbol]
+        detector._state_manager = self.state_manager
+
+        add_bar = detector.add_bar
+        check_break = detector.check_break
+        on_swing_detected = self.on_swing_detected
+        option_type = 'CE' if 'CE' in symbol else 'PE'
+
+        for bar in bars:
+            # Detector keeps (and annotates) the dict, so one is still needed per bar
+            bar_dict = {
+                'timestamp': bar.timestamp,
+                'open': bar.open,
+                'high': bar.high,
+                'low': bar.low,
+                'close': bar.close,
+                'volume': bar.volume,
+                'vwap': bar.vwap
+            }
+            swing_info = add_bar(bar_dict)
+
+            if swing_info and on_swing_detected:
+                swing_info['option_type'] = option_type
+                on_swing_detected(symbol, swing_info)
+
+            check_break(bar_dict)
+
+        return len(bars)
+
     def update_all(self, bars_dict):
         """
         Update all detectors with new bars
@@ -18,11 +18,13 @@ Setup:
 """
 
 import logging
+import queue
 import requests
 import threading
+import time
 from typing import Optional, Dict
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 import os
 import sys
 
@@ -35,6 +37,9 @@ try:
         TELEGRAM_ENABLED,
         TELEGRAM_BOT_TOKEN,
         TELEGRAM_CHAT_ID,
+        TELEGRAM_DEDUP_WINDOW,
+        TELEGRAM_BATCH_WINDOW,
+        TELEGRAM_MAX_MESSAGE_LENGTH,
         NOTIFY_ON_TRADE_ENTRY,
         NOTIFY_ON_TRADE_EXIT,
         NOTIFY_ON_DAILY_TARGET,
@@ -46,6 +51,9 @@ except ImportError:
         TELEGRAM_ENABLED,
         TELEGRAM_BOT_TOKEN,
         TELEGRAM_CHAT_ID,
+        TELEGRAM_DEDUP_WINDOW,
+        TELEGRAM_BATCH_WINDOW,
+        TELEGRAM_MAX_MESSAGE_LENGTH,
         NOTIFY_ON_TRADE_ENTRY,
         NOTIFY_ON_TRADE_EXIT,
         NOTIFY_ON_DAILY_TARGET,
@@ -54,7 +62,10 @@ except ImportError:
     )
 
 logger = logging.getLogger(__name__)
-IST = pytz.timezone('Asia/Kolkata')
+IST = ZoneInfo('Asia/Kolkata')
+
+# Separator between messages merged into one Telegram post
+BATCH_SEPARATOR = "\n---\n"
 
 
 class TelegramNotifier:
@@ -71,6 +82,15 @@ class TelegramNotifier:
         # Defaults to INSTANCE_NAME env var, or "UNKNOWN" if not set
         self.instance_name = instance_name or os.getenv("INSTANCE_NAME", "UNKNOWN")
 
+        # Single background sender: callers only enqueue, the worker posts serially
+        # (keeps message order, respects Telegram rate limits, reuses one connection)
+        self._send_queue = queue.Queue()
+        self._send_thread = None
+        self._send_lock = threading.Lock()
+        self._http = requests.Session()
+        # {tagged_message: monotonic time queued} - coalesces repeats (watchdog/recovery bursts)
+        self._recent_messages = {}
+
         if self.enabled:
             if not self.bot_token or not self.chat_id:
                 logger.warning("Telegram enabled but token/chat_id not configured")
@@ -80,13 +100,15 @@ class TelegramNotifier:
                 # Startup message disabled to prevent spam
                 # self.send_message("Baseline V1 Live Trading started", parse_mode=None)
     
-    def send_message(self, message: str, parse_mode: Optional[str] = 'HTML') -> bool:
+    def send_message(self, message: str, parse_mode: Optional[str] = 'HTML',
+                     flush_now: bool = False) -> bool:
         """
         Send message to Telegram
 
         Args:
             message: Message text (supports HTML formatting if parse_mode='HTML')
             parse_mode: 'HTML', 'Markdown', or None for plain text
+            flush_now: Post without waiting out TELEGRAM_BATCH_WINDOW (critical alerts)
 
         Returns:
             True if sent successfully
@@ -99,6 +121,10 @@ class TelegramNotifier:
         instance_tag = f"[{self.instance_name}] " if self.instance_name != "UNKNOWN" else ""
         tagged_message = f"{instance_tag}{message}"
 
+        if self._is_duplicate(tagged_message):
+            logger.debug("Telegram duplicate suppressed (within %ss window)", TELEGRAM_DEDUP_WINDOW)
+            return True
+
         url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
 
         payload = {
@@ -110,19 +136,107 @@ class TelegramNotifier:
         if parse_mode:
             payload['parse_mode'] = parse_mode
         
-        def _do_send():
-            try:
-                response = requests.post(url, json=payload, timeout=10)
-                if response.status_code == 200:
-                    logger.debug("Telegram message sent successfully")
-                else:
-                    logger.error(f"Telegram API error: {response.status_code} - {response.text}")
-            except Exception as e:
-                logger.error(f"Failed to send Telegram message: {e}")
-
-        thread = threading.Thread(target=_do_send, daemon=True)
-        thread.start()
+        self._ensure_sender()
+        self._send_queue.put_nowait((url, payload, flush_now))
         return True  # Optimistically return True (fire-and-forget)
+
+    def _is_duplicate(self, tagged_message: str) -> bool:
+        """True if the same text was queued within TELEGRAM_DEDUP_WINDOW; records it otherwise"""
+        now = time.monotonic()
+        with self._send_lock:
+            last_queued = self._recent_messages.get(tagged_message)
+            if last_queued is not None and now - last_queued < TELEGRAM_DEDUP_WINDOW:
+                return True
+            # Drop expired entries so the map only holds the current window
+            if len(self._recent_messages) > 64:
+                self._recent_messages = {
+                    msg: ts for msg, ts in self._recent_messages.items()
+                    if now - ts < TELEGRAM_DEDUP_WINDOW
+                }
+            self._recent_messages[tagged_message] = now
+            return False
+
+    def _ensure_sender(self):
+        """Start the background sender thread on first use"""
+        if self._send_thread is not None and self._send_thread.is_alive():
+            return
+        with self._send_lock:
+            if self._send_thread is None or not self._send_thread.is_alive():
+                self._send_thread = threading.Thread(
+                    target=self._send_loop, daemon=True, name="telegram-send"
+                )
+                self._send_thread.start()
+
+    def _send_loop(self):
+        """
+        Drain the send queue, merging bursts into as few posts as possible
+
+        After taking a message the worker waits up to TELEGRAM_BATCH_WINDOW for
+        more, then posts them joined by BATCH_SEPARATOR (same parse_mode only,
+        capped at TELEGRAM_MAX_MESSAGE_LENGTH). A flush_now message ends the
+        wait immediately. If Telegram rejects a merged post (e.g. one message
+        breaks the HTML), its messages are re-posted one at a time so a single
+        bad message cannot drop the whole burst. Order is preserved.
+        """
+        carry = None
+        while True:
+            item = carry if carry is not None else self._send_queue.get()
+            carry = None
+            if isinstance(item, threading.Event):
+                item.set()  # flush() marker: everything queued before it is sent
+                continue
+
+            url, payload, urgent = item
+            payloads = [payload]
+            length = len(payload['text'])
+            deadline = time.monotonic() + TELEGRAM_BATCH_WINDOW
+            while not urgent:
+                try:
+                    nxt = self._send_queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if (isinstance(nxt, threading.Event) or
+                        nxt[1].get('parse_mode') != payload.get('parse_mode') or
+                        length + len(BATCH_SEPARATOR) + len(nxt[1]['text']) > TELEGRAM_MAX_MESSAGE_LENGTH):
+                    carry = nxt  # handled on the next pass, after this batch is posted
+                    break
+                payloads.append(nxt[1])
+                length += len(BATCH_SEPARATOR) + len(nxt[1]['text'])
+                urgent = nxt[2]
+
+            if len(payloads) == 1:
+                self._post(url, payload)
+                continue
+            merged = dict(payload, text=BATCH_SEPARATOR.join(p['text'] for p in payloads))
+            if not self._post(url, merged):
+                logger.warning(f"Telegram rejected a batch of {len(payloads)} messages, re-sending individually")
+                for single in payloads:
+                    self._post(url, single)
+
+    def _post(self, url: str, payload: Dict) -> bool:
+        """POST one sendMessage request (errors are logged, never raised)"""
+        try:
+            response = self._http.post(url, json=payload, timeout=10)
+            if response.status_code == 200:
+                logger.debug("Telegram message sent successfully")
+                return True
+            logger.error(f"Telegram API error: {response.status_code} - {response.text}")
+        except Exception as e:
+            logger.error(f"Failed to send Telegram message: {e}")
+        return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until messages queued so far have been sent (or timeout)
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        if self._send_thread is None or not self._send_thread.is_alive():
+            return self._send_queue.empty()
+        done = threading.Event()
+        self._send_queue.put_nowait(done)
+        return done.wait(timeout)
     
     def notify_trade_entry(self, fill_info: Dict):
         """
@@ -311,7 +425,7 @@ Time: {datetime.now(IST).strftime('%H:%M:%S')}
 Please check logs.
         """
         
-        self.send_message(message.strip())
+        self.send_message(message.strip(), flush_now=True)
     
     def notify_position_update(self, summary: Dict):
         """
@@ -0,0 +1,34 @@
+"""
+Shared test setup.
+
+baseline_v1_live.py and container_monitor.py attach a logging.FileHandler under
+baseline_v1_live/logs/ when imported. Import them here first, with the handler
+pointed at a temporary directory, so test runs never write log files into the repo.
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_LOG_DIR = tempfile.mkdtemp(prefix='baseline_v1_live_test_logs_')
+_FileHandler = logging.FileHandler
+
+
+def _temp_file_handler(filename, *args, **kwargs):
+    return _FileHandler(os.path.join(_LOG_DIR, os.path.basename(filename)), *args, **kwargs)
+
+
+with patch('logging.FileHandler', _temp_file_handler):
+    import baseline_v1_live.baseline_v1_live  # noqa: F401,E402
+    import baseline_v1_live.container_monitor  # noqa: F401,E402
+
+
+def pytest_unconfigure(config):
+    logging.shutdown()
+    shutil.rmtree(_LOG_DIR, ignore_errors=True)
@@ -0,0 +1,280 @@
+"""
+Tests for AutoDetector (ATM strike + expiry auto-detection).
+
+Covers:
+- Persistent HTTP session reuse for OpenAlgo calls
+- Concurrent spot/expiry fetch in the detection path
+- API-fallback warning only when the fallback will actually run
+- ATM strike rounding
+- Nearest-expiry selection
+- Expiry list TTL cache with fallback on API failure
+- Wait-mode retry loop (fast first retry, backoff, give-up)
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytz
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline_v1_live.auto_detector import AutoDetector
+
+
+def _response(payload):
+    """Build a mock requests.Response returning the given JSON payload."""
+    response = MagicMock()
+    response.content = json.dumps(payload).encode()
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestHTTPSession:
+    """Both OpenAlgo endpoints go through one pooled requests.Session."""
+
+    def setup_method(self):
+        self.detector = AutoDetector(api_key='test-key', host='http://openalgo:5000/')
+
+    def test_auth_header_set_on_session(self):
+        headers = self.detector._session.headers
+        assert headers['Authorization'] == 'Bearer test-key'
+        assert headers['Content-Type'] == 'application/json'
+
+    def test_spot_and_expiry_share_session(self):
+        self.detector._session.post = MagicMock(side_effect=[
+            _response({'status': 'success', 'data': {'ltp': 24248.75}}),
+            _response({'status': 'success', 'data': ['10-JUL-25']}),
+        ])
+
+        assert self.detector.fetch_spot_price() == 24248.75
+        assert self.detector.fetch_expiries() == ['10-JUL-25']
+
+        urls = [c.args[0] for c in self.detector._session.post.call_args_list]
+        assert urls == [
+            'http://openalgo:5000/api/v1/quotes',
+            'http://openalgo:5000/api/v1/expiry',
+        ]
+
+    def test_api_error_raises(self):
+        self.detector._session.post = MagicMock(
+            return_value=_response({'status': 'error', 'message': 'not logged in'})
+        )
+        with pytest.raises(Exception, match='not logged in'):
+            self.detector.fetch_spot_price()
+
+    def test_close_closes_session(self):
+        self.detector._session.close = MagicMock()
+        self.detector.close()
+        self.detector._session.close.assert_called_once()
+
+
+class TestDetectionFlow:
+    """auto_detect() end-to-end with the OpenAlgo calls mocked out."""
+
+    def setup_method(self):
+        self.detector = AutoDetector(api_key='test-key', host='http://openalgo:5000')
+        tomorrow = datetime.now(pytz.timezone('Asia/Kolkata')) + timedelta(days=1)
+        self.expiry = tomorrow.strftime('%d-%b-%y').upper()
+        self.detector.fetch_spot_price = MagicMock(return_value=24248.75)
+        self.detector.fetch_expiries = MagicMock(return_value=[self.expiry])
+
+    def test_auto_detect_returns_atm_and_expiry(self):
+        atm, expiry = self.detector.auto_detect()
+        assert atm == 24200
+        assert expiry == self.expiry.replace('-', '')
+
+    def test_spot_and_expiries_fetched_together(self):
+        spot, expiries = self.detector._fetch_spot_and_expiries()
+        assert spot == 24248.75
+        assert expiries == [self.expiry]
+        self.detector.fetch_spot_price.assert_called_once()
+        self.detector.fetch_expiries.assert_called_once()
+
+    def test_websocket_spot_skips_api(self):
+        self.detector.data_pipeline = MagicMock()
+        self.detector.data_pipeline.get_spot_price.return_value = 24310.0
+        spot, _ = self.detector._fetch_spot_and_expiries()
+        assert spot == 24310.0
+        self.detector.fetch_spot_price.assert_not_called()
+
+
+    def test_missing_websocket_ltp_falls_back_to_api(self, caplog):
+        self.detector.data_pipeline = MagicMock()
+        self.detector.data_pipeline.get_spot_price.return_value = None
+        assert self.detector._fetch_spot(api_fallback=True) == 24248.75
+        self.detector.fetch_spot_price.assert_called_once()
+        assert 'will try API fallback' in caplog.text
+
+    def test_wait_mode_does_not_announce_api_fallback(self, caplog):
+        self.detector.data_pipeline = MagicMock()
+        self.detector.data_pipeline.get_spot_price.return_value = None
+        with pytest.raises(Exception, match='WebSocket LTP not available'):
+            self.detector._fetch_spot(api_fallback=False)
+        self.detector.fetch_spot_price.assert_not_called()
+        assert 'API fallback' not in caplog.text
+
+
+class TestCalculateATMStrike:
+    """calculate_atm_strike() rounds to the nearest 100, ties upward."""
+
+    def setup_method(self):
+        self.detector = AutoDetector(api_key='test-key', host='http://openalgo:5000')
+
+    def test_rounding(self):
+        assert self.detector.calculate_atm_strike(24248.75) == 24200
+        assert self.detector.calculate_atm_strike(24275) == 24300
+        assert self.detector.calculate_atm_strike(24300.0) == 24300
+
+    def test_tie_rounds_up(self):
+        assert self.detector.calculate_atm_strike(24250) == 24300
+        assert self.detector.calculate_atm_strike(24150.0) == 24200
+
+    def test_returns_int(self):
+        assert isinstance(self.detector.calculate_atm_strike(24248.75), int)
+
+
+class TestFindNearestExpiry:
+    """find_nearest_expiry() picks the earliest non-past expiry."""
+
+    def setup_method(self):
+        self.detector = AutoDetector(api_key='test-key', host='http://openalgo:5000')
+        self.today = datetime.now(pytz.timezone('Asia/Kolkata')).date()
+
+    def _fmt(self, days):
+        return (self.today + timedelta(days=days)).strftime('%d-%b-%y').upper()
+
+    def test_unsorted_input(self):
+        expiries = [self._fmt(14), self._fmt(-7), self._fmt(7), self._fmt(0)]
+        assert self.detector.find_nearest_expiry(expiries) == self._fmt(0)
+
+    def test_skips_unparseable(self):
+        expiries = ['garbage', self._fmt(3)]
+        assert self.detector.find_nearest_expiry(expiries) == self._fmt(3)
+
+    def test_parse_matches_strptime(self):
+        from baseline_v1_live.auto_detector import _parse_expiry
+        for exp_str in ['17-JUL-25', '03-feb-26', '1-DEC-25']:
+            assert _parse_expiry(exp_str) == datetime.strptime(exp_str, '%d-%b-%y').date()
+        assert _parse_expiry('31-FEB-26') is None
+        assert _parse_expiry('2025-07-17') is None
+
+    def test_index_reused_for_same_list(self):
+        expiries = [self._fmt(7), self._fmt(1)]
+        self.detector.find_nearest_expiry(expiries)
+        index = self.detector._expiry_index
+        assert self.detector.find_nearest_expiry(list(expiries)) == self._fmt(1)
+        assert self.detector._expiry_index is index
+
+        # A different list rebuilds the index
+        assert self.detector.find_nearest_expiry([self._fmt(2)]) == self._fmt(2)
+        assert self.detector._expiry_index is not index
+
+    def test_no_future_expiry_raises(self):
+        with pytest.raises(Exception, match='No future expiries'):
+            self.detector.find_nearest_expiry([self._fmt(-1), self._fmt(-8)])
+
+
+class TestExpiryCache:
+    """fetch_expiries() caches the expiry list and falls back to it on failure."""
+
+    def setup_method(self):
+        self.detector = AutoDetector(api_key='test-key', host='http://openalgo:5000')
+        self.detector._fetch_expiries_from_api = MagicMock(return_value=['10-JUL-25'])
+
+    def test_second_call_served_from_cache(self):
+        assert self.detector.fetch_expiries() == ['10-JUL-25']
+        assert self.detector.fetch_expiries() == ['10-JUL-25']
+        self.detector._fetch_expiries_from_api.assert_called_once()
+
+    def test_expired_cache_refetches(self):
+        self.detector.fetch_expiries()
+        self.detector._expiries_cache_ts -= self.detector.expiries_cache_ttl + 1
+        self.detector.fetch_expiries()
+        assert self.detector._fetch_expiries_from_api.call_count == 2
+
+    def test_stale_cache_used_when_api_fails(self):
+        self.detector.fetch_expiries()
+        self.detector._expiries_cache_ts -= self.detector.expiries_cache_ttl + 1
+        self.detector._fetch_expiries_from_api.side_effect = Exception('down')
+        assert self.detector.fetch_expiries() == ['10-JUL-25']
+
+    def test_api_failure_without_cache_raises(self):
+        self.detector._fetch_expiries_from_api.side_effect = Exception('down')
+        with pytest.raises(Exception, match='down'):
+            self.detector.fetch_expiries()
+
+
+class TestWaitForBrokerConnection:
+    """_wait_for_broker_connection() retry cadence."""
+
+    def setup_method(self):
+        self.detector = AutoDetector(api_key='test-key', host='http://openalgo:5000')
+        tomorrow = datetime.now(pytz.timezone('Asia/Kolkata')) + timedelta(days=1)
+        self.expiry = tomorrow.strftime('%d-%b-%y').upper()
+        self.detector.fetch_expiries = MagicMock(return_value=[self.expiry])
+
+    @patch('baseline_v1_live.auto_detector.time_module.sleep')
+    def test_first_retry_does_not_sleep(self, mock_sleep):
+        self.detector.fetch_spot_price = MagicMock(return_value=24248.75)
+        atm, _ = self.detector._wait_for_broker_connection()
+        assert atm == 24200
+        mock_sleep.assert_not_called()
+
+    @patch('baseline_v1_live.auto_detector.time_module.sleep')
+    def test_backoff_within_bounds(self, mock_sleep):
+        self.detector.fetch_spot_price = MagicMock(
+            side_effect=[Exception('down')] * 5 + [24248.75]
+        )
+        self.detector._wait_for_broker_connection()
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(delays) == 5
+        assert delays[0] == self.detector.min_wait_interval
+        assert all(
+            self.detector.min_wait_interval <= d <= self.detector.max_wait_interval
+            for d in delays
+        )
+
+    def test_retry_policy_phases(self):
+        self.detector.max_wait_retries = 4
+        steps = list(self.detector._retry_policy())
+        assert [(p, a) for p, a, _ in steps] == [
+            ('quick', 1), ('quick', 2), ('quick', 3),
+            ('wait', 1), ('wait', 2), ('wait', 3), ('wait', 4),
+        ]
+        assert steps[0][2] == 0 and steps[3][2] == 0
+
+    @patch('baseline_v1_live.auto_detector.time_module.sleep')
+    def test_auto_detect_falls_through_to_wait_mode(self, mock_sleep):
+        self.detector.telegram_notifier = MagicMock()
+        self.detector.fetch_spot_price = MagicMock(
+            side_effect=[Exception('down')] * 3 + [24248.75]
+        )
+        atm, _ = self.detector.auto_detect()
+        assert atm == 24200
+        sent = [c.args[0] for c in self.detector.telegram_notifier.send_message.call_args_list]
+        assert any('Entering wait mode' in m for m in sent)
+        assert any('Broker connected after 1 retries' in m for m in sent)
+
+    @patch('baseline_v1_live.auto_detector.time_module.sleep')
+    def test_wait_mode_uses_websocket_only(self, mock_sleep):
+        self.detector.fetch_spot_price = MagicMock(return_value=24248.75)
+        self.detector.data_pipeline = MagicMock()
+        self.detector.data_pipeline.get_spot_price.side_effect = [None, None, 24310.0]
+
+        atm, _ = self.detector._wait_for_broker_connection()
+        assert atm == 24300
+        self.detector.fetch_spot_price.assert_not_called()
+
+    @patch('baseline_v1_live.auto_detector.time_module.sleep')
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        self.detector.max_wait_retries = 3
+        self.detector.fetch_spot_price = MagicMock(side_effect=Exception('down'))
+        with pytest.raises(Exception, match='Max retries'):
+            self.detector._wait_for_broker_connection()
+        assert self.detector.fetch_spot_price.call_count == 3
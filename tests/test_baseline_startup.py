@@ -0,0 +1,420 @@
+"""
+Tests for BaselineV1Live startup and main-loop helpers.
+
+Covers:
+- Background dashboard bar backfill (batched, stops on shutdown)
+- Bounded fill-dedup set
+- Lazy {symbol: close} price view over latest bars
+- Data-freshness watchdog task
+- Periodic broker position reconcile task
+- Main-loop error backoff doubles with jitter up to the cap
+- Emergency shutdown sends all position exits concurrently
+- save_state() passes each closed trade to log_trade() once
+- Waiting mode wakes immediately on request_shutdown()
+- A shutdown during startup waiting mode still runs the graceful shutdown
+- Market-closed idle sleep targets the next open/close and wakes on shutdown
+- Live SL recompute scans only bars at/after the swing
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytz
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline_v1_live.baseline_v1_live import BaselineV1Live, _BoundedSet, _PriceView
+
+IST = pytz.timezone('Asia/Kolkata')
+
+
+def _make_instance():
+    """Create a BaselineV1Live without running __init__."""
+    instance = BaselineV1Live.__new__(BaselineV1Live)
+    instance.shutdown_requested = False
+    instance._shutdown_event = threading.Event()
+    instance._loop = None
+    instance._shutdown_wakeup = None
+    instance.state_manager = MagicMock()
+    instance.data_pipeline = MagicMock()
+    return instance
+
+
+def _bars(count):
+    base = IST.localize(datetime(2026, 1, 5, 9, 15))
+    return [
+        SimpleNamespace(
+            timestamp=base + timedelta(minutes=i),
+            timestamp_iso=(base + timedelta(minutes=i)).isoformat(),
+            open=100.0, high=101.0, low=99.0, close=100.5, vwap=100.2, volume=10
+        )
+        for i in range(count)
+    ]
+
+
+class TestDashboardBackfill:
+    """_backfill_dashboard_bars() writes history in batches off the startup path."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        self.instance.symbols = ['CE1', 'PE1']
+        self.instance.data_pipeline.get_bars_for_symbol.side_effect = lambda s: _bars(3)
+        self.instance.state_manager.save_bars_bulk.side_effect = len
+
+    @patch('baseline_v1_live.baseline_v1_live.DASHBOARD_BACKFILL_BATCH_SIZE', 4)
+    def test_writes_all_rows_in_batches(self):
+        asyncio.run(self.instance._backfill_dashboard_bars())
+
+        batches = [c.args[0] for c in self.instance.state_manager.save_bars_bulk.call_args_list]
+        assert [len(b) for b in batches] == [4, 2]
+        assert batches[0][0] == ('CE1', _bars(1)[0].timestamp.isoformat(),
+                                 100.0, 101.0, 99.0, 100.5, 100.2, 10)
+
+    @patch('baseline_v1_live.baseline_v1_live.DASHBOARD_BACKFILL_BATCH_SIZE', 2)
+    def test_stops_on_shutdown(self):
+        def save(rows):
+            self.instance.shutdown_requested = True
+            return len(rows)
+        self.instance.state_manager.save_bars_bulk.side_effect = save
+
+        asyncio.run(self.instance._backfill_dashboard_bars())
+        assert self.instance.state_manager.save_bars_bulk.call_count == 1
+
+    def test_db_error_is_logged_not_raised(self):
+        self.instance.state_manager.save_bars_bulk.side_effect = Exception('locked')
+        asyncio.run(self.instance._backfill_dashboard_bars())
+
+
+class TestBoundedSet:
+    """_BoundedSet evicts the oldest keys once full."""
+
+    def test_membership_and_eviction(self):
+        seen = _BoundedSet(maxlen=3)
+        for key in ['a', 'b', 'c', 'd']:
+            seen.add(key)
+        assert len(seen) == 3
+        assert 'a' not in seen
+        assert all(k in seen for k in ['b', 'c', 'd'])
+
+    def test_re_add_does_not_evict(self):
+        seen = _BoundedSet(maxlen=2)
+        seen.add('a')
+        seen.add('b')
+        seen.add('a')
+        assert 'a' in seen and 'b' in seen
+
+
+class TestPriceView:
+    """_PriceView reads closes straight from the latest-bar dict."""
+
+    def test_lookup_and_iteration(self):
+        bars = {'CE1': SimpleNamespace(close=101.5), 'PE1': SimpleNamespace(close=88.0)}
+        prices = _PriceView(bars)
+        assert prices['CE1'] == 101.5
+        assert prices.get('PE1') == 88.0
+        assert prices.get('XX') is None
+        assert dict(prices.items()) == {'CE1': 101.5, 'PE1': 88.0}
+
+    def test_reflects_bar_updates(self):
+        bars = {'CE1': SimpleNamespace(close=100.0)}
+        prices = _PriceView(bars)
+        bars['CE1'] = SimpleNamespace(close=102.0)
+        assert prices['CE1'] == 102.0
+
+
+class TestWatchdog:
+    """_check_watchdog() reconnects on stale data and escalates on failure."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        self.instance.telegram = MagicMock()
+        self.instance.handle_emergency_shutdown = MagicMock()
+        self.instance.data_pipeline.is_reconnecting = False
+        self.instance.data_pipeline.get_health_status.return_value = {
+            'data_coverage': 0.2, 'symbols_with_data': 1,
+            'subscribed_symbols': 5, 'stale_symbols': 4,
+        }
+
+    def test_fresh_data_does_nothing(self):
+        self.instance.data_pipeline.check_data_freshness.return_value = (True, None)
+        self.instance._check_watchdog()
+        self.instance.data_pipeline.reconnect.assert_not_called()
+
+    def test_skips_when_pipeline_already_reconnecting(self):
+        self.instance.data_pipeline.check_data_freshness.return_value = (False, 'stale')
+        self.instance.data_pipeline.is_reconnecting = True
+        self.instance._check_watchdog()
+        self.instance.data_pipeline.reconnect.assert_not_called()
+
+    def test_failed_reconnect_exits(self):
+        self.instance.data_pipeline.check_data_freshness.return_value = (False, 'stale')
+        self.instance.data_pipeline.reconnect.return_value = False
+        with pytest.raises(SystemExit):
+            self.instance._check_watchdog()
+        self.instance.handle_emergency_shutdown.assert_called_once()
+
+    @patch('baseline_v1_live.baseline_v1_live.asyncio.sleep')
+    def test_task_survives_errors_and_stops_on_shutdown(self, mock_sleep):
+        calls = []
+
+        def check():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError('boom')
+            self.instance.shutdown_requested = True
+
+        async def no_sleep(_):
+            return None
+
+        mock_sleep.side_effect = no_sleep
+        self.instance._check_watchdog = check
+        asyncio.run(self.instance._watchdog())
+        assert len(calls) == 2
+
+
+class TestPositionReconcile:
+    """_position_reconcile() reconciles off the tick path while the market is open."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        self.instance.position_tracker = MagicMock()
+        self.instance.continuous_filter = MagicMock()
+        self.instance.is_market_open = MagicMock(return_value=True)
+
+    def test_phantom_positions_leave_filter(self):
+        self.instance.position_tracker.reconcile_with_broker.return_value = ['CE1']
+        self.instance._reconcile_positions()
+        self.instance.continuous_filter.remove_swing_candidate.assert_called_once_with('CE1')
+
+    @patch('baseline_v1_live.baseline_v1_live.asyncio.sleep')
+    def test_task_survives_errors_and_skips_closed_market(self, mock_sleep):
+        calls = []
+
+        def reconcile():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError('positionbook timeout')
+            self.instance.is_market_open.return_value = False
+            return []
+
+        async def sleep(_):
+            if self.instance.is_market_open.call_count >= 3:
+                self.instance.shutdown_requested = True
+
+        mock_sleep.side_effect = sleep
+        self.instance.position_tracker.reconcile_with_broker.side_effect = reconcile
+        asyncio.run(self.instance._position_reconcile())
+        assert len(calls) == 2
+
+
+class TestErrorBackoff:
+    """_next_error_backoff() grows 1s -> 2s -> 4s ... and stops at the cap."""
+
+    @patch('baseline_v1_live.baseline_v1_live.random.random', return_value=0.5)
+    @patch('baseline_v1_live.baseline_v1_live.MAIN_LOOP_ERROR_BACKOFF_MAX', 8.0)
+    def test_doubles_then_caps(self, _random):
+        instance = _make_instance()
+        instance._err_backoff = 1.0
+        delays = [instance._next_error_backoff() for _ in range(5)]
+        assert delays == [1.5, 2.5, 4.5, 8.0, 8.0]
+        assert instance._err_backoff == 8.0
+
+
+class TestEmergencyShutdown:
+    """handle_emergency_shutdown() exits every position in parallel."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        self.instance.telegram = MagicMock()
+        self.instance.save_state = MagicMock()
+        self.instance.order_manager = MagicMock()
+        self.instance.position_tracker = MagicMock()
+        self.instance.position_tracker.get_open_positions.return_value = [
+            {'symbol': sym, 'quantity': 65, 'current_price': 100.0, 'is_closed': False}
+            for sym in ['CE1', 'PE1']
+        ]
+        self.instance.position_tracker.get_position_summary.return_value = {
+            'cumulative_R': 0.0, 'total_positions': 2
+        }
+
+    def test_exits_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def exit_(symbol, quantity, reason):
+            barrier.wait()  # Only passes if both exits are in flight together
+            return f'OID-{symbol}'
+
+        self.instance.order_manager.emergency_market_exit.side_effect = exit_
+        self.instance.handle_emergency_shutdown()
+        closed = [c.kwargs['symbol'] for c in self.instance.position_tracker.close_position.call_args_list]
+        assert closed == ['CE1', 'PE1']
+
+    def test_failed_exit_keeps_position_open(self):
+        def exit_(symbol, quantity, reason):
+            if symbol == 'PE1':
+                raise ConnectionError('broker down')
+            return f'OID-{symbol}'
+
+        self.instance.order_manager.emergency_market_exit.side_effect = exit_
+        self.instance.handle_emergency_shutdown()
+        closed = [c.kwargs['symbol'] for c in self.instance.position_tracker.close_position.call_args_list]
+        assert closed == ['CE1']
+
+
+class TestSaveState:
+    """save_state() skips closed trades it already logged."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        self.instance._logged_trades = set()
+        self.instance.expiry_date = '26JAN'
+        self.instance.order_manager = MagicMock()
+        self.instance.position_tracker = MagicMock()
+        self.instance.position_tracker.get_position_summary.return_value = {}
+        self.instance.position_tracker.get_all_positions.return_value = [
+            {'symbol': 'CE1', 'is_closed': False, 'exit_time': None},
+            {'symbol': 'PE1', 'is_closed': True, 'exit_time': '2026-01-05T10:00:00+05:30'},
+        ]
+
+    def test_closed_trade_logged_once(self):
+        self.instance.save_state()
+        self.instance.save_state()
+        logged = [c.args[0]['symbol'] for c in self.instance.state_manager.log_trade.call_args_list]
+        assert logged == ['PE1']
+
+    def test_failed_batch_retries_next_save(self):
+        self.instance.state_manager.save_daily_state.side_effect = [Exception('locked'), None]
+        with pytest.raises(Exception):
+            self.instance.save_state()
+        self.instance.save_state()
+        assert self.instance.state_manager.log_trade.call_count == 1
+
+
+class TestWaitingMode:
+    """enter_waiting_mode() sleeps on the shutdown event, not time.sleep()."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        self.instance.notification_manager = MagicMock()
+        self.instance.startup_checker = MagicMock()
+        self.instance.startup_checker.run_all_checks.return_value = (False, 'NETWORK', 'down')
+
+    @patch('baseline_v1_live.baseline_v1_live.WAITING_MODE_CHECK_INTERVAL', 30)
+    def test_shutdown_request_wakes_wait(self):
+        threading.Timer(0.05, self.instance.request_shutdown).start()
+        started = time.monotonic()
+        self.instance.enter_waiting_mode('NETWORK', 'down')
+
+        assert time.monotonic() - started < 5
+        assert self.instance.shutdown_requested is True
+        assert self.instance.startup_checker.run_all_checks.call_count == 1
+
+    def test_recovery_returns_to_active(self):
+        self.instance.startup_checker.run_all_checks.return_value = (True, None, None)
+        self.instance.enter_waiting_mode('NETWORK', 'down')
+        self.instance.state_manager.update_operational_state.assert_called_with('ACTIVE')
+        assert self.instance.shutdown_requested is False
+
+    def test_shutdown_during_startup_wait_shuts_down_gracefully(self):
+        self.instance.position_tracker = MagicMock(open_positions={})
+        self.instance.order_manager = MagicMock(pending_limit_orders={}, active_sl_orders={})
+        self.instance.telegram = MagicMock()
+        self.instance.handle_graceful_shutdown = MagicMock()
+        self.instance.enter_waiting_mode = MagicMock(
+            side_effect=lambda *args: self.instance.request_shutdown()
+        )
+
+        self.instance.start()
+
+        self.instance.handle_graceful_shutdown.assert_called_once_with()
+        self.instance.data_pipeline.connect.assert_not_called()
+
+
+class TestIdleSleep:
+    """Outside market hours the loop sleeps until the next session boundary."""
+
+    def test_session_checks_use_given_time(self):
+        instance = _make_instance()
+        at = lambda h, m: IST.localize(datetime(2026, 1, 5, h, m))
+        assert instance.is_market_open(at(9, 15)) is True
+        assert instance.is_market_open(at(9, 14)) is False
+        assert instance.is_force_exit_time(at(15, 14)) is False
+        assert instance.is_force_exit_time(at(15, 15)) is True
+        assert instance.is_market_open(at(15, 15)) is False
+
+    def test_seconds_until_later_today(self):
+        now = IST.localize(datetime(2026, 1, 5, 8, 0))
+        assert BaselineV1Live._seconds_until(dt_time(9, 15), now) == 75 * 60
+
+    def test_seconds_until_rolls_to_tomorrow(self):
+        now = IST.localize(datetime(2026, 1, 5, 15, 30))
+        assert BaselineV1Live._seconds_until(dt_time(9, 15), now) == (17 * 60 + 45) * 60
+
+    @patch('baseline_v1_live.baseline_v1_live.MARKET_CLOSED_MAX_SLEEP', 30)
+    def test_shutdown_wakes_idle_sleep(self):
+        instance = _make_instance()
+
+        async def run():
+            instance._loop = asyncio.get_running_loop()
+            instance._shutdown_wakeup = asyncio.Event()
+            instance._loop.call_later(0.05, instance.request_shutdown)
+            started = time.monotonic()
+            await instance._idle_sleep(3600)
+            return time.monotonic() - started
+
+        assert asyncio.run(run()) < 5
+        assert instance.shutdown_requested is True
+
+    @patch('baseline_v1_live.baseline_v1_live.MARKET_CLOSED_MAX_SLEEP', 0.05)
+    def test_sleep_is_capped(self):
+        instance = _make_instance()
+
+        async def run():
+            instance._shutdown_wakeup = asyncio.Event()
+            started = time.monotonic()
+            await instance._idle_sleep(3600)
+            return time.monotonic() - started
+
+        assert asyncio.run(run()) < 5
+
+
+class TestLiveSlPrice:
+    """_compute_live_sl_price() uses the highest high since the swing."""
+
+    def setup_method(self):
+        self.instance = _make_instance()
+        base = IST.localize(datetime(2026, 1, 5, 9, 15))
+        self.times = [base + timedelta(minutes=i) for i in range(5)]
+        highs = [150.0, 120.0, 125.0, 131.0, 128.0]
+        detector = SimpleNamespace(bars=[
+            {'timestamp': ts, 'high': high} for ts, high in zip(self.times, highs)
+        ])
+        self.instance.swing_detector = SimpleNamespace(detectors={'CE1': detector})
+        self.instance.data_pipeline.get_all_current_bars.return_value = {}
+
+    def _candidate(self, swing_time, sl_price=100.0):
+        return {'swing_time': swing_time, 'sl_price': sl_price}
+
+    def test_ignores_bars_before_swing(self):
+        assert self.instance._compute_live_sl_price('CE1', self._candidate(self.times[1])) == 132.0
+
+    def test_includes_current_bar(self):
+        self.instance.data_pipeline.get_all_current_bars.return_value = {
+            'CE1': SimpleNamespace(high=140.0)
+        }
+        assert self.instance._compute_live_sl_price('CE1', self._candidate(self.times[1])) == 141.0
+
+    def test_swing_after_last_bar_keeps_stale_sl(self):
+        late = self.times[-1] + timedelta(minutes=1)
+        assert self.instance._compute_live_sl_price('CE1', self._candidate(late)) == 100.0
+
+    def test_lower_live_sl_keeps_stale_sl(self):
+        assert self.instance._compute_live_sl_price('CE1', self._candidate(self.times[1], 200.0)) == 200.0
@@ -0,0 +1,250 @@
+"""
+Tests for the cron-driven container health monitor.
+
+Covers:
+- pack_alerts() merges alerts in order without exceeding the length cap
+- send_telegram_alerts() posts the packed messages over one session
+- get_container_status() reads the Docker Engine API socket, falls back to docker-compose
+  (also when the socket finds no project containers)
+- Both status sources (and legacy 'Up' state files) report a running container as 'running'
+- save_state() replaces the state file atomically and round-trips with load_previous_state()
+- check_container_health() only rewrites the state file when a status changed
+- --daemon mode repeats checks until shutdown; default mode runs one check
+"""
+
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline_v1_live import container_monitor
+from baseline_v1_live.container_monitor import pack_alerts, send_telegram_alerts
+
+
+class TestPackAlerts:
+    """pack_alerts() fills each message up to max_length."""
+
+    def test_packs_in_order(self):
+        assert pack_alerts(['aa', 'bb', 'cc'], max_length=8, separator='|') == ['aa|bb|cc']
+        assert pack_alerts(['aa', 'bb', 'cc'], max_length=5, separator='|') == ['aa|bb', 'cc']
+
+    def test_oversized_alert_stands_alone(self):
+        assert pack_alerts(['a', 'x' * 10, 'b'], max_length=5, separator='|') == ['a', 'x' * 10, 'b']
+
+
+class TestSendTelegramAlerts:
+    """send_telegram_alerts() reuses one HTTP session for all packed messages."""
+
+    def setup_method(self):
+        self.config = patch.multiple(
+            'baseline_v1_live.container_monitor',
+            TELEGRAM_ENABLED=True, TELEGRAM_BOT_TOKEN='token', TELEGRAM_CHAT_ID='chat',
+            TELEGRAM_MAX_MESSAGE_LENGTH=20,
+        )
+        self.config.start()
+
+    def teardown_method(self):
+        self.config.stop()
+
+    @patch('requests.Session')
+    def test_single_session_for_all_alerts(self, mock_session_cls):
+        session = mock_session_cls.return_value.__enter__.return_value
+        session.post.return_value = MagicMock(status_code=200)
+
+        assert send_telegram_alerts(['crash A', 'crash B', 'x' * 30]) is True
+        assert mock_session_cls.call_count == 1
+        texts = [c.kwargs['json']['text'] for c in session.post.call_args_list]
+        assert texts == ['crash A\n---\ncrash B', 'x' * 30]
+
+    @patch('requests.Session')
+    def test_failed_post_reported(self, mock_session_cls):
+        session = mock_session_cls.return_value.__enter__.return_value
+        session.post.return_value = MagicMock(status_code=500)
+        assert container_monitor.send_telegram_alert('crash A') is False
+
+    def test_no_alerts_is_noop(self):
+        assert send_telegram_alerts([]) is True
+
+
+# Real `docker-compose ps --format json` output from compose v2 (NDJSON)
+COMPOSE_V2_PS = (
+    '{"Command":"\\"python -m baseline\u2026\\"","CreatedAt":"2026-01-05 08:50:12 +0530 IST",'
+    '"ExitCode":0,"ID":"3f1c2a9d8e7b","Name":"openalgo","Project":"nifty_options_agent",'
+    '"Service":"openalgo","State":"running","Status":"Up 2 hours"}\n'
+    '{"Command":"\\"python -m baseline\u2026\\"","CreatedAt":"2026-01-05 08:50:12 +0530 IST",'
+    '"ExitCode":1,"ID":"9a8b7c6d5e4f","Name":"baseline_v1_live","Project":"nifty_options_agent",'
+    '"Service":"trading_agent","State":"exited","Status":"Exited (1) 3 minutes ago"}\n'
+)
+
+
+class TestContainerStatus:
+    """get_container_status() talks to the daemon socket without a subprocess."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, 'docker.sock')
+        self.requests = []
+
+    def teardown_method(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _serve_once(self, containers):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(1)
+
+        def handle():
+            conn, _ = server.accept()
+            self.requests.append(conn.recv(65536).decode())
+            body = json.dumps(containers).encode()
+            conn.sendall(
+                b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+            )
+            conn.close()
+            server.close()
+
+        thread = threading.Thread(target=handle, daemon=True)
+        thread.start()
+        return thread
+
+    @patch.dict(os.environ, {'COMPOSE_PROJECT_NAME': 'nifty_options_agent'})
+    @patch('baseline_v1_live.container_monitor.subprocess.run')
+    def test_reads_engine_api(self, mock_run):
+        thread = self._serve_once([
+            {'Names': ['/baseline_v1_live'], 'State': 'running'},
+            {'Names': ['/openalgo'], 'State': 'exited'},
+        ])
+        with patch.object(container_monitor, 'DOCKER_SOCKET', self.socket_path):
+            status = container_monitor.get_container_status()
+        thread.join(timeout=5)
+
+        assert status == {'baseline_v1_live': 'running', 'openalgo': 'exited'}
+        assert 'com.docker.compose.project%3Dnifty_options_agent' in self.requests[0]
+        mock_run.assert_not_called()
+
+    @patch('baseline_v1_live.container_monitor.subprocess.run')
+    def test_falls_back_without_socket(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout=COMPOSE_V2_PS, stderr='')
+        with patch.object(container_monitor, 'DOCKER_SOCKET', os.path.join(self.tmpdir, 'missing.sock')):
+            assert container_monitor.get_container_status() == {
+                'openalgo': 'running', 'baseline_v1_live': 'exited'
+            }
+
+    @patch('baseline_v1_live.container_monitor.subprocess.run')
+    def test_compose_v1_up_state_normalized(self, mock_run):
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout='[{"Name": "openalgo", "State": "Up 2 hours"}]', stderr=''
+        )
+        with patch.object(container_monitor, 'DOCKER_SOCKET', os.path.join(self.tmpdir, 'missing.sock')):
+            assert container_monitor.get_container_status() == {'openalgo': 'running'}
+
+    @patch('baseline_v1_live.container_monitor.subprocess.run')
+    def test_no_project_containers_falls_back(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout=COMPOSE_V2_PS, stderr='')
+        thread = self._serve_once([])
+        with patch.object(container_monitor, 'DOCKER_SOCKET', self.socket_path):
+            status = container_monitor.get_container_status()
+        thread.join(timeout=5)
+
+        assert status == {'openalgo': 'running', 'baseline_v1_live': 'exited'}
+        mock_run.assert_called_once()
+
+
+class TestStateFile:
+    """save_state() never leaves a partially written state file."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.state_file = os.path.join(self.tmpdir, 'container_health_state.txt')
+        self.patcher = patch.object(container_monitor, 'STATE_FILE', self.state_file)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_round_trip(self):
+        container_monitor.save_state({'openalgo': 'running', 'baseline_v1_live': 'exited'})
+        assert container_monitor.load_previous_state() == {'openalgo': 'running', 'baseline_v1_live': 'exited'}
+        assert os.listdir(self.tmpdir) == ['container_health_state.txt']
+
+    def test_failed_write_keeps_previous_state(self):
+        container_monitor.save_state({'openalgo': 'running'})
+        with patch('baseline_v1_live.container_monitor.os.fsync', side_effect=OSError('disk full')):
+            container_monitor.save_state({'openalgo': 'exited'})
+        assert container_monitor.load_previous_state() == {'openalgo': 'running'}
+
+    def test_missing_file_and_junk_lines(self):
+        assert container_monitor.load_previous_state() == {}
+        with open(self.state_file, 'w') as f:
+            # Legacy files written before the state was normalized hold 'Up'
+            f.write('openalgo=Up\n\ngarbage\nbaseline_v1_live=exited\n')
+        assert container_monitor.load_previous_state() == {'openalgo': 'running', 'baseline_v1_live': 'exited'}
+
+    @patch('baseline_v1_live.container_monitor.send_telegram_alerts')
+    @patch('baseline_v1_live.container_monitor.get_container_status')
+    def test_unchanged_status_skips_write(self, mock_status, mock_send):
+        container_monitor.save_state({'openalgo': 'running'})
+        mock_status.return_value = {'openalgo': 'running'}
+        with patch('baseline_v1_live.container_monitor.save_state') as mock_save:
+            container_monitor.check_container_health()
+            mock_save.assert_not_called()
+
+            mock_status.return_value = {'openalgo': 'exited'}
+            container_monitor.check_container_health()
+            mock_save.assert_called_once_with({'openalgo': 'exited'})
+
+    @patch('baseline_v1_live.container_monitor.send_telegram_alerts')
+    @patch('baseline_v1_live.container_monitor.subprocess.run')
+    def test_switching_status_source_sends_no_alert(self, mock_run, mock_send):
+        # State saved from the Engine API, then the socket disappears
+        container_monitor.save_state({'openalgo': 'running', 'baseline_v1_live': 'exited'})
+        mock_run.return_value = MagicMock(returncode=0, stdout=COMPOSE_V2_PS, stderr='')
+        with patch.object(container_monitor, 'DOCKER_SOCKET', os.path.join(self.tmpdir, 'missing.sock')):
+            container_monitor.check_container_health()
+        mock_send.assert_called_once_with([])
+
+    @patch('baseline_v1_live.container_monitor.send_telegram_alerts')
+    @patch('baseline_v1_live.container_monitor.get_container_status')
+    def test_crash_and_recovery_alerts(self, mock_status, mock_send):
+        container_monitor.save_state({'openalgo': 'running', 'baseline_v1_live': 'exited'})
+        mock_status.return_value = {'openalgo': 'exited', 'baseline_v1_live': 'running'}
+        container_monitor.check_container_health()
+
+        alerts = mock_send.call_args[0][0]
+        assert alerts[0].startswith('[CONTAINER_CRASH] openalgo crashed!')
+        assert alerts[1] == '[CONTAINER_RECOVERED] baseline_v1_live is now running!'
+
+
+class TestDaemonMode:
+    """main() runs once by default and loops with --daemon."""
+
+    @patch('baseline_v1_live.container_monitor.check_container_health')
+    def test_default_runs_single_check(self, mock_check):
+        container_monitor.main([])
+        assert mock_check.call_count == 1
+
+    @patch('baseline_v1_live.container_monitor.check_container_health')
+    def test_daemon_loops_until_shutdown(self, mock_check):
+        shutdown = threading.Event()
+        mock_check.side_effect = lambda: mock_check.call_count >= 3 and shutdown.set()
+
+        container_monitor.run_daemon(0.01, shutdown)
+        assert mock_check.call_count == 3
+
+    @patch('baseline_v1_live.container_monitor.send_telegram_alert')
+    @patch('baseline_v1_live.container_monitor.check_container_health', side_effect=RuntimeError('boom'))
+    def test_failed_check_does_not_stop_daemon(self, mock_check, mock_alert):
+        shutdown = threading.Event()
+        mock_alert.side_effect = lambda _: mock_alert.call_count >= 2 and shutdown.set()
+
+        container_monitor.run_daemon(0.01, shutdown)
+        assert mock_check.call_count == 2
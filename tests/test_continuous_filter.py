@@ -0,0 +1,87 @@
+"""
+Tests for ContinuousFilterEngine startup protection and candidate-pool tracking.
+
+Covers:
+- mark_historical_breaks() flags swings whose low was broken by a later bar
+- candidates_version changes whenever the candidate pool may have changed
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline_v1_live.continuous_filter import ContinuousFilterEngine
+
+
+def _detector(lows):
+    return SimpleNamespace(bars=[{'low': low} for low in lows])
+
+
+class TestMarkHistoricalBreaks:
+    """mark_historical_breaks() only looks at bars after each swing."""
+
+    def setup_method(self):
+        self.engine = ContinuousFilterEngine()
+        self.detectors = {
+            'CE1': _detector([105, 100, 104, 103, 99]),
+            'PE1': _detector([95, 90, 92, 93]),
+        }
+        self.swing_detector = MagicMock()
+        self.swing_detector.get_detector.side_effect = self.detectors.get
+
+    def _swing(self, symbol, price, index):
+        return {'symbol': symbol, 'price': price, 'index': index}
+
+    def test_marks_broken_and_intact_swings(self):
+        broken = self._swing('CE1', 100, 1)
+        intact = self._swing('CE1', 103, 3)
+        pe_intact = self._swing('PE1', 90, 1)
+        self.engine.stage1_swings_by_type = {'CE': [broken, intact], 'PE': [pe_intact]}
+
+        assert self.engine.mark_historical_breaks(self.swing_detector) == 2
+        assert broken['broke_in_history'] is True
+        assert intact['broke_in_history'] is True
+        assert pe_intact['broke_in_history'] is False
+
+    def test_swing_on_last_bar_is_not_broken(self):
+        last = self._swing('PE1', 93, 3)
+        self.engine.stage1_swings_by_type = {'CE': [], 'PE': [last]}
+
+        assert self.engine.mark_historical_breaks(self.swing_detector) == 0
+        assert last['broke_in_history'] is False
+
+    def test_missing_detector_is_skipped(self):
+        orphan = self._swing('XX', 100, 0)
+        self.engine.stage1_swings_by_type = {'CE': [orphan], 'PE': []}
+
+        assert self.engine.mark_historical_breaks(self.swing_detector) == 0
+        assert 'broke_in_history' not in orphan
+
+    def test_detector_scanned_once_per_symbol(self):
+        self.engine.stage1_swings_by_type = {
+            'CE': [self._swing('CE1', 100, 1), self._swing('CE1', 103, 3)], 'PE': []
+        }
+        self.engine.mark_historical_breaks(self.swing_detector)
+        assert self.swing_detector.get_detector.call_count == 1
+
+
+class TestCandidatesVersion:
+    """candidates_version lets callers skip re-saving an unchanged pool."""
+
+    def test_bumped_by_pool_mutations(self):
+        engine = ContinuousFilterEngine()
+        versions = [engine.candidates_version]
+
+        engine.add_swing_candidate('CE1', {'price': 50.0, 'type': 'Low', 'vwap': 40.0,
+                                           'option_type': 'CE', 'index': 1})
+        versions.append(engine.candidates_version)
+        engine.remove_swing_candidate('CE1')
+        versions.append(engine.candidates_version)
+        engine.reset_daily_data()
+        versions.append(engine.candidates_version)
+
+        assert len(set(versions)) == 4
@@ -0,0 +1,318 @@
+"""
+Tests for DataPipeline tick handling and startup readiness.
+
+Covers:
+- live_data_ready is set once live ticks cover MIN_DATA_COVERAGE_THRESHOLD of subscriptions
+- wait_for_live_data() returns early when ready and False on timeout
+- Ticks from a source that is no longer active are discarded
+- Concurrent history fetch in load_historical_data() with per-symbol failure isolation
+- Concurrent history fetches are spaced to HISTORY_FETCH_MAX_PER_SEC
+- Out-of-order history rows are still sorted before bars are built
+- _reload_historical_vwap() prepends missed early bars in place and corrects VWAP
+- backfill_missed_bars() fetches concurrently and skips symbols without a last bar
+- _ensure_complete_history() retry wait is skipped when complete and aborts on cancel
+- History retries stop once a reload recovers no missing bars
+- BarData.timestamp_iso is computed once and matches isoformat()
+- BarData uses __slots__ (no per-instance __dict__); snapshot()/copy.copy() copy every slot
+- _history_columns() matches the row-by-row cumulative VWAP
+- _history_rows() yields plain per-row tuples and accepts capitalized columns
+- Naive and ISO-string history indexes (including mixed UTC offsets) are normalized once
+  and floored to the minute column-wise
+"""
+
+import copy
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+import pytz
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _make_pipeline():
+    """Return a DataPipeline instance with the openalgo.api class mocked out."""
+    with patch('baseline_v1_live.data_pipeline.api'):
+        from baseline_v1_live.data_pipeline import DataPipeline
+        return DataPipeline()
+
+
+def _tick(symbol, ltp=100.0):
+    return {'symbol': symbol, 'data': {'ltp': ltp, 'volume': 10}}
+
+
+class TestLiveDataReady:
+    """Startup waits on live tick coverage instead of a fixed sleep."""
+
+    def setup_method(self):
+        self.pipeline = _make_pipeline()
+        self.pipeline.subscribed_symbols = {'A', 'B', 'C', 'D'}
+
+    def test_not_ready_before_ticks(self):
+        assert not self.pipeline.live_data_ready.is_set()
+        assert self.pipeline.wait_for_live_data(timeout=0.01) is False
+
+    def test_ready_at_coverage_threshold(self):
+        self.pipeline._process_tick(_tick('A'))
+        assert not self.pipeline.live_data_ready.is_set()
+        self.pipeline._process_tick(_tick('A', 101.0))
+        assert not self.pipeline.live_data_ready.is_set()
+
+        self.pipeline._process_tick(_tick('B'))
+        assert self.pipeline.live_data_ready.is_set()
+        assert self.pipeline.wait_for_live_data(timeout=0.01) is True
+
+    def test_unsubscribed_ticks_ignored_for_coverage(self):
+        self.pipeline._process_tick(_tick('X'))
+        self.pipeline._process_tick(_tick('Y'))
+        assert not self.pipeline.live_data_ready.is_set()
+
+    def test_tick_from_inactive_source_discarded(self):
+        self.pipeline.active_source = 'zerodha'
+        self.pipeline._process_tick(_tick('A'), source='angelone')
+        assert 'A' not in self.pipeline.last_tick_time
+        assert 'A' not in self.pipeline.current_bars
+
+        self.pipeline._process_tick(_tick('A'), source='zerodha')
+        assert self.pipeline.current_bars['A'].close == 100.0
+
+
+class TestLoadHistoricalData:
+    """History requests run concurrently; results are applied per symbol."""
+
+    def setup_method(self):
+        self.pipeline = _make_pipeline()
+        self.pipeline._ensure_complete_history = MagicMock()
+        ist = pytz.timezone('Asia/Kolkata')
+        yesterday = (datetime.now(ist) - timedelta(days=1)).replace(
+            hour=9, minute=15, second=0, microsecond=0
+        )
+        self.frame = pd.DataFrame(
+            {'open': [100.0, 101.0], 'high': [102.0, 103.0], 'low': [99.0, 100.0],
+             'close': [101.0, 102.0], 'volume': [10, 20]},
+            index=[yesterday, yesterday + timedelta(minutes=1)]
+        )
+
+    def _history(self, symbol, **kwargs):
+        if symbol == 'BAD':
+            raise ConnectionError('timeout')
+        if symbol == 'ERR':
+            return {'status': 'error', 'message': 'no data'}
+        return self.frame
+
+    def test_fetches_every_symbol(self):
+        self.pipeline.client = MagicMock()
+        self.pipeline.client.history.side_effect = self._history
+
+        self.pipeline.load_historical_data(['A', 'BAD', 'ERR', 'B'])
+
+        fetched = sorted(c.kwargs['symbol'] for c in self.pipeline.client.history.call_args_list)
+        assert fetched == ['A', 'B', 'BAD', 'ERR']
+        assert [b.close for b in self.pipeline.bars['A']] == [101.0, 102.0]
+        assert [b.close for b in self.pipeline.bars['B']] == [101.0, 102.0]
+        assert 'BAD' not in self.pipeline.bars
+        assert 'ERR' not in self.pipeline.bars
+
+    @patch('baseline_v1_live.data_pipeline.HISTORY_FETCH_MAX_PER_SEC', 20)
+    def test_fetches_throttled_to_rate_limit(self):
+        starts = []
+        self.pipeline.client = MagicMock()
+        self.pipeline.client.history.side_effect = (
+            lambda symbol, **kwargs: starts.append(time.monotonic()) or self.frame
+        )
+
+        self.pipeline.load_historical_data(['A', 'B', 'C', 'D', 'E'])
+
+        starts.sort()
+        assert len(starts) == 5
+        assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))  # 1/20 s apart
+
+    def test_unsorted_history_sorted(self):
+        self.frame = self.frame.iloc[::-1]
+        self.pipeline.client = MagicMock()
+        self.pipeline.client.history.side_effect = self._history
+
+        self.pipeline.load_historical_data(['A'])
+
+        assert [b.close for b in self.pipeline.bars['A']] == [101.0, 102.0]
+
+    def test_reload_prepends_early_bars(self):
+        from baseline_v1_live.data_pipeline import BarData
+        self.pipeline.client = MagicMock()
+        self.pipeline.client.history.side_effect = self._history
+        late = BarData(self.frame.index[1])
+        late.update_tick(102.0, 20)
+        bars = self.pipeline.bars['A']
+        bars.append(late)
+
+        assert self.pipeline._reload_historical_vwap() == 1
+
+        assert self.pipeline.bars['A'] is bars
+        assert [b.close for b in bars] == [101.0, 102.0]
+        assert bars[1] is late
+        tp = [(102.0 + 99.0 + 101.0) / 3, (103.0 + 100.0 + 102.0) / 3]
+        assert late.vwap == pytest.approx((tp[0] * 10 + tp[1] * 20) / 30)
+
+    def test_backfill_fetches_symbols_with_last_bar(self):
+        from baseline_v1_live.data_pipeline import BarData
+        self.pipeline.client = MagicMock()
+        self.pipeline.client.history.side_effect = self._history
+        first = self.frame.index[0]
+        self.pipeline.subscribed_symbols = {'A', 'BAD', 'NEW'}
+        self.pipeline.last_disconnect_time = datetime.now(first.tzinfo)
+        self.pipeline._saved_bar_timestamps = {'A': first, 'BAD': first}
+        self.pipeline.bars = {'A': [BarData(first)], 'BAD': []}
+        self.pipeline.session_vwap_data = {'A': {'cum_pv': 0.0, 'cum_vol': 0}}
+
+        self.pipeline.backfill_missed_bars()
+
+        fetched = sorted(c.kwargs['symbol'] for c in self.pipeline.client.history.call_args_list)
+        assert fetched == ['A', 'BAD']
+        assert [b.close for b in self.pipeline.bars['A']][1:] == [102.0]
+        assert self.pipeline.bars['BAD'] == []
+
+
+class TestEnsureCompleteHistory:
+    """The history retry only waits when bars are missing and can be cancelled."""
+
+    def setup_method(self):
+        from baseline_v1_live.data_pipeline import BarData
+        self.pipeline = _make_pipeline()
+        self.pipeline._reload_historical_vwap = MagicMock()
+        ist = pytz.timezone('Asia/Kolkata')
+        self.load_time = ist.localize(datetime(2026, 1, 5, 10, 15, 30))
+        open_bar = self.load_time.replace(hour=9, minute=15, second=0)
+        self.pipeline.bars['A'] = [BarData(open_bar + timedelta(minutes=i)) for i in range(10)]
+
+    def test_complete_history_skips_retry(self):
+        self.pipeline.bars['A'] *= 6
+        assert self.pipeline._history_completeness(self.load_time) == (60, 59, True)
+        self.pipeline._ensure_complete_history(self.load_time)
+        self.pipeline._reload_historical_vwap.assert_not_called()
+
+    def test_cancel_aborts_retry_wait(self):
+        self.pipeline.cancel_history_retry()
+        self.pipeline._ensure_complete_history(self.load_time)
+        self.pipeline._reload_historical_vwap.assert_not_called()
+
+    def _retry_with_counts(self, counts):
+        self.pipeline._history_retry_cancel = MagicMock()
+        self.pipeline._history_retry_cancel.wait.return_value = False
+        self.pipeline._history_completeness = MagicMock(
+            side_effect=[(max_bars, expected, False) for max_bars, expected in counts]
+        )
+        self.pipeline._ensure_complete_history(self.load_time)
+        return self.pipeline._reload_historical_vwap.call_count
+
+    def test_stalled_reload_stops_retrying(self):
+        # A live bar arrives during the wait, but the shortfall stays at 49
+        assert self._retry_with_counts([(10, 59), (11, 60)]) == 1
+
+    def test_progressing_reload_keeps_retrying(self):
+        assert self._retry_with_counts([(10, 59), (20, 60), (30, 61), (40, 62)]) == 3
+
+
+class TestBarData:
+    """BarData caches its ISO timestamp for repeated DB writes."""
+
+    def test_timestamp_iso_cached(self):
+        from baseline_v1_live.data_pipeline import BarData
+        ts = pytz.timezone('Asia/Kolkata').localize(datetime(2026, 1, 5, 9, 15))
+        bar = BarData(ts)
+        assert bar.timestamp_iso == ts.isoformat()
+        assert bar.timestamp_iso is bar.timestamp_iso
+
+    def test_slotted(self):
+        from baseline_v1_live.data_pipeline import BarData
+        bar = BarData(datetime(2026, 1, 5, 9, 15))
+        assert not hasattr(bar, '__dict__')
+        bar.update_tick(100.0, 5)
+        assert (bar.open, bar.high, bar.low, bar.close, bar.volume) == (100.0, 100.0, 100.0, 100.0, 5)
+
+        for copied in (bar.snapshot(), copy.copy(bar)):
+            assert copied is not bar
+            assert all(getattr(copied, name) == getattr(bar, name) for name in BarData.__slots__)
+
+
+class TestHistoryColumns:
+    """_history_columns() computes session VWAP column-wise."""
+
+    def test_matches_scalar_vwap(self):
+        from baseline_v1_live.data_pipeline import _history_columns
+        ist = pytz.timezone('Asia/Kolkata')
+        start = ist.localize(datetime(2026, 1, 5, 9, 15, 30))
+        df = pd.DataFrame(
+            {'open': [100.0, 101.0, 99.0], 'high': [102.0, 103.0, 100.0],
+             'low': [99.0, 100.0, 97.0], 'close': [101.0, 102.0, 98.0], 'volume': [0, 20, 30]},
+            index=[start + timedelta(minutes=i) for i in range(3)]
+        )
+        timestamps, _, _, _, closes, volumes, vwaps, cum_pv, cum_vol = _history_columns(df)
+
+        tp = [(h + l + c) / 3 for h, l, c in zip(df['high'], df['low'], df['close'])]
+        expected_pv = tp[1] * 20 + tp[2] * 30
+        assert vwaps == [tp[0], tp[1], expected_pv / 50]
+        assert (cum_pv, cum_vol) == (expected_pv, 50)
+        assert closes == [101.0, 102.0, 98.0] and volumes == [0, 20, 30]
+        assert timestamps[0] == start.replace(second=0)
+
+
+class TestHistoryRows:
+    """_history_rows() replaces iterrows() in gap fill and backfill."""
+
+    def test_rows_match_frame(self):
+        from baseline_v1_live.data_pipeline import _history_rows
+        ist = pytz.timezone('Asia/Kolkata')
+        start = ist.localize(datetime(2026, 1, 5, 9, 15, 30))
+        df = pd.DataFrame(
+            {'Open': [100.0, 101.0], 'High': [102.0, 103.0], 'Low': [99.0, 100.0],
+             'Close': [101.0, 102.0]},
+            index=[start, start + timedelta(minutes=1)]
+        )
+        rows = list(_history_rows(df))
+        assert rows == [
+            (start.replace(second=0), 100.0, 102.0, 99.0, 101.0, 0),
+            (start.replace(second=0) + timedelta(minutes=1), 101.0, 103.0, 100.0, 102.0, 0),
+        ]
+        assert type(rows[0][1]) is float
+
+    def test_naive_index_localized_once(self):
+        from baseline_v1_live.data_pipeline import _localize_history_index, _minute_timestamps
+        ist = pytz.timezone('Asia/Kolkata')
+        index = pd.date_range('2026-01-05 09:15:30', periods=3, freq='min')
+        df = _localize_history_index(pd.DataFrame({'close': [1.0, 2.0, 3.0]}, index=index))
+
+        assert str(df.index.tz) == 'Asia/Kolkata'
+        assert _minute_timestamps(df.index) == [
+            ist.localize(datetime(2026, 1, 5, 9, 15 + i)) for i in range(3)
+        ]
+        assert df[df.index <= ist.localize(datetime(2026, 1, 5, 9, 16))]['close'].tolist() == [1.0]
+
+    def test_string_index_parsed_once(self):
+        from baseline_v1_live.data_pipeline import _localize_history_index, _minute_timestamps
+        ist = pytz.timezone('Asia/Kolkata')
+        df = _localize_history_index(pd.DataFrame(
+            {'close': [1.0, 2.0]}, index=['2026-01-05 09:15:20', '2026-01-05 09:16:40']
+        ))
+
+        assert str(df.index.tz) == 'Asia/Kolkata'
+        assert _minute_timestamps(df.index) == [
+            ist.localize(datetime(2026, 1, 5, 9, 15)), ist.localize(datetime(2026, 1, 5, 9, 16))
+        ]
+
+    def test_mixed_offset_strings_converted_to_ist(self):
+        from baseline_v1_live.data_pipeline import _localize_history_index, _minute_timestamps
+        ist = pytz.timezone('Asia/Kolkata')
+        df = _localize_history_index(pd.DataFrame(
+            {'close': [1.0, 2.0]}, index=['2026-01-05T09:15:20+05:30', '2026-01-05T03:46:40+00:00']
+        ))
+
+        assert str(df.index.tz) == 'Asia/Kolkata'
+        assert _minute_timestamps(df.index) == [
+            ist.localize(datetime(2026, 1, 5, 9, 15)), ist.localize(datetime(2026, 1, 5, 9, 16))
+        ]
+        assert df[df.index <= ist.localize(datetime(2026, 1, 5, 9, 16))]['close'].tolist() == [1.0]
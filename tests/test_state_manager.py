@@ -0,0 +1,369 @@
+"""
+Tests for StateManager bulk persistence used during startup backfill.
+
+Covers:
+- Bulk historical swing logging (single INSERT OR IGNORE executemany)
+- Buffered live swing logging (flush on size/age/explicit flush/close)
+- Bulk historical bar saves (one transaction for all symbols)
+- Per-tick latest-bar saves and old-day pruning
+- Connection pragmas (WAL + synchronous=NORMAL)
+- tick_batch() groups per-tick dashboard and save_state() writes into one commit
+- Swing rows flushed inside a rolled-back tick_batch() stay buffered
+- A caught write failure inside tick_batch() rolls back only that write
+- Trades logged inside tick_batch() reach the trade CSV only after the commit
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytz
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline_v1_live.state_manager import StateManager
+
+IST = pytz.timezone('Asia/Kolkata')
+
+
+def _event(minute, swing_type='Low', price=100.0):
+    return {
+        'type': swing_type,
+        'price': price,
+        'timestamp': IST.localize(datetime(2026, 1, 5, 9, minute)),
+        'vwap': price + 5,
+        'index': minute,
+    }
+
+
+class TestBulkSwingLogging:
+    """log_swing_detections_bulk() inserts new swings once and skips duplicates."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.sm = StateManager(db_path=os.path.join(self.tmpdir, 'test_state.db'))
+
+    def teardown_method(self):
+        self.sm.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _rows(self):
+        cursor = self.sm.conn.cursor()
+        cursor.execute('SELECT symbol, swing_type, swing_price, bar_index FROM all_swings_log ORDER BY id')
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def test_inserts_all_symbols(self):
+        inserted = self.sm.log_swing_detections_bulk({
+            'NIFTY26JAN24000CE': [_event(20), _event(25, 'High', 110.0)],
+            'NIFTY26JAN24000PE': [_event(30)],
+        })
+        assert inserted == 3
+        assert self._rows() == [
+            ('NIFTY26JAN24000CE', 'Low', 100.0, 20),
+            ('NIFTY26JAN24000CE', 'High', 110.0, 25),
+            ('NIFTY26JAN24000PE', 'Low', 100.0, 30),
+        ]
+
+    def test_skips_existing_and_repeated_swings(self):
+        self.sm.log_swing_detection(
+            symbol='NIFTY26JAN24000CE', swing_type='Low', swing_price=100.0,
+            swing_time=_event(20)['timestamp'], vwap=105.0, bar_index=20
+        )
+        inserted = self.sm.log_swing_detections_bulk({
+            'NIFTY26JAN24000CE': [_event(20), _event(40), _event(40)],
+        })
+        assert inserted == 1
+        assert len(self._rows()) == 2
+
+    def test_empty_input(self):
+        assert self.sm.log_swing_detections_bulk({}) == 0
+        assert self.sm.log_swing_detections_bulk({'NIFTY26JAN24000CE': []}) == 0
+        assert self._rows() == []
+
+
+class TestBufferedSwingLogging:
+    """log_swing_detection() queues rows until a flush condition is met."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, 'test_state.db')
+        self.sm = StateManager(db_path=self.db_path)
+
+    def teardown_method(self):
+        self.sm.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _log(self, minute):
+        self.sm.log_swing_detection(
+            symbol='NIFTY26JAN24000CE', swing_type='Low', swing_price=100.0,
+            swing_time=_event(minute)['timestamp'], vwap=105.0, bar_index=minute
+        )
+
+    def _count(self):
+        return self.sm.conn.execute('SELECT COUNT(*) FROM all_swings_log').fetchone()[0]
+
+    @patch('baseline_v1_live.state_manager.SWING_LOG_FLUSH_INTERVAL', 60.0)
+    def test_buffers_until_flush(self):
+        self._log(20)
+        self._log(21)
+        assert self._count() == 0
+        assert self.sm.flush_swing_log() == 2
+        assert self._count() == 2
+        assert self.sm.flush_swing_log() == 0
+
+    @patch('baseline_v1_live.state_manager.SWING_LOG_FLUSH_INTERVAL', 60.0)
+    @patch('baseline_v1_live.state_manager.SWING_LOG_FLUSH_SIZE', 3)
+    def test_flushes_at_size_limit(self):
+        for minute in range(20, 23):
+            self._log(minute)
+        assert self._count() == 3
+
+    @patch('baseline_v1_live.state_manager.SWING_LOG_FLUSH_INTERVAL', 0.0)
+    def test_flushes_when_oldest_is_stale(self):
+        self._log(20)
+        assert self._count() == 1
+
+    @patch('baseline_v1_live.state_manager.SWING_LOG_FLUSH_INTERVAL', 60.0)
+    def test_close_flushes_pending_rows(self):
+        self._log(20)
+        self.sm.close()
+        self.sm = StateManager(db_path=self.db_path)
+        assert self._count() == 1
+
+
+class TestBulkBarSave:
+    """save_bars_bulk() writes every bar in one call and upserts on (symbol, timestamp)."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.sm = StateManager(db_path=os.path.join(self.tmpdir, 'test_state.db'))
+        self.today = datetime.now(IST).replace(hour=9, minute=15, second=0, microsecond=0)
+
+    def teardown_method(self):
+        self.sm.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _row(self, symbol, ts, close):
+        return (symbol, ts.isoformat(), close, close + 1, close - 1, close, close, 1000)
+
+    def test_saves_all_rows(self):
+        rows = [
+            self._row('NIFTY26JAN24000CE', self.today, 100.0),
+            self._row('NIFTY26JAN24000CE', self.today.replace(minute=16), 101.0),
+            self._row('NIFTY26JAN24000PE', self.today, 90.0),
+        ]
+        assert self.sm.save_bars_bulk(rows) == 3
+        cursor = self.sm.conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM bars')
+        assert cursor.fetchone()[0] == 3
+
+    def test_replaces_same_timestamp(self):
+        self.sm.save_bars_bulk([self._row('NIFTY26JAN24000CE', self.today, 100.0)])
+        self.sm.save_bars_bulk([self._row('NIFTY26JAN24000CE', self.today, 105.0)])
+        cursor = self.sm.conn.cursor()
+        cursor.execute('SELECT close FROM bars')
+        assert [row[0] for row in cursor.fetchall()] == [105.0]
+
+    def test_empty_rows(self):
+        assert self.sm.save_bars_bulk([]) == 0
+
+
+class TestSaveLatestBars:
+    """save_latest_bars() upserts every symbol and prunes only older days."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.sm = StateManager(db_path=os.path.join(self.tmpdir, 'test_state.db'))
+        self.today = datetime.now(IST).replace(hour=9, minute=15, second=0, microsecond=0)
+
+    def teardown_method(self):
+        self.sm.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _bar(self, ts, close=100.0):
+        return {'timestamp': ts.isoformat(), 'open': close, 'high': close, 'low': close,
+                'close': close, 'vwap': close, 'volume': 10}
+
+    def test_prunes_previous_day_for_saved_symbols(self):
+        yesterday = self.today - timedelta(days=1)
+        self.sm.save_bars_bulk([
+            ('CE1', yesterday.isoformat(), 1, 1, 1, 1, 1, 1),
+            ('PE1', yesterday.isoformat(), 1, 1, 1, 1, 1, 1),
+        ])
+        # save_bars_bulk prunes too, so re-insert the stale rows directly
+        self.sm.conn.executemany(
+            'INSERT INTO bars (symbol, timestamp) VALUES (?, ?)',
+            [('CE1', yesterday.isoformat()), ('PE1', yesterday.isoformat())]
+        )
+        self.sm.conn.commit()
+
+        self.sm.save_latest_bars({'CE1': self._bar(self.today)})
+
+        cursor = self.sm.conn.cursor()
+        cursor.execute('SELECT symbol, timestamp FROM bars ORDER BY symbol')
+        assert [tuple(r) for r in cursor.fetchall()] == [
+            ('CE1', self.today.isoformat()),
+            ('PE1', yesterday.isoformat()),
+        ]
+
+    def test_upserts_all_symbols(self):
+        self.sm.save_latest_bars({'CE1': self._bar(self.today), 'PE1': self._bar(self.today)})
+        self.sm.save_latest_bars({'CE1': self._bar(self.today, 101.0)})
+        cursor = self.sm.conn.cursor()
+        cursor.execute('SELECT symbol, close FROM bars ORDER BY symbol')
+        assert [tuple(r) for r in cursor.fetchall()] == [('CE1', 101.0), ('PE1', 100.0)]
+
+
+class TestConnectionPragmas:
+    """The connection runs in WAL mode with synchronous=NORMAL."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.sm = StateManager(db_path=os.path.join(self.tmpdir, 'test_state.db'))
+
+    def teardown_method(self):
+        self.sm.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _pragma(self, name):
+        return self.sm.conn.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_wal_and_normal_sync(self):
+        assert self._pragma('journal_mode') == 'wal'
+        assert self._pragma('synchronous') == 1  # NORMAL
+        assert self._pragma('temp_store') == 2  # MEMORY
+
+
+class TestTickBatch:
+    """tick_batch() defers per-call commits to one commit at the end."""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, 'test_state.db')
+        self.sm = StateManager(db_path=self.db_path)
+        self.today = datetime.now(IST).replace(hour=9, minute=15, second=0, microsecond=0)
+
+    def teardown_method(self):
+        self.sm.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _bar(self):
+        ts = self.today.isoformat()
+        return {'timestamp': ts, 'open': 1, 'high': 1, 'low': 1, 'close': 1, 'vwap': 1, 'volume': 1}
+
+    def _reader_count(self, table):
+        reader = sqlite3.connect(self.db_path)
+        try:
+            return reader.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        finally:
+            reader.close()
+
+    def test_writes_commit_together(self):
+        with self.sm.tick_batch():
+            self.sm.save_latest_bars({'CE1': self._bar()})
+            self.sm.log_order_trigger('CE', 'wait', 'CE1', 100.0, 99.0, 'far')
+            assert self.sm.conn.in_transaction
+            assert self._reader_count('bars') == 0
+        assert not self.sm.conn.in_transaction
+        assert self._reader_count('bars') == 1
+        assert self._reader_count('order_triggers') == 1
+
+    def test_error_rolls_back_batch(self):
+        try:
+            with self.sm.tick_batch():
+                self.sm.save_latest_bars({'CE1': self._bar()})
+                raise RuntimeError('boom')
+        except RuntimeError:
+            pass
+        assert self._reader_count('bars') == 0
+
+    def test_atomic_methods_join_batch(self):
+        with self.sm.tick_batch():
+            self.sm.save_bars_bulk([('CE1', self.today.isoformat(), 1, 1, 1, 1, 1, 1)])
+        assert self._reader_count('bars') == 1
+
+    def test_state_snapshot_commits_together(self):
+        with self.sm.tick_batch():
+            self.sm.save_orders({}, {})
+            self.sm.save_daily_state({'cumulative_R': 1.5, 'total_positions': 2})
+            assert self._reader_count('daily_state') == 0
+        assert self._reader_count('daily_state') == 1
+
+    @patch('baseline_v1_live.state_manager.SWING_LOG_FLUSH_INTERVAL', 60.0)
+    def test_rolled_back_batch_keeps_swing_rows(self):
+        self.sm.log_swing_detection(
+            symbol='CE1', swing_type='Low', swing_price=100.0,
+            swing_time=_event(20)['timestamp'], vwap=105.0, bar_index=20
+        )
+        try:
+            with self.sm.tick_batch():
+                assert self.sm.flush_swing_log() == 1
+                raise RuntimeError('boom')
+        except RuntimeError:
+            pass
+        assert self._reader_count('all_swings_log') == 0
+
+        with self.sm.tick_batch():
+            assert self.sm.flush_swing_log() == 1
+            assert self.sm.flush_swing_log() == 0
+        assert self._reader_count('all_swings_log') == 1
+        assert self.sm.flush_swing_log() == 0
+
+    def test_failed_write_rolls_back_alone(self):
+        good = ('CE1', self.today.isoformat(), 1, 1, 1, 1, 1, 1)
+        bad = ('PE1', self.today.isoformat(), 1)  # wrong arity fails mid-executemany
+        with self.sm.tick_batch():
+            try:
+                self.sm.save_bars_bulk([good, bad])
+            except Exception:
+                pass
+            self.sm.log_order_trigger('CE', 'wait', 'CE1', 100.0, 99.0, 'far')
+        assert self._reader_count('bars') == 0
+        assert self._reader_count('order_triggers') == 1
+
+    def _trade(self):
+        return {
+            'is_closed': True, 'symbol': 'CE1', 'strike': 24000, 'option_type': 'CE',
+            'entry_time': self.today.isoformat(), 'entry_price': 100.0, 'sl_price': 110.0,
+            'quantity': 65, 'lots': 1, 'actual_R': 650.0,
+            'exit_time': (self.today + timedelta(minutes=30)).isoformat(), 'exit_price': 90.0,
+            'exit_reason': 'EOD_EXIT', 'realized_pnl': 650.0, 'realized_R': 1.0,
+        }
+
+    def _csv_trades(self, csv_path):
+        if not os.path.exists(csv_path):
+            return 0
+        with open(csv_path) as f:
+            return len(f.readlines()) - 1  # minus header
+
+    def test_rolled_back_trade_not_in_csv(self):
+        csv_path = os.path.join(self.tmpdir, 'trades.csv')
+        with patch('baseline_v1_live.state_manager.TRADES_LOG_CSV', csv_path):
+            try:
+                with self.sm.tick_batch():
+                    self.sm.log_trade(self._trade())
+                    assert self._csv_trades(csv_path) == 0  # not before the commit
+                    raise RuntimeError('boom')
+            except RuntimeError:
+                pass
+            assert self._reader_count('trade_log') == 0
+            assert self._csv_trades(csv_path) == 0
+
+            # The next save logs the trade again - once in the DB and once in the CSV
+            with self.sm.tick_batch():
+                self.sm.log_trade(self._trade())
+            assert self._reader_count('trade_log') == 1
+            assert self._csv_trades(csv_path) == 1
+
+    def test_trade_outside_batch_written_to_csv(self):
+        csv_path = os.path.join(self.tmpdir, 'trades.csv')
+        with patch('baseline_v1_live.state_manager.TRADES_LOG_CSV', csv_path):
+            self.sm.log_trade(self._trade())
+            self.sm.log_trade(self._trade())  # duplicate: skipped in DB and CSV
+        assert self._reader_count('trade_log') == 1
+        assert self._csv_trades(csv_path) == 1
@@ -0,0 +1,160 @@
+"""
+Tests for TelegramNotifier background delivery.
+
+Covers:
+- send_message() enqueues without blocking on HTTP
+- Messages are delivered in order by a single sender thread
+- Bursts are merged into one post (same parse_mode, length-capped)
+- A rejected merged post is re-sent message by message
+- flush_now messages skip the batch window
+- flush() waits for queued messages
+- Identical messages inside TELEGRAM_DEDUP_WINDOW are coalesced
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from baseline_v1_live.telegram_notifier import TelegramNotifier, BATCH_SEPARATOR
+
+
+class TestTelegramSendQueue:
+    """send_message() hands off to one background sender."""
+
+    def setup_method(self):
+        self.notifier = TelegramNotifier(instance_name='TEST')
+        self.notifier.enabled = True
+        self.notifier.bot_token = 'token'
+        self.notifier.chat_id = '123'
+        self.notifier._http = MagicMock()
+        self.notifier._http.post.return_value = MagicMock(status_code=200)
+
+    def test_disabled_notifier_sends_nothing(self):
+        self.notifier.enabled = False
+        assert self.notifier.send_message('hello') is False
+        assert self.notifier._send_thread is None
+
+    def test_send_does_not_block_on_http(self):
+        release = threading.Event()
+        self.notifier._http.post.side_effect = lambda *a, **k: release.wait(5) and MagicMock(status_code=200)
+
+        assert self.notifier.send_message('slow') is True  # returns while POST is stuck
+        release.set()
+        assert self.notifier.flush(timeout=5)
+
+    def test_messages_delivered_in_order(self):
+        for i in range(5):
+            self.notifier.send_message(f'msg {i}', parse_mode=None)
+        assert self.notifier.flush(timeout=5)
+
+        texts = [c.kwargs['json']['text'] for c in self.notifier._http.post.call_args_list]
+        assert BATCH_SEPARATOR.join(texts) == BATCH_SEPARATOR.join(f'[TEST] msg {i}' for i in range(5))
+
+    def test_single_sender_thread(self):
+        self.notifier.send_message('a')
+        first = self.notifier._send_thread
+        self.notifier.send_message('b')
+        assert self.notifier._send_thread is first
+        assert self.notifier.flush(timeout=5)
+
+    def test_flush_without_messages(self):
+        assert self.notifier.flush(timeout=0.1)
+
+    def test_duplicate_messages_coalesced(self):
+        for _ in range(3):
+            assert self.notifier.send_message('[WATCHDOG] reconnecting') is True
+        self.notifier.send_message('[WATCHDOG] reconnected')
+        assert self.notifier.flush(timeout=5)
+
+        texts = [c.kwargs['json']['text'] for c in self.notifier._http.post.call_args_list]
+        assert BATCH_SEPARATOR.join(texts) == '[TEST] [WATCHDOG] reconnecting' + BATCH_SEPARATOR + '[TEST] [WATCHDOG] reconnected'
+
+    @patch('baseline_v1_live.telegram_notifier.TELEGRAM_DEDUP_WINDOW', 0)
+    def test_repeat_sent_after_window(self):
+        self.notifier.send_message('status')
+        self.notifier.send_message('status')
+        assert self.notifier.flush(timeout=5)
+        texts = [c.kwargs['json']['text'] for c in self.notifier._http.post.call_args_list]
+        assert BATCH_SEPARATOR.join(texts).count('status') == 2
+
+
+class TestTelegramBatching:
+    """The sender merges queued messages into as few posts as it can."""
+
+    def setup_method(self):
+        self.notifier = TelegramNotifier(instance_name='TEST')
+        self.notifier.enabled = True
+        self.notifier.bot_token = 'token'
+        self.notifier.chat_id = '123'
+        self.notifier._http = MagicMock()
+        self.notifier._http.post.return_value = MagicMock(status_code=200)
+
+    def _posts(self):
+        return [c.kwargs['json'] for c in self.notifier._http.post.call_args_list]
+
+    def _queue_then_send(self, messages):
+        # Queue everything before the sender starts so the batch is deterministic
+        self.notifier._ensure_sender = lambda: None
+        for text, parse_mode in messages:
+            self.notifier.send_message(text, parse_mode=parse_mode)
+        del self.notifier._ensure_sender
+        self.notifier._ensure_sender()
+        assert self.notifier.flush(timeout=5)
+
+    def test_burst_sent_as_one_post(self):
+        self._queue_then_send([('a', 'HTML'), ('b', 'HTML'), ('c', 'HTML')])
+        posts = self._posts()
+        assert len(posts) == 1
+        assert posts[0]['text'] == BATCH_SEPARATOR.join(['[TEST] a', '[TEST] b', '[TEST] c'])
+        assert posts[0]['parse_mode'] == 'HTML'
+
+    def test_parse_mode_change_splits_batch(self):
+        self._queue_then_send([('a', 'HTML'), ('b', None), ('c', None)])
+        posts = self._posts()
+        assert [p['text'] for p in posts] == ['[TEST] a', BATCH_SEPARATOR.join(['[TEST] b', '[TEST] c'])]
+        assert 'parse_mode' not in posts[1]
+
+    @patch('baseline_v1_live.telegram_notifier.TELEGRAM_MAX_MESSAGE_LENGTH', 20)
+    def test_length_cap_splits_batch(self):
+        self._queue_then_send([('x' * 8, None), ('y' * 8, None)])
+        assert [p['text'] for p in self._posts()] == ['[TEST] ' + 'x' * 8, '[TEST] ' + 'y' * 8]
+
+    def test_rejected_batch_resent_individually(self):
+        # A stray '<' in one message makes Telegram reject the merged HTML post
+        self.notifier._http.post.side_effect = lambda url, json, timeout: MagicMock(
+            status_code=400 if BATCH_SEPARATOR in json['text'] else 200, text='Bad Request')
+        self._queue_then_send([('a', 'HTML'), ('x < y', 'HTML'), ('c', 'HTML')])
+        assert [p['text'] for p in self._posts()] == [
+            BATCH_SEPARATOR.join(['[TEST] a', '[TEST] x < y', '[TEST] c']),
+            '[TEST] a', '[TEST] x < y', '[TEST] c',
+        ]
+
+    def test_accepted_batch_not_resent(self):
+        self._queue_then_send([('a', 'HTML'), ('b', 'HTML')])
+        assert len(self._posts()) == 1
+
+    def test_flush_now_ends_batch(self):
+        self.notifier._ensure_sender = lambda: None
+        self.notifier.send_message('info', parse_mode=None)
+        self.notifier.send_message('critical', parse_mode=None, flush_now=True)
+        self.notifier.send_message('later', parse_mode=None)
+        del self.notifier._ensure_sender
+        self.notifier._ensure_sender()
+        assert self.notifier.flush(timeout=5)
+        assert [p['text'] for p in self._posts()] == [
+            BATCH_SEPARATOR.join(['[TEST] info', '[TEST] critical']), '[TEST] later',
+        ]
+
+    @patch('baseline_v1_live.telegram_notifier.TELEGRAM_BATCH_WINDOW', 2.0)
+    def test_flush_now_skips_batch_window(self):
+        posted = threading.Event()
+        self.notifier._http.post.side_effect = lambda *a, **k: posted.set() or MagicMock(status_code=200)
+        start = time.monotonic()
+        self.notifier.send_message('critical', flush_now=True)
+        assert posted.wait(5)
+        assert time.monotonic() - start < 1.0